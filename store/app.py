@@ -1,13 +1,38 @@
 import os
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from db import init_db
+import email_queue
+import email_sender
+import jobs
+import stripe_inbox
+import telegram
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
 log = logging.getLogger("keyjawn-store")
 
-app = FastAPI(title="keyjawn-store", docs_url=None, redoc_url=None)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    telegram.dispatcher.start()
+    tasks = [
+        asyncio.create_task(email_queue.run_sender(email_sender.MailSession)),
+        asyncio.create_task(jobs.run_executor()),
+        asyncio.create_task(stripe_inbox.run_processor()),
+    ]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await telegram.dispatcher.close()
+
+
+app = FastAPI(title="keyjawn-store", docs_url=None, redoc_url=None, lifespan=lifespan)
 app.mount("/static", StaticFiles(directory=os.path.join(os.path.dirname(__file__), "static")), name="static")
 
 init_db()
@@ -30,6 +55,9 @@ app.include_router(admin_router)
 from routes.unsubscribe import router as unsubscribe_router
 app.include_router(unsubscribe_router)
 
+from routes.jobs import router as jobs_router
+app.include_router(jobs_router)
+
 @app.get("/api/health")
 async def health():
     return {"status": "ok", "service": "keyjawn-store"}
@@ -0,0 +1,52 @@
+"""In-process cache of the releases table.
+
+Releases change a few times a month but are read on every purchase and
+download. Each worker keeps the whole catalog in memory together with
+the 'releases' stamp from cache_stamps. Triggers on releases bump that
+stamp in the same transaction as any insert, update or delete. Every
+read checks the stamp with a primary-key lookup, so a register_release
+handled by one gunicorn worker is seen by the other on its next request.
+"""
+import threading
+from typing import Optional
+
+_lock = threading.Lock()
+_stamp: Optional[int] = None
+_releases: tuple = ()  # newest first
+
+
+def _current_stamp(conn) -> int:
+    row = conn.execute("SELECT stamp FROM cache_stamps WHERE name = 'releases'").fetchone()
+    return row["stamp"] if row else 0
+
+
+def releases(conn) -> tuple:
+    """All releases as dicts, newest first. Treat them as read-only."""
+    global _stamp, _releases
+    stamp = _current_stamp(conn)
+    with _lock:
+        if stamp == _stamp:
+            return _releases
+    rows = conn.execute("SELECT * FROM releases ORDER BY released_at DESC, id DESC").fetchall()
+    loaded = tuple(dict(r) for r in rows)
+    with _lock:
+        _stamp, _releases = stamp, loaded
+    return loaded
+
+
+def latest(conn) -> Optional[dict]:
+    catalog = releases(conn)
+    return catalog[0] if catalog else None
+
+
+def latest_version(conn) -> Optional[str]:
+    """Version of the most recent release, or None if there are none yet."""
+    release = latest(conn)
+    return release["version"] if release else None
+
+
+def get(conn, version: str) -> Optional[dict]:
+    for release in releases(conn):
+        if release["version"] == version:
+            return release
+    return None
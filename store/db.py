@@ -1,15 +1,123 @@
 import sqlite3
 import os
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+from starlette.concurrency import run_in_threadpool
+
+log = logging.getLogger("keyjawn-store")
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "keyjawn-store.db")
 
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
+# Long-lived connections per worker process. Each keeps sqlite3's
+# prepared-statement cache warm, so hot queries aren't re-parsed.
+POOL_SIZE = int(os.environ.get("STORE_DB_POOL_SIZE", "4"))
+POOL_TIMEOUT = 10  # seconds to wait for a free connection
+STATEMENT_CACHE_SIZE = 256
+
+
+def _connect(path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        path,
+        check_same_thread=check_same_thread,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA busy_timeout=5000")
     return conn
 
+
+def get_db():
+    """Open a standalone connection. Routes should use run_db/connection instead."""
+    return _connect(DB_PATH)
+
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections shared by the threadpool workers."""
+
+    def __init__(self, path: str, size: int = POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return _connect(self.path, check_same_thread=False)
+                except Exception:
+                    self._created -= 1
+                    raise
+        try:
+            return self._idle.get(timeout=POOL_TIMEOUT)
+        except queue.Empty:
+            raise RuntimeError(f"no database connection free after {POOL_TIMEOUT}s")
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection as one transaction: commit on success, roll back on error."""
+        conn = self._acquire()
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._created = 0
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """The process-wide pool for DB_PATH (rebuilt if DB_PATH changes, as in tests)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.path != DB_PATH:
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(DB_PATH)
+        return _pool
+
+
+def connection():
+    return get_pool().connection()
+
+
+async def run_db(fn, *args, **kwargs):
+    """Run fn(conn, *args, **kwargs) on a pooled connection, off the event loop.
+
+    The whole call is one transaction; it commits if fn returns normally.
+    """
+    def call():
+        with connection() as conn:
+            return fn(conn, *args, **kwargs)
+    return await run_in_threadpool(call)
+
 def init_db():
     conn = get_db()
     conn.executescript("""
@@ -56,6 +164,61 @@ def init_db():
             changelog TEXT,
             released_at TEXT NOT NULL DEFAULT (datetime('now'))
         );
+
+        CREATE TABLE IF NOT EXISTS email_queue (
+            id INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL,
+            to_email TEXT NOT NULL,
+            params TEXT NOT NULL DEFAULT '{}',
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at TEXT NOT NULL DEFAULT (datetime('now')),
+            last_error TEXT,
+            created_at TEXT NOT NULL DEFAULT (datetime('now')),
+            sent_at TEXT,
+            batch TEXT,
+            priority INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_email_queue_due ON email_queue(status, next_attempt_at);
+    """)
+    # Add bulk batch columns if missing (existing DBs)
+    try:
+        conn.execute("ALTER TABLE email_queue ADD COLUMN batch TEXT")
+        conn.execute("ALTER TABLE email_queue ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+    except sqlite3.OperationalError:
+        pass  # columns already exist
+    conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_email_queue_batch
+        ON email_queue(batch, to_email) WHERE batch IS NOT NULL
+    """)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL,
+            params TEXT NOT NULL DEFAULT '{}',
+            status TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            owner TEXT,
+            lease_until TEXT,
+            cursor TEXT,
+            done INTEGER NOT NULL DEFAULT 0,
+            total INTEGER,
+            result TEXT,
+            error TEXT,
+            created_at TEXT NOT NULL DEFAULT (datetime('now')),
+            started_at TEXT,
+            finished_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id);
+
+        CREATE TABLE IF NOT EXISTS job_deliveries (
+            id INTEGER PRIMARY KEY,
+            job_id INTEGER NOT NULL REFERENCES jobs(id),
+            recipient TEXT NOT NULL,
+            email_id INTEGER NOT NULL REFERENCES email_queue(id),
+            created_at TEXT NOT NULL DEFAULT (datetime('now')),
+            UNIQUE(job_id, recipient)
+        );
     """)
     # Add changelog column if missing (existing DBs)
     try:
@@ -67,4 +230,156 @@ def init_db():
         conn.execute("ALTER TABLE users ADD COLUMN unsubscribed INTEGER NOT NULL DEFAULT 0")
     except sqlite3.OperationalError:
         pass  # column already exists
+    conn.executescript("""
+        CREATE INDEX IF NOT EXISTS idx_users_purchased ON users(purchased_at, id);
+        CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets(status, created_at, id);
+        CREATE INDEX IF NOT EXISTS idx_downloads_user ON downloads(user_id, downloaded_at);
+
+        CREATE TABLE IF NOT EXISTS rate_limit_hits (
+            key TEXT NOT NULL,
+            hit_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_rate_limit_hits ON rate_limit_hits(key, hit_at);
+
+        CREATE TABLE IF NOT EXISTS stripe_events (
+            seq INTEGER PRIMARY KEY,
+            event_id TEXT UNIQUE NOT NULL,
+            type TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at TEXT NOT NULL DEFAULT (datetime('now')),
+            last_error TEXT,
+            received_at TEXT NOT NULL DEFAULT (datetime('now')),
+            processed_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_stripe_events_due ON stripe_events(status, next_attempt_at);
+    """)
+    _init_stats(conn)
+    _init_email_search(conn)
+    _init_cache_stamps(conn)
     conn.close()
+
+
+# Dashboard counters, kept current by triggers in the same transaction as
+# the write that changes them, so /admin never scans users or tickets.
+STATS_SQL = {
+    "total_users": "SELECT COUNT(*) FROM users",
+    "total_revenue": "SELECT COALESCE(SUM(amount_cents), 0) FROM users",
+    "total_downloads": "SELECT COALESCE(SUM(download_count), 0) FROM users",
+    "open_tickets": "SELECT COUNT(*) FROM tickets WHERE status IN ('open','in_progress')",
+}
+
+
+def _init_stats(conn):
+    conn.executescript("""
+        BEGIN IMMEDIATE;
+
+        CREATE TABLE IF NOT EXISTS stats (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+
+        CREATE TRIGGER IF NOT EXISTS stats_users_insert AFTER INSERT ON users BEGIN
+            UPDATE stats SET value = value + 1 WHERE name = 'total_users';
+            UPDATE stats SET value = value + NEW.amount_cents WHERE name = 'total_revenue';
+            UPDATE stats SET value = value + NEW.download_count WHERE name = 'total_downloads';
+        END;
+        CREATE TRIGGER IF NOT EXISTS stats_users_update
+        AFTER UPDATE OF amount_cents, download_count ON users BEGIN
+            UPDATE stats SET value = value + NEW.amount_cents - OLD.amount_cents WHERE name = 'total_revenue';
+            UPDATE stats SET value = value + NEW.download_count - OLD.download_count WHERE name = 'total_downloads';
+        END;
+        CREATE TRIGGER IF NOT EXISTS stats_users_delete AFTER DELETE ON users BEGIN
+            UPDATE stats SET value = value - 1 WHERE name = 'total_users';
+            UPDATE stats SET value = value - OLD.amount_cents WHERE name = 'total_revenue';
+            UPDATE stats SET value = value - OLD.download_count WHERE name = 'total_downloads';
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS stats_tickets_insert AFTER INSERT ON tickets BEGIN
+            UPDATE stats SET value = value + (NEW.status IN ('open','in_progress'))
+            WHERE name = 'open_tickets';
+        END;
+        CREATE TRIGGER IF NOT EXISTS stats_tickets_update AFTER UPDATE OF status ON tickets BEGIN
+            UPDATE stats SET value = value + (NEW.status IN ('open','in_progress'))
+                - (OLD.status IN ('open','in_progress'))
+            WHERE name = 'open_tickets';
+        END;
+        CREATE TRIGGER IF NOT EXISTS stats_tickets_delete AFTER DELETE ON tickets BEGIN
+            UPDATE stats SET value = value - (OLD.status IN ('open','in_progress'))
+            WHERE name = 'open_tickets';
+        END;
+    """)
+    # Backfill counters the first time they exist; the triggers keep them from then on
+    for name, sql in STATS_SQL.items():
+        conn.execute(f"INSERT OR IGNORE INTO stats (name, value) SELECT ?, ({sql})", (name,))
+    conn.commit()
+
+
+def _init_cache_stamps(conn):
+    """Per-table change counters that in-process caches compare against (see catalog.py)."""
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS cache_stamps (
+            name TEXT PRIMARY KEY,
+            stamp INTEGER NOT NULL
+        );
+        -- Random start, so a cache loaded from a different (restored or
+        -- replaced) database file can't match by coincidence
+        INSERT OR IGNORE INTO cache_stamps (name, stamp) VALUES ('releases', random());
+
+        CREATE TRIGGER IF NOT EXISTS releases_stamp_insert AFTER INSERT ON releases BEGIN
+            UPDATE cache_stamps SET stamp = stamp + 1 WHERE name = 'releases';
+        END;
+        CREATE TRIGGER IF NOT EXISTS releases_stamp_update AFTER UPDATE ON releases BEGIN
+            UPDATE cache_stamps SET stamp = stamp + 1 WHERE name = 'releases';
+        END;
+        CREATE TRIGGER IF NOT EXISTS releases_stamp_delete AFTER DELETE ON releases BEGIN
+            UPDATE cache_stamps SET stamp = stamp + 1 WHERE name = 'releases';
+        END;
+    """)
+
+
+def read_stats(conn) -> dict:
+    return {row["name"]: row["value"] for row in conn.execute("SELECT name, value FROM stats")}
+
+
+def _init_email_search(conn):
+    """Trigram full-text index over users.email for substring search.
+
+    Needs SQLite 3.34+ built with FTS5. Without it, admin search falls
+    back to a LIKE scan.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'users_email_fts'"
+    ).fetchone()
+    if exists:
+        return
+    try:
+        conn.executescript("""
+            BEGIN IMMEDIATE;
+            CREATE VIRTUAL TABLE users_email_fts USING fts5(
+                email, content='users', content_rowid='id', tokenize='trigram'
+            );
+            CREATE TRIGGER users_email_fts_insert AFTER INSERT ON users BEGIN
+                INSERT INTO users_email_fts (rowid, email) VALUES (NEW.id, NEW.email);
+            END;
+            CREATE TRIGGER users_email_fts_delete AFTER DELETE ON users BEGIN
+                INSERT INTO users_email_fts (users_email_fts, rowid, email) VALUES ('delete', OLD.id, OLD.email);
+            END;
+            CREATE TRIGGER users_email_fts_update AFTER UPDATE OF email ON users BEGIN
+                INSERT INTO users_email_fts (users_email_fts, rowid, email) VALUES ('delete', OLD.id, OLD.email);
+                INSERT INTO users_email_fts (rowid, email) VALUES (NEW.id, NEW.email);
+            END;
+            INSERT INTO users_email_fts (users_email_fts) VALUES ('rebuild');
+            COMMIT;
+        """)
+    except sqlite3.OperationalError as e:
+        if conn.in_transaction:
+            conn.rollback()
+        log.warning("email search index unavailable, using LIKE: %s", e)
+
+
+def has_email_search(conn) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'users_email_fts'"
+    ).fetchone() is not None
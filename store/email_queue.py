@@ -0,0 +1,214 @@
+"""Durable outbound email queue.
+
+Handlers call enqueue() inside their own transaction and return; the
+background sender started by app.py delivers queued messages with
+retries and exponential backoff.
+
+Each row stores the message kind and its parameters, not rendered HTML.
+Rendering happens at send time, so a retried download email still gets
+a freshly signed link.
+
+Bulk mail-outs (release notifications) are queued as a named batch at
+a lower priority than transactional mail, so a download link never
+waits behind thousands of update emails. A recipient is queued at most
+once per batch, so re-running a mail-out only queues the addresses it
+missed, and a restart simply carries on with the rows still pending.
+The sender delivers each claimed batch over one SMTP session.
+
+Both gunicorn workers run a sender. A claim moves rows to 'sending'
+and pushes next_attempt_at out by CLAIM_LEASE_SECONDS in one UPDATE,
+so two senders never pick up the same row. The sender renews the lease
+on the rest of its batch before each message, so a slow SMTP server
+can't let a batch lapse halfway through. A row whose sender died
+mid-send becomes due again once the lease runs out, and is marked
+failed instead once it has used up its attempts.
+
+A claim belongs to the attempt number it set. Renewals and results
+only apply while the row is still 'sending' at that attempt, so a
+sender that lost its claim skips the row and never overwrites the new
+owner's result. The one remaining resend is a sender dying between
+handing a message to Gmail and recording it.
+"""
+import asyncio
+import json
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+from db import connection
+
+log = logging.getLogger("keyjawn-store")
+
+POLL_INTERVAL = 2  # seconds between queue checks when idle
+BATCH_SIZE = 20
+CLAIM_LEASE_SECONDS = 300  # renewed before each message in the batch
+MAX_ATTEMPTS = 8
+BACKOFF_BASE_SECONDS = 60
+BACKOFF_MAX_SECONDS = 6 * 3600
+
+PRIORITY_TRANSACTIONAL = 0
+PRIORITY_BULK = 1
+
+
+def enqueue(conn, kind: str, to_email: str, **params) -> int:
+    """Queue a message on conn's transaction. Returns the queue row id."""
+    cursor = conn.execute(
+        "INSERT INTO email_queue (kind, to_email, params) VALUES (?, ?, ?)",
+        (kind, to_email, json.dumps(params)),
+    )
+    return cursor.lastrowid
+
+
+def enqueue_once(conn, batch: str, kind: str, to_email: str, **params) -> tuple[int, bool]:
+    """Queue a bulk message unless this batch already has one for to_email.
+
+    Returns (id of the queued message, whether this call queued it).
+    """
+    created = conn.execute("""
+        INSERT INTO email_queue (kind, to_email, params, batch, priority)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT DO NOTHING
+    """, (kind, to_email, json.dumps(params), batch, PRIORITY_BULK)).rowcount > 0
+    message_id = conn.execute(
+        "SELECT id FROM email_queue WHERE batch = ? AND to_email = ?", (batch, to_email)
+    ).fetchone()[0]
+    return message_id, created
+
+
+def batch_progress(conn, batch: str) -> dict:
+    """Per-status message counts for a batch."""
+    counts = {"pending": 0, "sending": 0, "sent": 0, "failed": 0}
+    for row in conn.execute(
+        "SELECT status, COUNT(*) FROM email_queue WHERE batch = ? GROUP BY status", (batch,)
+    ):
+        counts[row[0]] = row[1]
+    counts["total"] = sum(counts.values())
+    return counts
+
+
+def claim_due(conn, limit: int = BATCH_SIZE) -> list:
+    """Claim up to limit due messages for this sender, transactional mail first."""
+    # A lapsed claim on the last attempt means the sender kept dying on it
+    conn.execute("""
+        UPDATE email_queue SET status = 'failed', last_error = 'sender stopped while sending'
+        WHERE status = 'sending' AND next_attempt_at <= datetime('now') AND attempts >= ?
+    """, (MAX_ATTEMPTS,))
+    rows = conn.execute(f"""
+        UPDATE email_queue
+        SET status = 'sending', attempts = attempts + 1,
+            next_attempt_at = datetime('now', '+{CLAIM_LEASE_SECONDS} seconds')
+        WHERE id IN (
+            SELECT id FROM email_queue
+            WHERE status IN ('pending', 'sending') AND next_attempt_at <= datetime('now')
+            ORDER BY priority, id LIMIT ?
+        )
+        RETURNING *
+    """, (limit,)).fetchall()
+    # RETURNING comes back in rowid order, not the subquery's
+    return sorted(rows, key=lambda r: (r["priority"], r["id"]))
+
+
+def renew_claims(conn, rows) -> set:
+    """Push out the lease on claimed rows. Returns the ids this sender still holds."""
+    held = set()
+    for row in rows:
+        if conn.execute(f"""
+            UPDATE email_queue SET next_attempt_at = datetime('now', '+{CLAIM_LEASE_SECONDS} seconds')
+            WHERE id = ? AND status = 'sending' AND attempts = ?
+        """, (row["id"], row["attempts"])).rowcount:
+            held.add(row["id"])
+    return held
+
+
+def mark_sent(conn, message_id: int, attempts: int) -> bool:
+    """Record a delivery. Returns False if the claim was lost to another sender."""
+    return conn.execute("""
+        UPDATE email_queue SET status = 'sent', sent_at = datetime('now'), last_error = NULL
+        WHERE id = ? AND status = 'sending' AND attempts = ?
+    """, (message_id, attempts)).rowcount > 0
+
+
+def backoff_seconds(attempts: int) -> int:
+    return min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+
+
+def mark_failed(conn, message_id: int, attempts: int, error: str) -> bool:
+    """Schedule a retry, or give up after MAX_ATTEMPTS. Returns False if the claim was lost."""
+    status = "failed" if attempts >= MAX_ATTEMPTS else "pending"
+    return conn.execute("""
+        UPDATE email_queue
+        SET status = ?, last_error = ?,
+            next_attempt_at = datetime('now', '+' || ? || ' seconds')
+        WHERE id = ? AND status = 'sending' AND attempts = ?
+    """, (status, error, backoff_seconds(attempts), message_id, attempts)).rowcount > 0
+
+
+def queue_depth(conn) -> dict:
+    """Counts of messages waiting to go out and messages that gave up."""
+    # Status-only counts, so they are read from idx_email_queue_due
+    queued = conn.execute(
+        "SELECT COUNT(*) FROM email_queue WHERE status IN ('pending', 'sending')"
+    ).fetchone()[0]
+    failed = conn.execute("SELECT COUNT(*) FROM email_queue WHERE status = 'failed'").fetchone()[0]
+    return {"queued": queued, "failed": failed}
+
+
+def _finish(message_id: int, attempts: int, error):
+    with connection() as conn:
+        if error is None:
+            recorded = mark_sent(conn, message_id, attempts)
+        else:
+            recorded = mark_failed(conn, message_id, attempts, error)
+    if not recorded:
+        log.warning("email %d was reclaimed by another sender before its result was recorded",
+                    message_id)
+
+
+def send_claimed(rows, open_session):
+    """Send claimed rows over one session, recording each result as it lands."""
+    with open_session() as session:
+        for i, row in enumerate(rows):
+            with connection() as conn:
+                held = renew_claims(conn, rows[i:])
+            if row["id"] not in held:
+                log.warning("email %d was reclaimed by another sender, skipping", row["id"])
+                continue
+            try:
+                session.send(row["kind"], row["to_email"], json.loads(row["params"]))
+            except Exception as e:
+                log.warning("email %d to %s failed (attempt %d): %s",
+                            row["id"], row["to_email"], row["attempts"], e)
+                _finish(row["id"], row["attempts"], str(e)[:500])
+            else:
+                _finish(row["id"], row["attempts"], None)
+
+
+def _process_due(open_session) -> int:
+    with connection() as conn:
+        rows = claim_due(conn)
+    if rows:
+        send_claimed(rows, open_session)
+    return len(rows)
+
+
+async def process_due(open_session) -> int:
+    """Send one batch of due messages in the threadpool. Returns how many were claimed.
+
+    open_session() returns a context manager whose send(kind, to_email,
+    params) renders and sends one message, raising on failure.
+    """
+    return await run_in_threadpool(_process_due, open_session)
+
+
+async def run_sender(open_session):
+    """Deliver queued email until cancelled."""
+    while True:
+        try:
+            claimed = await process_due(open_session)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("email queue sender error")
+            claimed = 0
+        if claimed < BATCH_SIZE:
+            await asyncio.sleep(POLL_INTERVAL)
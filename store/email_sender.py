@@ -4,6 +4,7 @@ import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
+from email_queue import enqueue
 from r2 import generate_signed_url, GITHUB_RELEASES
 
 log = logging.getLogger("keyjawn-store")
@@ -13,19 +14,21 @@ FROM_NAME = "KeyJawn"
 GMAIL_APP_PASSWORD = os.environ.get("GMAIL_APP_PASSWORD", "")
 
 PHYSICAL_ADDRESS = "55 Park Ave, Bloomfield, NJ 07003"
+SMTP_TIMEOUT = 30  # seconds
+
+# Marks where the per-recipient CAN-SPAM footer goes in a shared template
+_FOOTER_SLOT = "<!-- footer -->"
 
 
 def _get_latest_version() -> str:
     """Get the latest release version from the DB, or fall back to 'latest'."""
     try:
-        from db import get_db
-        conn = get_db()
-        row = conn.execute(
-            "SELECT version FROM releases ORDER BY released_at DESC LIMIT 1"
-        ).fetchone()
-        conn.close()
-        if row:
-            return row["version"]
+        import catalog
+        from db import connection
+        with connection() as conn:
+            version = catalog.latest_version(conn)
+        if version:
+            return version
     except Exception:
         pass
     return "latest"
@@ -67,24 +70,81 @@ def _canspam_footer(email: str) -> str:
         </td></tr>"""
 
 
-def _send_email(to: str, subject: str, html: str):
+def _message(to: str, subject: str, html: str) -> MIMEMultipart:
     msg = MIMEMultipart("alternative")
     msg["From"] = f"{FROM_NAME} <{FROM_EMAIL}>"
     msg["To"] = to
     msg["Subject"] = subject
     msg.attach(MIMEText(html, "html"))
+    return msg
 
-    try:
-        with smtplib.SMTP("smtp.gmail.com", 587) as smtp:
+
+class SmtpSession:
+    """One authenticated SMTP connection reused for several messages.
+
+    Connects on the first send. If the server drops the connection, the
+    failed send raises and the next send reconnects. If connecting or
+    logging in fails, the rest of the session's sends fail with that
+    error instead of trying again, so a bad app password costs one
+    Gmail login per batch rather than one per message.
+    """
+
+    def __init__(self):
+        self._smtp = None
+        self._connect_error = None
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP("smtp.gmail.com", 587, timeout=SMTP_TIMEOUT)
+        try:
             smtp.starttls()
             smtp.login(FROM_EMAIL, GMAIL_APP_PASSWORD)
-            smtp.sendmail(FROM_EMAIL, [to, FROM_EMAIL], msg.as_string())
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+    def send(self, to: str, subject: str, html: str):
+        """Send one message. Raises on failure so the queue can retry."""
+        if self._connect_error is not None:
+            raise smtplib.SMTPException(f"not sent, SMTP login failed earlier: {self._connect_error}")
+        if self._smtp is None:
+            try:
+                self._smtp = self._connect()
+            except Exception as e:
+                self._connect_error = e
+                raise
+        try:
+            self._smtp.sendmail(FROM_EMAIL, [to, FROM_EMAIL], _message(to, subject, html).as_string())
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException):
+            raise  # the server rejected this message; the connection is still good
+        except OSError:
+            self._drop()
+            raise
         log.info(f"Email sent to {to}")
-    except Exception as e:
-        log.error(f"Failed to send email to {to}: {e}")
 
+    def _drop(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.close()
+            except Exception:
+                pass
+            self._smtp = None
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._drop()
 
-def _download_email_html(version: str, to_email: str) -> str:
+
+def _with_footer(template: str, to_email: str) -> str:
+    return template.replace(_FOOTER_SLOT, _canspam_footer(to_email))
+
+
+def _download_email_template(version: str) -> str:
+    """Download email with the per-recipient footer left as a slot."""
     url = _apk_url(version)
     return f"""\
 <!DOCTYPE html>
@@ -129,7 +189,7 @@ def _download_email_html(version: str, to_email: str) -> str:
           </p>
         </td></tr>
 
-        {_canspam_footer(to_email)}
+        {_FOOTER_SLOT}
 
       </table>
     </td></tr>
@@ -171,7 +231,8 @@ def _ticket_email_html(ticket_id: int, to_email: str) -> str:
 </html>"""
 
 
-def _update_email_html(version: str, changelog: str = "", to_email: str = "") -> str:
+def _update_email_template(version: str, changelog: str = "") -> str:
+    """Update email with the per-recipient footer left as a slot."""
     url = _apk_url(version)
     changes_html = ""
     if changelog:
@@ -230,7 +291,7 @@ def _update_email_html(version: str, changelog: str = "", to_email: str = "") ->
           </p>
         </td></tr>
 
-        {_canspam_footer(to_email)}
+        {_FOOTER_SLOT}
 
       </table>
     </td></tr>
@@ -239,27 +300,75 @@ def _update_email_html(version: str, changelog: str = "", to_email: str = "") ->
 </html>"""
 
 
-def send_download_email(to_email: str):
-    version = _get_latest_version()
-    _send_email(
-        to_email,
-        f"KeyJawn v{version} -- your download link",
-        _download_email_html(version, to_email),
-    )
+class MailSession:
+    """Renders and sends queued messages over one SMTP session.
+
+    The parts of a message that are the same for every recipient (latest
+    version lookup, signed download URL, changelog HTML) are built once
+    per session; only the footer is filled in per recipient.
+    """
+
+    def __init__(self):
+        self.smtp = SmtpSession()
+        self._templates: dict = {}
+
+    def _template(self, key: tuple, build):
+        if key not in self._templates:
+            self._templates[key] = build()
+        return self._templates[key]
+
+    def render(self, kind: str, to_email: str, params: dict) -> tuple[str, str]:
+        """Build (subject, html) for a queued message."""
+        if kind == "download":
+            version = self._template(("latest",), _get_latest_version)
+            template = self._template(("download", version), lambda: _download_email_template(version))
+            return f"KeyJawn v{version} -- your download link", _with_footer(template, to_email)
+        if kind == "update":
+            version = params["version"]
+            changelog = params.get("changelog", "")
+            template = self._template(
+                ("update", version, changelog), lambda: _update_email_template(version, changelog),
+            )
+            return f"KeyJawn v{version} -- what's new", _with_footer(template, to_email)
+        if kind == "ticket":
+            ticket_id = params["ticket_id"]
+            return f"Re: {params['subject']} [#{ticket_id}]", _ticket_email_html(ticket_id, to_email)
+        raise ValueError(f"unknown email kind: {kind}")
+
+    def send(self, kind: str, to_email: str, params: dict):
+        subject, html = self.render(kind, to_email, params)
+        self.smtp.send(to_email, subject, html)
+
+    def close(self):
+        self.smtp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+# The send_* functions only queue the message; the background sender
+# delivers it. Pass conn to queue on the caller's transaction.
+
+def _queue(conn, kind: str, to_email: str, **params) -> int:
+    if conn is not None:
+        return enqueue(conn, kind, to_email, **params)
+    from db import connection
+    with connection() as own:
+        return enqueue(own, kind, to_email, **params)
+
+
+def send_download_email(to_email: str, conn=None) -> int:
+    return _queue(conn, "download", to_email)
 
 
-def send_update_email(to_email: str, version: str, changelog: str = ""):
-    """Send an update notification to an existing purchaser."""
-    _send_email(
-        to_email,
-        f"KeyJawn v{version} -- what's new",
-        _update_email_html(version, changelog, to_email),
-    )
+def send_update_email(to_email: str, version: str, changelog: str = "", conn=None) -> int:
+    """Queue an update notification to an existing purchaser."""
+    return _queue(conn, "update", to_email, version=version, changelog=changelog)
 
 
-def send_ticket_confirmation(to_email: str, subject: str, ticket_id: int):
-    _send_email(
-        to_email,
-        f"Re: {subject} [#{ticket_id}]",
-        _ticket_email_html(ticket_id, to_email),
-    )
+def send_ticket_confirmation(to_email: str, subject: str, ticket_id: int, conn=None) -> int:
+    return _queue(conn, "ticket", to_email, subject=subject, ticket_id=ticket_id)
@@ -0,0 +1,190 @@
+"""Background jobs for long-running admin operations.
+
+A job is a row in the jobs table. Each gunicorn worker runs an executor
+that claims queued jobs and runs their handler in the threadpool, one at
+a time per worker.
+
+Handlers work in chunks. Each chunk is one transaction that does its
+work and calls ctx.checkpoint(), which saves the handler's cursor and
+progress and renews the claim. If a worker dies, the claim lapses after
+JOB_LEASE_SECONDS. Another executor then resumes the job from the last
+checkpoint, and the chunk that was cut off rolls back with nothing
+half-done.
+
+Jobs that send email record one job_deliveries row per recipient,
+linked to the queued message.
+"""
+import asyncio
+import json
+import logging
+import secrets
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from db import connection
+
+log = logging.getLogger("keyjawn-store")
+
+POLL_INTERVAL = 2  # seconds between checks for new jobs
+JOB_LEASE_SECONDS = 120
+MAX_ATTEMPTS = 3
+
+_handlers = {}
+
+
+class JobLost(Exception):
+    """Raised by checkpoint() when another executor has taken over the job."""
+
+
+def handler(kind: str):
+    """Register the function that runs jobs of this kind: fn(ctx) -> result dict."""
+    def register(fn):
+        _handlers[kind] = fn
+        return fn
+    return register
+
+
+class JobContext:
+    def __init__(self, row, owner: str):
+        self.id = row["id"]
+        self.kind = row["kind"]
+        self.params = json.loads(row["params"])
+        self.cursor = json.loads(row["cursor"]) if row["cursor"] is not None else None
+        self.done = row["done"]
+        self.total = row["total"]
+        self.owner = owner
+
+    def checkpoint(self, conn, cursor, done: int, total=None):
+        """Save progress on conn's transaction so it commits with the chunk's work."""
+        updated = conn.execute(f"""
+            UPDATE jobs SET cursor = ?, done = ?, total = COALESCE(?, total),
+                lease_until = datetime('now', '+{JOB_LEASE_SECONDS} seconds')
+            WHERE id = ? AND owner = ? AND status = 'running'
+        """, (json.dumps(cursor), done, total, self.id, self.owner)).rowcount
+        if not updated:
+            raise JobLost(f"job {self.id} was taken over by another worker")
+        self.cursor = cursor
+        self.done = done
+        if total is not None:
+            self.total = total
+
+    def record_delivery(self, conn, recipient: str, email_id: int):
+        conn.execute("""
+            INSERT INTO job_deliveries (job_id, recipient, email_id) VALUES (?, ?, ?)
+            ON CONFLICT(job_id, recipient) DO NOTHING
+        """, (self.id, recipient, email_id))
+
+
+def submit(conn, kind: str, **params) -> int:
+    """Queue a job on conn's transaction. Returns the job id."""
+    if kind not in _handlers:
+        raise ValueError(f"no handler for job kind: {kind}")
+    return conn.execute(
+        "INSERT INTO jobs (kind, params) VALUES (?, ?)", (kind, json.dumps(params))
+    ).lastrowid
+
+
+def claim_next(conn, owner: str):
+    """Claim the oldest queued job, or a running one whose claim has lapsed."""
+    return conn.execute(f"""
+        UPDATE jobs
+        SET status = 'running', owner = ?, attempts = attempts + 1,
+            started_at = COALESCE(started_at, datetime('now')),
+            lease_until = datetime('now', '+{JOB_LEASE_SECONDS} seconds')
+        WHERE id = (
+            SELECT id FROM jobs
+            WHERE status = 'queued'
+               OR (status = 'running' AND lease_until <= datetime('now'))
+            ORDER BY id LIMIT 1
+        )
+        RETURNING *
+    """, (owner,)).fetchone()
+
+
+def _finish(conn, ctx: JobContext, result=None, error=None, attempts: int = 0):
+    if error is None:
+        status = "done"
+    elif attempts >= MAX_ATTEMPTS:
+        status = "failed"
+    else:
+        status = "queued"  # retried from its last checkpoint
+    conn.execute("""
+        UPDATE jobs SET status = ?, result = ?, error = ?, owner = NULL, lease_until = NULL,
+            finished_at = CASE WHEN ? IN ('done', 'failed') THEN datetime('now') END
+        WHERE id = ? AND owner = ?
+    """, (status, json.dumps(result) if result is not None else None, error, status, ctx.id, ctx.owner))
+    return status
+
+
+def run_one(owner: Optional[str] = None) -> bool:
+    """Claim and run one job in this thread. Returns False if none was due."""
+    owner = owner or secrets.token_hex(8)
+    with connection() as conn:
+        row = claim_next(conn, owner)
+    if row is None:
+        return False
+    ctx = JobContext(row, owner)
+    fn = _handlers.get(ctx.kind)
+    try:
+        if fn is None:
+            raise ValueError(f"no handler for job kind: {ctx.kind}")
+        result = fn(ctx)
+    except JobLost as e:
+        log.warning("%s", e)
+        return True
+    except Exception as e:
+        log.exception("job %d (%s) failed on attempt %d", ctx.id, ctx.kind, row["attempts"])
+        with connection() as conn:
+            status = _finish(conn, ctx, error=str(e)[:500], attempts=row["attempts"])
+        log.info("job %d is now %s", ctx.id, status)
+        return True
+    with connection() as conn:
+        _finish(conn, ctx, result=result)
+    log.info("job %d (%s) done: %s", ctx.id, ctx.kind, result)
+    return True
+
+
+def job_status(conn, job_id: int):
+    """The job row plus per-status counts of its deliveries, or None."""
+    job = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if job is None:
+        return None
+    deliveries = {"pending": 0, "sending": 0, "sent": 0, "failed": 0}
+    for row in conn.execute("""
+        SELECT e.status, COUNT(*) FROM job_deliveries d
+        JOIN email_queue e ON e.id = d.email_id
+        WHERE d.job_id = ? GROUP BY e.status
+    """, (job_id,)):
+        deliveries[row[0]] = row[1]
+    deliveries["total"] = sum(deliveries.values())
+    return {
+        "id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "params": json.loads(job["params"]),
+        "done": job["done"],
+        "total": job["total"],
+        "attempts": job["attempts"],
+        "result": json.loads(job["result"]) if job["result"] else None,
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "deliveries": deliveries,
+    }
+
+
+async def run_executor():
+    """Run queued jobs until cancelled."""
+    owner = secrets.token_hex(8)
+    while True:
+        try:
+            ran = await run_in_threadpool(run_one, owner)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("job executor error")
+            ran = False
+        if not ran:
+            await asyncio.sleep(POLL_INTERVAL)
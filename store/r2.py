@@ -1,5 +1,8 @@
 import os
 import logging
+import threading
+import time
+from collections import OrderedDict
 
 import boto3
 from botocore.config import Config
@@ -17,24 +20,73 @@ DOWNLOAD_EXPIRY = 7 * 24 * 60 * 60
 GITHUB_RELEASES = "https://github.com/jamditis/keyjawn/releases"
 
 
+# A cached URL is handed out again only while it is at most this old, so
+# a link we email still has nearly the full DOWNLOAD_EXPIRY left ("this
+# link expires in 7 days").
+URL_MAX_AGE = 24 * 60 * 60
+URL_CACHE_SIZE = 128
+
+_client = None
+_client_lock = threading.Lock()
+_url_cache: OrderedDict = OrderedDict()  # (r2_key, filename, expires_in) -> (url, signed_at)
+_url_cache_lock = threading.Lock()
+
+
 def get_r2_client():
-    return boto3.client(
-        "s3",
-        endpoint_url=f"https://{R2_ACCOUNT_ID}.r2.cloudflarestorage.com",
-        aws_access_key_id=R2_ACCESS_KEY,
-        aws_secret_access_key=R2_SECRET_KEY,
-        config=Config(signature_version="s3v4"),
-        region_name="auto",
-    )
+    """The process-wide R2 client. boto3 clients are thread-safe once built."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = boto3.client(
+                    "s3",
+                    endpoint_url=f"https://{R2_ACCOUNT_ID}.r2.cloudflarestorage.com",
+                    aws_access_key_id=R2_ACCESS_KEY,
+                    aws_secret_access_key=R2_SECRET_KEY,
+                    config=Config(signature_version="s3v4"),
+                    region_name="auto",
+                )
+    return _client
+
+
+def _cached_url(key: tuple, expires_in: int):
+    max_age = min(URL_MAX_AGE, expires_in // 2)
+    with _url_cache_lock:
+        entry = _url_cache.get(key)
+        if entry is None:
+            return None
+        url, signed_at = entry
+        if time.monotonic() - signed_at > max_age:
+            del _url_cache[key]
+            return None
+        _url_cache.move_to_end(key)
+        return url
+
+
+def _store_url(key: tuple, url: str):
+    with _url_cache_lock:
+        _url_cache[key] = (url, time.monotonic())
+        _url_cache.move_to_end(key)
+        while len(_url_cache) > URL_CACHE_SIZE:
+            _url_cache.popitem(last=False)
+
+
+def clear_url_cache():
+    with _url_cache_lock:
+        _url_cache.clear()
 
 
 def generate_signed_url(r2_key: str, expires_in: int = DOWNLOAD_EXPIRY, filename: str = None) -> str:
+    key = (r2_key, filename, expires_in)
+    url = _cached_url(key, expires_in)
+    if url:
+        return url
     try:
         client = get_r2_client()
         params = {"Bucket": R2_BUCKET, "Key": r2_key}
         if filename:
             params["ResponseContentDisposition"] = f'attachment; filename="{filename}"'
-        return client.generate_presigned_url(
+        url = client.generate_presigned_url(
             "get_object",
             Params=params,
             ExpiresIn=expires_in,
@@ -42,3 +94,5 @@ def generate_signed_url(r2_key: str, expires_in: int = DOWNLOAD_EXPIRY, filename
     except Exception as e:
         log.error(f"R2 signed URL failed for {r2_key}: {e}")
         return None
+    _store_url(key, url)
+    return url
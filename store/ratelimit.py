@@ -0,0 +1,22 @@
+"""Sliding-window rate limits shared by all gunicorn workers.
+
+Each allowed hit is a row in rate_limit_hits, indexed by (key, hit_at).
+hit() checks and records in a single INSERT ... SELECT. SQLite takes
+the write lock before the statement reads, so two workers can't both
+see room for the last slot. A key never has more than `limit` live rows,
+so the check costs the same however much history the store has.
+"""
+import time
+
+
+def hit(conn, key: str, limit: int, window_seconds: int) -> bool:
+    """Record a hit for key if it has fewer than limit in the window. Returns False if limited."""
+    now = time.time()
+    cutoff = now - window_seconds
+    conn.execute("DELETE FROM rate_limit_hits WHERE key = ? AND hit_at <= ?", (key, cutoff))
+    inserted = conn.execute("""
+        INSERT INTO rate_limit_hits (key, hit_at)
+        SELECT ?, ?
+        WHERE (SELECT COUNT(*) FROM rate_limit_hits WHERE key = ? AND hit_at > ?) < ?
+    """, (key, now, key, cutoff, limit)).rowcount
+    return inserted > 0
@@ -2,9 +2,15 @@ import os
 from fastapi import APIRouter, Request, HTTPException
 from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
-from db import get_db
+import catalog
+import stripe_inbox
+from db import has_email_search, read_stats, run_db
+from email_queue import queue_depth
 
 router = APIRouter(prefix="/admin")
+
+PAGE_SIZE = 50
+TICKET_STATUSES = ("open", "in_progress", "resolved", "closed")  # list order
 templates = Jinja2Templates(directory=os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates"))
 
 def get_admin_token():
@@ -35,47 +41,96 @@ async def logout():
     response.delete_cookie("admin_token")
     return response
 
+def _dashboard_data(conn):
+    stats = read_stats(conn)
+    email = queue_depth(conn)
+    stats["queued_emails"] = email["queued"]
+    stats["failed_emails"] = email["failed"]
+    recent = conn.execute("SELECT * FROM users ORDER BY purchased_at DESC, id DESC LIMIT 10").fetchall()
+    return stats, recent
+
 @router.get("")
 async def dashboard(request: Request):
     check_auth(request)
-    conn = get_db()
-    stats = {
-        "total_users": conn.execute("SELECT COUNT(*) FROM users").fetchone()[0],
-        "total_revenue": conn.execute("SELECT COALESCE(SUM(amount_cents), 0) FROM users").fetchone()[0],
-        "total_downloads": conn.execute("SELECT COALESCE(SUM(download_count), 0) FROM users").fetchone()[0],
-        "open_tickets": conn.execute("SELECT COUNT(*) FROM tickets WHERE status IN ('open','in_progress')").fetchone()[0],
-    }
-    recent = conn.execute("SELECT * FROM users ORDER BY purchased_at DESC LIMIT 10").fetchall()
-    conn.close()
+    stats, recent = await run_db(_dashboard_data)
     return templates.TemplateResponse(request, "admin/dashboard.html", {
         "stats": stats, "recent": recent, "active_page": "dashboard"
     })
 
+def _page(rows):
+    """Split a PAGE_SIZE + 1 fetch into (page, id to continue after or None)."""
+    if len(rows) > PAGE_SIZE:
+        return rows[:PAGE_SIZE], rows[PAGE_SIZE - 1]["id"]
+    return rows, None
+
+def _email_match(q: str) -> str:
+    return '"' + q.replace('"', '""') + '"'
+
+def _users_page(conn, q: str, after):
+    """Newest purchasers first, PAGE_SIZE at a time, continuing after user id `after`."""
+    where, args = [], []
+    if after:
+        last = conn.execute("SELECT purchased_at, id FROM users WHERE id = ?", (after,)).fetchone()
+        if last:
+            where.append("(u.purchased_at, u.id) < (?, ?)")
+            args += [last["purchased_at"], last["id"]]
+    source = "users u"
+    if q:
+        # Trigram search needs at least 3 characters
+        if len(q) >= 3 and has_email_search(conn):
+            source = "users_email_fts f JOIN users u ON u.id = f.rowid"
+            where.append("users_email_fts MATCH ?")
+            args.append(_email_match(q))
+        else:
+            where.append("u.email LIKE ?")
+            args.append(f"%{q}%")
+    sql = f"SELECT u.* FROM {source}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY u.purchased_at DESC, u.id DESC LIMIT ?"
+    return _page(conn.execute(sql, args + [PAGE_SIZE + 1]).fetchall())
+
 @router.get("/users")
-async def users_page(request: Request, q: str = ""):
+async def users_page(request: Request, q: str = "", after: int = 0):
     check_auth(request)
-    conn = get_db()
-    if q:
-        users = conn.execute("SELECT * FROM users WHERE email LIKE ? ORDER BY purchased_at DESC", (f"%{q}%",)).fetchall()
-    else:
-        users = conn.execute("SELECT * FROM users ORDER BY purchased_at DESC").fetchall()
-    conn.close()
+    users, next_after = await run_db(_users_page, q, after)
     return templates.TemplateResponse(request, "admin/users.html", {
-        "users": users, "query": q, "active_page": "users"
+        "users": users, "query": q, "next_after": next_after, "active_page": "users"
     })
 
+def _tickets_page(conn, after):
+    """Tickets grouped by status (open first), newest first within a status.
+
+    Each status is read from idx_tickets_status in turn, continuing after
+    ticket id `after`, until the page is full.
+    """
+    statuses = list(TICKET_STATUSES)
+    cursor = None
+    if after:
+        last = conn.execute("SELECT status, created_at, id FROM tickets WHERE id = ?", (after,)).fetchone()
+        if last and last["status"] in statuses:
+            statuses = statuses[statuses.index(last["status"]):]
+            cursor = (last["created_at"], last["id"])
+    rows = []
+    for status in statuses:
+        need = PAGE_SIZE + 1 - len(rows)
+        if need <= 0:
+            break
+        sql = "SELECT t.*, u.email FROM tickets t JOIN users u ON t.user_id = u.id WHERE t.status = ?"
+        args = [status]
+        if cursor and status == statuses[0]:
+            sql += " AND (t.created_at, t.id) < (?, ?)"
+            args += list(cursor)
+        sql += " ORDER BY t.created_at DESC, t.id DESC LIMIT ?"
+        rows += conn.execute(sql, args + [need]).fetchall()
+    return _page(rows)
+
 @router.get("/tickets")
-async def tickets_page(request: Request):
+async def tickets_page(request: Request, after: int = 0):
     check_auth(request)
-    conn = get_db()
-    tickets = conn.execute("""
-        SELECT t.*, u.email FROM tickets t
-        JOIN users u ON t.user_id = u.id
-        ORDER BY CASE t.status WHEN 'open' THEN 0 WHEN 'in_progress' THEN 1 ELSE 2 END, t.created_at DESC
-    """).fetchall()
-    conn.close()
+    tickets, next_after = await run_db(_tickets_page, after)
     return templates.TemplateResponse(request, "admin/tickets.html", {
-        "tickets": tickets, "active_page": "tickets"
+        "tickets": tickets, "next_after": next_after, "active_page": "tickets"
     })
 
 @router.post("/tickets/{ticket_id}/status")
@@ -83,20 +138,33 @@ async def update_ticket_status(request: Request, ticket_id: int):
     check_auth(request)
     form = await request.form()
     new_status = form.get("status")
-    if new_status not in ("open", "in_progress", "resolved", "closed"):
+    if new_status not in TICKET_STATUSES:
         raise HTTPException(400, "Invalid status")
-    conn = get_db()
-    conn.execute("UPDATE tickets SET status = ?, updated_at = datetime('now') WHERE id = ?", (new_status, ticket_id))
-    conn.commit()
-    conn.close()
+    await run_db(lambda conn: conn.execute(
+        "UPDATE tickets SET status = ?, updated_at = datetime('now') WHERE id = ?", (new_status, ticket_id)
+    ))
     return RedirectResponse("/admin/tickets", status_code=303)
 
 @router.get("/releases")
 async def releases_page(request: Request):
     check_auth(request)
-    conn = get_db()
-    releases = conn.execute("SELECT * FROM releases ORDER BY released_at DESC").fetchall()
-    conn.close()
+    releases = await run_db(catalog.releases)
     return templates.TemplateResponse(request, "admin/releases.html", {
         "releases": releases, "active_page": "releases"
     })
+
+@router.get("/webhooks")
+async def webhooks_page(request: Request):
+    check_auth(request)
+    failed, recent = await run_db(stripe_inbox.recent_events)
+    return templates.TemplateResponse(request, "admin/webhooks.html", {
+        "failed": failed, "recent": recent, "active_page": "webhooks"
+    })
+
+@router.post("/webhooks/{event_id}/replay")
+async def replay_webhook(request: Request, event_id: str):
+    check_auth(request)
+    if not await run_db(stripe_inbox.replay, event_id):
+        raise HTTPException(404, "No failed event with that id")
+    stripe_inbox.wake()
+    return RedirectResponse("/admin/webhooks", status_code=303)
@@ -1,13 +1,16 @@
 import logging
-from datetime import datetime, timezone
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, EmailStr
-from db import get_db
+import catalog
+import ratelimit
+from db import run_db
 from email_sender import send_download_email
 
 log = logging.getLogger("keyjawn-store")
 router = APIRouter()
 
+DOWNLOADS_PER_DAY = 5
+
 _GENERIC_OK = {"status": "ok", "message": "If that email is registered, you'll receive a download link shortly."}
 
 
@@ -15,31 +18,30 @@ class DownloadRequest(BaseModel):
     email: EmailStr
 
 
+def _record_download(conn, email: str) -> str:
+    """Log a download and queue the link email. Returns "unknown", "limited" or "ok"."""
+    user = conn.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
+    if not user:
+        return "unknown"
+
+    # Rate limit: 5 download emails per rolling 24 hours
+    if not ratelimit.hit(conn, f"download:{user['id']}", DOWNLOADS_PER_DAY, 24 * 60 * 60):
+        return "limited"
+
+    conn.execute("INSERT INTO downloads (user_id, version) VALUES (?, ?)",
+                 (user["id"], catalog.latest_version(conn) or "latest"))
+    conn.execute("UPDATE users SET download_count = download_count + 1, last_download_at = datetime('now') WHERE id = ?", (user["id"],))
+    send_download_email(email, conn=conn)
+    return "ok"
+
+
 @router.post("/api/download", status_code=202)
 async def download(req: DownloadRequest):
-    conn = get_db()
-    user = conn.execute("SELECT * FROM users WHERE email = ?", (req.email,)).fetchone()
+    result = await run_db(_record_download, req.email)
 
-    if not user:
-        conn.close()
+    if result == "unknown":
         log.info("download requested for unknown email (not disclosed to caller)")
         return _GENERIC_OK
-
-    # Rate limit: 5 download emails per day
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    count = conn.execute("""
-        SELECT COUNT(*) FROM downloads
-        WHERE user_id = ? AND downloaded_at >= ?
-    """, (user["id"], today)).fetchone()[0]
-    if count >= 5:
-        conn.close()
+    if result == "limited":
         raise HTTPException(429, "Download limit reached. Try again tomorrow.")
-
-    # Log download and send link via email
-    conn.execute("INSERT INTO downloads (user_id, version) VALUES (?, (SELECT version FROM releases ORDER BY released_at DESC LIMIT 1))", (user["id"],))
-    conn.execute("UPDATE users SET download_count = download_count + 1, last_download_at = datetime('now') WHERE id = ?", (user["id"],))
-    conn.commit()
-    conn.close()
-
-    send_download_email(req.email)
     return _GENERIC_OK
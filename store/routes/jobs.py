@@ -0,0 +1,17 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Header
+from db import run_db
+from jobs import job_status
+from routes.releases import require_admin
+
+router = APIRouter()
+
+
+@router.get("/api/jobs/{job_id}")
+async def get_job(job_id: int, authorization: Optional[str] = Header(None)):
+    """Status, progress and delivery counts of a background job."""
+    require_admin(authorization)
+    status = await run_db(job_status, job_id)
+    if status is None:
+        raise HTTPException(404, f"Job {job_id} not found")
+    return status
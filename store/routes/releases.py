@@ -3,8 +3,10 @@ import logging
 from fastapi import APIRouter, HTTPException, Header
 from pydantic import BaseModel
 from typing import Optional
-from db import get_db
-from email_sender import send_update_email
+import catalog
+import jobs
+from db import connection, run_db
+from email_queue import batch_progress, enqueue_once
 from telegram import send_telegram_alert
 
 log = logging.getLogger("keyjawn-store")
@@ -31,42 +33,89 @@ class ReleaseRequest(BaseModel):
 @router.post("/api/releases")
 async def register_release(req: ReleaseRequest, authorization: Optional[str] = Header(None)):
     require_admin(authorization)
-    conn = get_db()
-    conn.execute("""
+    await run_db(lambda conn: conn.execute("""
         INSERT INTO releases (version, r2_key, file_size, sha256, changelog)
         VALUES (?, ?, ?, ?, ?)
         ON CONFLICT(version) DO UPDATE SET r2_key=?, file_size=?, sha256=?, changelog=?
     """, (req.version, req.r2_key, req.file_size, req.sha256, req.changelog,
-          req.r2_key, req.file_size, req.sha256, req.changelog))
-    conn.commit()
-    conn.close()
+          req.r2_key, req.file_size, req.sha256, req.changelog)))
     return {"version": req.version, "status": "registered"}
 
 
-@router.post("/api/releases/{version}/notify")
+def _release_batch(version: str) -> str:
+    return f"release:{version}"
+
+
+NOTIFY_CHUNK = 200  # purchasers queued per checkpoint
+
+
+@jobs.handler("release_notify")
+def _notify_job(ctx: jobs.JobContext) -> dict:
+    """Queue an update email for every subscribed purchaser, in user id order.
+
+    Each chunk queues its recipients, records them as the job's
+    deliveries and saves the last user id in one transaction, so a
+    resumed job starts after the last purchaser it queued. A purchaser
+    already queued for this release, by this job or an earlier one,
+    keeps their existing message instead of getting a second one, and
+    only the messages this job added count as queued. Delivery is up to
+    the email queue, which resends a message only if a sender dies
+    between handing it to Gmail and recording it.
+    """
+    version = ctx.params["version"]
+    changelog = ctx.params["changelog"]
+    batch = _release_batch(version)
+    cursor = ctx.cursor or {"after": 0, "queued": 0}
+    total = ctx.total
+    while True:
+        with connection() as conn:
+            if total is None:
+                total = conn.execute("SELECT COUNT(*) FROM users WHERE unsubscribed = 0").fetchone()[0]
+            users = conn.execute("""
+                SELECT id, email FROM users WHERE unsubscribed = 0 AND id > ?
+                ORDER BY id LIMIT ?
+            """, (cursor["after"], NOTIFY_CHUNK)).fetchall()
+            if not users:
+                break
+            queued = cursor["queued"]
+            for user in users:
+                email_id, created = enqueue_once(conn, batch, "update", user["email"],
+                                                 version=version, changelog=changelog)
+                ctx.record_delivery(conn, user["email"], email_id)
+                queued += created
+            cursor = {"after": users[-1]["id"], "queued": queued}
+            ctx.checkpoint(conn, cursor, ctx.done + len(users), total)
+
+    queued = cursor["queued"]
+    skipped = ctx.done - queued
+    send_telegram_alert(
+        f"KeyJawn v{version} update emails: {queued} queued"
+        + (f", {skipped} already queued earlier" if skipped else "")
+    )
+    return {"version": version, "queued": queued, "already_queued": skipped}
+
+
+@router.post("/api/releases/{version}/notify", status_code=202)
 async def notify_purchasers(version: str, authorization: Optional[str] = Header(None)):
-    """Send update emails to all purchasers for a new release."""
+    """Start a background job that emails all purchasers about a new release.
+
+    Safe to call again: purchasers already queued for this release are skipped.
+    """
     require_admin(authorization)
 
-    conn = get_db()
-    release = conn.execute("SELECT * FROM releases WHERE version = ?", (version,)).fetchone()
+    release = await run_db(catalog.get, version)
     if not release:
-        conn.close()
         raise HTTPException(404, f"Release {version} not found")
 
-    changelog = release["changelog"] or ""
-    users = conn.execute("SELECT email FROM users WHERE unsubscribed = 0").fetchall()
-    conn.close()
-
-    sent = 0
-    failed = 0
-    for user in users:
-        try:
-            send_update_email(user["email"], version, changelog)
-            sent += 1
-        except Exception as e:
-            log.error(f"Failed to notify {user['email']}: {e}")
-            failed += 1
-
-    send_telegram_alert(f"KeyJawn v{version} update emails: {sent} sent, {failed} failed")
-    return {"version": version, "sent": sent, "failed": failed}
+    job_id = await run_db(lambda conn: jobs.submit(
+        conn, "release_notify", version=version, changelog=release["changelog"] or "",
+    ))
+    return {"version": version, "job_id": job_id, "status": "queued"}
+
+
+@router.get("/api/releases/{version}/notify")
+async def notify_progress(version: str, authorization: Optional[str] = Header(None)):
+    """Delivery progress of a release mail-out, across all its jobs."""
+    require_admin(authorization)
+    progress = await run_db(batch_progress, _release_batch(version))
+    return {"version": version, **progress}
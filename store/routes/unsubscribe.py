@@ -6,7 +6,7 @@ import os
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import HTMLResponse
 
-from db import get_db
+from db import run_db
 
 log = logging.getLogger("keyjawn-store")
 router = APIRouter()
@@ -38,10 +38,7 @@ async def unsubscribe(email: str = "", token: str = ""):
     if not hmac.compare_digest(token, expected):
         raise HTTPException(400, "Invalid unsubscribe link")
 
-    conn = get_db()
-    conn.execute("UPDATE users SET unsubscribed = 1 WHERE email = ?", (email,))
-    conn.commit()
-    conn.close()
+    await run_db(lambda conn: conn.execute("UPDATE users SET unsubscribed = 1 WHERE email = ?", (email,)))
 
     log.info("unsubscribed: %s", email)
 
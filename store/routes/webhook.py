@@ -2,7 +2,8 @@ import os
 import logging
 import stripe
 from fastapi import APIRouter, Request, HTTPException
-from db import get_db
+import stripe_inbox
+from db import run_db
 from email_sender import send_download_email
 
 log = logging.getLogger("keyjawn-store")
@@ -11,6 +12,28 @@ stripe.api_key = os.environ.get("STRIPE_API_KEY", "")
 WEBHOOK_SECRET = os.environ.get("STRIPE_WEBHOOK_SECRET", "")
 
 
+@stripe_inbox.handler("checkout.session.completed")
+def _create_purchaser(conn, event):
+    """Insert the purchaser and queue their download email.
+
+    Runs in the inbox processor's transaction, so both commit together
+    with the event being marked done.
+    """
+    session = event["data"]["object"]
+    email = session["customer_details"]["email"]
+    inserted = conn.execute("""
+        INSERT INTO users (email, stripe_customer_id, stripe_payment_intent, amount_cents)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(email) DO NOTHING
+    """, [email, session.get("customer"), session.get("payment_intent"),
+          session.get("amount_total", 400)]).rowcount
+    # Only send the welcome email to a new user; an existing purchaser already has one
+    if inserted > 0:
+        send_download_email(email, conn=conn)
+    else:
+        log.info("existing purchaser %s — skipping download email", email)
+
+
 @router.post("/webhook/stripe")
 async def stripe_webhook(request: Request):
     payload = await request.body()
@@ -23,26 +46,10 @@ async def stripe_webhook(request: Request):
     except (stripe.error.SignatureVerificationError, ValueError):
         raise HTTPException(400, "Invalid signature")
 
-    if event["type"] == "checkout.session.completed":
-        session = event["data"]["object"]
-        email = session["customer_details"]["email"]
-        customer_id = session.get("customer")
-        payment_intent = session.get("payment_intent")
-        amount = session.get("amount_total", 400)
-
-        conn = get_db()
-        result = conn.execute("""
-            INSERT INTO users (email, stripe_customer_id, stripe_payment_intent, amount_cents)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(email) DO NOTHING
-        """, [email, customer_id, payment_intent, amount])
-        conn.commit()
-        conn.close()
-
-        # Only send the welcome email if this is a new user (not a duplicate event)
-        if result.rowcount > 0:
-            send_download_email(email)
-        else:
-            log.info("duplicate stripe event for %s — skipping download email", email)
-
+    # Ack once the event is stored; the inbox processor applies it
+    stored = await run_db(stripe_inbox.store_event, event["id"], event["type"], payload.decode())
+    if stored:
+        stripe_inbox.wake()
+    else:
+        log.info("duplicate stripe event %s", event["id"])
     return {"status": "ok"}
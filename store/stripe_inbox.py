@@ -0,0 +1,165 @@
+"""Inbox for verified Stripe webhook events.
+
+The webhook route only verifies the signature and stores the event,
+keyed by Stripe's event id, then acks. Redelivered events hit the
+unique constraint and are acked without being stored again.
+
+A processor task in each gunicorn worker claims stored events in the
+order they arrived and runs the handler registered for the event type.
+The handler's writes, including queued emails, commit in one
+transaction with the event being marked done. If anything fails,
+nothing is applied and the event is retried with backoff. A claim is a
+lease tied to the attempt number, so if a lease lapses and another
+worker takes the event over, the first worker's commit is refused.
+Either way each event's side effects happen exactly once.
+
+Events that run out of attempts stay 'failed' until replayed from the
+admin page.
+"""
+import asyncio
+import json
+import logging
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from db import connection
+
+log = logging.getLogger("keyjawn-store")
+
+POLL_INTERVAL = 5  # seconds; a stored event also wakes this worker's processor
+CLAIM_LEASE_SECONDS = 120
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 3600
+
+_handlers = {}
+_wakeup: Optional[asyncio.Event] = None
+
+
+class EventTakenOver(Exception):
+    """The event's lease lapsed and another processor claimed it."""
+
+
+def handler(event_type: str):
+    """Register fn(conn, event) to apply events of this type inside the processing transaction."""
+    def register(fn):
+        _handlers[event_type] = fn
+        return fn
+    return register
+
+
+def store_event(conn, event_id: str, event_type: str, payload: str) -> bool:
+    """Store a verified event. Returns False if this event id was already received."""
+    return conn.execute("""
+        INSERT INTO stripe_events (event_id, type, payload) VALUES (?, ?, ?)
+        ON CONFLICT(event_id) DO NOTHING
+    """, (event_id, event_type, payload)).rowcount > 0
+
+
+def wake():
+    """Nudge this worker's processor after storing an event. Call from the event loop."""
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+def claim_next(conn):
+    return conn.execute(f"""
+        UPDATE stripe_events
+        SET status = 'processing', attempts = attempts + 1,
+            next_attempt_at = datetime('now', '+{CLAIM_LEASE_SECONDS} seconds')
+        WHERE seq = (
+            SELECT seq FROM stripe_events
+            WHERE status IN ('pending', 'processing') AND next_attempt_at <= datetime('now')
+            ORDER BY seq LIMIT 1
+        )
+        RETURNING *
+    """).fetchone()
+
+
+def backoff_seconds(attempts: int) -> int:
+    return min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+
+
+def _apply(row):
+    """Run the event's handler and mark it done, all in one transaction."""
+    with connection() as conn:
+        fn = _handlers.get(row["type"])
+        if fn is not None:
+            fn(conn, json.loads(row["payload"]))
+        updated = conn.execute("""
+            UPDATE stripe_events
+            SET status = 'done', processed_at = datetime('now'), last_error = NULL
+            WHERE seq = ? AND status = 'processing' AND attempts = ?
+        """, (row["seq"], row["attempts"])).rowcount
+        if not updated:
+            raise EventTakenOver(f"stripe event {row['event_id']} was claimed by another worker")
+
+
+def _record_failure(row, error: str):
+    status = "failed" if row["attempts"] >= MAX_ATTEMPTS else "pending"
+    with connection() as conn:
+        conn.execute("""
+            UPDATE stripe_events
+            SET status = ?, last_error = ?, next_attempt_at = datetime('now', '+' || ? || ' seconds')
+            WHERE seq = ? AND status = 'processing' AND attempts = ?
+        """, (status, error, backoff_seconds(row["attempts"]), row["seq"], row["attempts"]))
+    return status
+
+
+def process_one() -> bool:
+    """Claim and apply the oldest due event in this thread. Returns False if none was due."""
+    with connection() as conn:
+        row = claim_next(conn)
+    if row is None:
+        return False
+    try:
+        _apply(row)
+    except EventTakenOver as e:
+        log.warning("%s", e)
+    except Exception as e:
+        status = _record_failure(row, str(e)[:500])
+        log.exception("stripe event %s (%s) failed on attempt %d, now %s",
+                      row["event_id"], row["type"], row["attempts"], status)
+    return True
+
+
+def replay(conn, event_id: str) -> bool:
+    """Queue a failed event to run again with fresh attempts."""
+    return conn.execute("""
+        UPDATE stripe_events
+        SET status = 'pending', attempts = 0, next_attempt_at = datetime('now'), last_error = NULL
+        WHERE event_id = ? AND status = 'failed'
+    """, (event_id,)).rowcount > 0
+
+
+def recent_events(conn, limit: int = 50) -> tuple:
+    """(failed events, most recent events) for the admin page."""
+    failed = conn.execute(
+        "SELECT * FROM stripe_events WHERE status = 'failed' ORDER BY seq DESC LIMIT ?", (limit,)
+    ).fetchall()
+    recent = conn.execute("SELECT * FROM stripe_events ORDER BY seq DESC LIMIT ?", (limit,)).fetchall()
+    return failed, recent
+
+
+async def run_processor():
+    """Apply stored events until cancelled."""
+    global _wakeup
+    _wakeup = asyncio.Event()
+    try:
+        while True:
+            try:
+                ran = await run_in_threadpool(process_one)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("stripe event processor error")
+                ran = False
+            if not ran:
+                try:
+                    await asyncio.wait_for(_wakeup.wait(), timeout=POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                _wakeup.clear()
+    finally:
+        _wakeup = None
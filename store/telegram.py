@@ -1,23 +1,151 @@
+"""Telegram alerts for the store.
+
+send_telegram_alert() never waits on Telegram. While the app is running
+it hands the message to the dispatcher and returns. Handlers on the
+event loop and job handlers in the threadpool can both call it.
+
+The dispatcher posts from one background task over a shared
+httpx.AsyncClient. Alerts that arrive within COALESCE_SECONDS of each
+other go out as a single digest message. At most MAX_QUEUED alerts wait
+at a time; past that the oldest are dropped and the next digest says
+how many.
+
+Outside the app (scripts, tests without the lifespan) alerts are posted
+synchronously, as before.
+"""
 import os
 import html
+import asyncio
 import logging
+import threading
+from collections import deque
+from typing import Optional
+
 import httpx
 
 log = logging.getLogger("keyjawn-store")
 BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN", "")
 CHAT_ID = os.environ.get("TELEGRAM_CHAT_ID", "")
 
+TIMEOUT = 10  # seconds
+COALESCE_SECONDS = 2
+MAX_QUEUED = 50
+MAX_MESSAGE_CHARS = 4000  # Telegram caps messages at 4096
+
+
+def _url() -> str:
+    return f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
+
+
+def _payload(message: str) -> dict:
+    return {"chat_id": CHAT_ID, "text": html.escape(message), "parse_mode": "HTML"}
+
+
+def digest(messages: list, dropped: int = 0) -> str:
+    """Combine queued alerts into one message."""
+    if len(messages) == 1 and not dropped:
+        return messages[0]
+    header = f"{len(messages)} alerts"
+    if dropped:
+        header += f" ({dropped} older dropped)"
+    text = "\n".join([header + ":"] + [f"- {m}" for m in messages])
+    if len(text) > MAX_MESSAGE_CHARS:
+        text = text[:MAX_MESSAGE_CHARS - 3] + "..."
+    return text
+
+
+class AlertDispatcher:
+    def __init__(self, max_queued: int = MAX_QUEUED, coalesce_seconds: float = COALESCE_SECONDS,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.coalesce_seconds = coalesce_seconds
+        self._pending: deque = deque(maxlen=max_queued)
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._transport = transport
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def submit(self, message: str):
+        """Queue an alert. Safe to call from the event loop or any thread."""
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self._dropped += 1  # the append below pushes out the oldest
+            self._pending.append(message)
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _drain(self):
+        with self._lock:
+            messages = list(self._pending)
+            self._pending.clear()
+            dropped, self._dropped = self._dropped, 0
+        return messages, dropped
+
+    async def _flush(self):
+        messages, dropped = self._drain()
+        if not messages:
+            return
+        try:
+            resp = await self._client.post(_url(), json=_payload(digest(messages, dropped)))
+            resp.raise_for_status()
+        except Exception as e:
+            log.error(f"Telegram alert failed: {e}")
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            # Let a burst collect so it goes out as one message
+            await asyncio.sleep(self.coalesce_seconds)
+            self._wakeup.clear()
+            await self._flush()
+
+    def start(self):
+        """Start dispatching on the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._client = httpx.AsyncClient(
+            timeout=TIMEOUT,
+            limits=httpx.Limits(max_connections=2, max_keepalive_connections=1),
+            transport=self._transport,
+        )
+        self._task = asyncio.create_task(self._run())
+        if self._pending:
+            self._wakeup.set()
+
+    async def close(self):
+        """Stop dispatching, sending whatever is still queued."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._loop = None
+        try:
+            await asyncio.wait_for(self._flush(), timeout=TIMEOUT)
+        except asyncio.TimeoutError:
+            log.warning("Telegram alerts still queued at shutdown were dropped")
+        await self._client.aclose()
+        self._client = None
+
+
+dispatcher = AlertDispatcher()
+
 
 def send_telegram_alert(message: str):
     if not BOT_TOKEN or not CHAT_ID:
         log.warning("Telegram not configured, skipping alert")
         return
+    if dispatcher.running:
+        dispatcher.submit(message)
+        return
     try:
-        escaped = html.escape(message)
-        httpx.post(
-            f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage",
-            json={"chat_id": CHAT_ID, "text": escaped, "parse_mode": "HTML"},
-            timeout=10,
-        )
+        httpx.post(_url(), json=_payload(message), timeout=TIMEOUT)
     except Exception as e:
         log.error(f"Telegram alert failed: {e}")
@@ -24,3 +24,79 @@ def test_admin_login_with_token():
     resp2 = client.get("/admin")
     assert resp2.status_code == 200
     assert "Dashboard" in resp2.text
+
+
+def _seed_admin_db(tmp_path, users=0, tickets=()):
+    from db import connection, init_db
+    init_db()
+    with connection() as conn:
+        for i in range(users):
+            conn.execute(
+                "INSERT INTO users (email, purchased_at) VALUES (?, datetime('2025-01-01', ? || ' minutes'))",
+                (f"user{i:03d}@example.com", i),
+            )
+        for status, created_at in tickets:
+            conn.execute(
+                "INSERT INTO tickets (user_id, subject, body, status, created_at) VALUES (1, 's', 'b', ?, ?)",
+                (status, created_at),
+            )
+
+
+def test_users_page_uses_keyset_pagination(tmp_path):
+    from unittest.mock import patch
+    with patch("db.DB_PATH", str(tmp_path / "store.db")), patch("routes.admin.PAGE_SIZE", 4):
+        _seed_admin_db(tmp_path, users=10)
+        from db import connection
+        from routes.admin import _users_page
+
+        seen = []
+        after = 0
+        with connection() as conn:
+            while True:
+                page, after = _users_page(conn, "", after)
+                seen += [u["email"] for u in page]
+                if after is None:
+                    break
+        assert seen == [f"user{i:03d}@example.com" for i in reversed(range(10))]
+
+
+def test_users_search_matches_substrings(tmp_path):
+    from unittest.mock import patch
+    with patch("db.DB_PATH", str(tmp_path / "store.db")):
+        _seed_admin_db(tmp_path, users=30)
+        from db import connection, has_email_search
+        from routes.admin import _users_page
+
+        with connection() as conn:
+            assert has_email_search(conn)
+            page, after = _users_page(conn, "er01", 0)
+            assert [u["email"] for u in page] == [f"user01{i}@example.com" for i in reversed(range(10))]
+            assert after is None
+            # Too short for trigrams: falls back to LIKE
+            page, _ = _users_page(conn, "29", 0)
+            assert [u["email"] for u in page] == ["user029@example.com"]
+
+
+def test_tickets_page_lists_open_first_across_pages(tmp_path):
+    from unittest.mock import patch
+    tickets = [
+        ("closed", "2025-01-05"), ("open", "2025-01-01"), ("resolved", "2025-01-04"),
+        ("in_progress", "2025-01-03"), ("open", "2025-01-02"),
+    ]
+    with patch("db.DB_PATH", str(tmp_path / "store.db")), patch("routes.admin.PAGE_SIZE", 2):
+        _seed_admin_db(tmp_path, users=1, tickets=tickets)
+        from db import connection
+        from routes.admin import _tickets_page
+
+        order = []
+        after = 0
+        with connection() as conn:
+            while True:
+                page, after = _tickets_page(conn, after)
+                order += [(t["status"], t["created_at"]) for t in page]
+                if after is None:
+                    break
+        assert order == [
+            ("open", "2025-01-02"), ("open", "2025-01-01"), ("in_progress", "2025-01-03"),
+            ("resolved", "2025-01-04"), ("closed", "2025-01-05"),
+        ]
@@ -20,3 +20,112 @@ def test_init_db_creates_tables():
             assert "releases" in tables
     finally:
         os.unlink(tmp_path)
+
+
+def _temp_db_path():
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        return f.name
+
+
+def test_pool_reuses_connections_and_stays_bounded():
+    import threading
+    from db import ConnectionPool
+
+    tmp_path = _temp_db_path()
+    pool = ConnectionPool(tmp_path, size=2)
+    try:
+        seen = set()
+        lock = threading.Lock()
+        barrier = threading.Barrier(4, timeout=5)
+
+        def worker():
+            barrier.wait()
+            for _ in range(10):
+                with pool.connection() as conn:
+                    conn.execute("SELECT 1").fetchone()
+                    with lock:
+                        seen.add(id(conn))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert 1 <= len(seen) <= 2
+    finally:
+        pool.close()
+        os.unlink(tmp_path)
+
+
+def test_pool_connection_commits_or_rolls_back():
+    import pytest
+    from db import ConnectionPool
+
+    tmp_path = _temp_db_path()
+    pool = ConnectionPool(tmp_path, size=1)
+    try:
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.execute("INSERT INTO t VALUES (1)")
+        with pytest.raises(RuntimeError):
+            with pool.connection() as conn:
+                conn.execute("INSERT INTO t VALUES (2)")
+                raise RuntimeError("handler failed")
+        with pool.connection() as conn:
+            assert [r[0] for r in conn.execute("SELECT x FROM t")] == [1]
+    finally:
+        pool.close()
+        os.unlink(tmp_path)
+
+
+def test_run_db_runs_queries_off_the_event_loop():
+    import asyncio
+    import threading
+
+    tmp_path = _temp_db_path()
+    try:
+        with patch("db.DB_PATH", tmp_path):
+            from db import init_db, run_db
+            init_db()
+
+            def query(conn):
+                return threading.get_ident(), conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+            async def main():
+                return threading.get_ident(), await run_db(query)
+
+            loop_thread, (query_thread, count) = asyncio.run(main())
+            assert count == 0
+            assert query_thread != loop_thread
+    finally:
+        os.unlink(tmp_path)
+
+
+def test_stats_follow_writes_without_rescanning():
+    tmp_path = _temp_db_path()
+    try:
+        with patch("db.DB_PATH", tmp_path):
+            from db import STATS_SQL, connection, init_db, read_stats
+            init_db()
+            with connection() as conn:
+                conn.execute("INSERT INTO users (email, amount_cents) VALUES ('a@example.com', 400)")
+                conn.execute("INSERT INTO users (email, amount_cents) VALUES ('b@example.com', 500)")
+                conn.execute("UPDATE users SET download_count = download_count + 2 WHERE email = 'a@example.com'")
+                conn.execute("INSERT INTO tickets (user_id, subject, body) VALUES (1, 's', 'b')")
+                conn.execute("INSERT INTO tickets (user_id, subject, body) VALUES (1, 's', 'b')")
+                conn.execute("UPDATE tickets SET status = 'resolved' WHERE id = 1")
+                conn.execute("DELETE FROM users WHERE email = 'b@example.com'")
+
+            with connection() as conn:
+                stats = read_stats(conn)
+                assert stats == {
+                    "total_users": 1, "total_revenue": 400, "total_downloads": 2, "open_tickets": 1,
+                }
+                assert stats == {name: conn.execute(sql).fetchone()[0] for name, sql in STATS_SQL.items()}
+
+            # Re-running init_db leaves the live counters alone
+            init_db()
+            with connection() as conn:
+                assert read_stats(conn)["total_users"] == 1
+    finally:
+        os.unlink(tmp_path)
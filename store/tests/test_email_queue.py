@@ -0,0 +1,246 @@
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import asyncio
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture
+def queue_db():
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        tmp_path = f.name
+    with patch("db.DB_PATH", tmp_path):
+        from db import init_db
+        init_db()
+        yield tmp_path
+    os.unlink(tmp_path)
+
+
+def _rows():
+    from db import connection
+    with connection() as conn:
+        return [dict(r) for r in conn.execute("SELECT * FROM email_queue ORDER BY id")]
+
+
+def test_send_functions_only_queue(queue_db):
+    from email_sender import send_download_email, send_ticket_confirmation
+
+    with patch("email_sender.smtplib.SMTP") as smtp:
+        send_download_email("buyer@example.com")
+        send_ticket_confirmation("buyer@example.com", "Ctrl bug", 7)
+    smtp.assert_not_called()
+
+    rows = _rows()
+    assert [(r["kind"], r["status"]) for r in rows] == [("download", "pending"), ("ticket", "pending")]
+
+
+def test_enqueue_rolls_back_with_callers_transaction(queue_db):
+    from db import connection
+    from email_sender import send_download_email
+
+    with pytest.raises(RuntimeError):
+        with connection() as conn:
+            send_download_email("buyer@example.com", conn=conn)
+            raise RuntimeError("handler failed")
+    assert _rows() == []
+
+
+class FakeSession:
+    def __init__(self, fail_for=()):
+        self.fail_for = set(fail_for)
+        self.sent = []
+        self.opened = 0
+
+    def __call__(self):
+        self.opened += 1
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def send(self, kind, to_email, params):
+        if to_email in self.fail_for:
+            raise OSError("smtp down")
+        self.sent.append((kind, to_email, params))
+
+
+def test_sender_delivers_and_retries_with_backoff(queue_db):
+    from db import connection
+    from email_queue import MAX_ATTEMPTS, process_due
+    from email_sender import send_ticket_confirmation, send_update_email
+
+    send_update_email("ok@example.com", "0.3.0", "- faster")
+    send_ticket_confirmation("flaky@example.com", "Bug", 1)
+
+    session = FakeSession(fail_for={"flaky@example.com"})
+    assert asyncio.run(process_due(session)) == 2
+    assert session.opened == 1
+    assert session.sent == [("update", "ok@example.com", {"version": "0.3.0", "changelog": "- faster"})]
+
+    ok, flaky = _rows()
+    assert ok["status"] == "sent" and ok["sent_at"]
+    assert flaky["status"] == "pending"
+    assert flaky["attempts"] == 1
+    assert flaky["last_error"] == "smtp down"
+
+    # Backed off: not due yet
+    assert asyncio.run(process_due(session)) == 0
+
+    with connection() as conn:
+        conn.execute("UPDATE email_queue SET attempts = ?, next_attempt_at = datetime('now') WHERE id = ?",
+                     (MAX_ATTEMPTS - 1, flaky["id"]))
+    asyncio.run(process_due(session))
+    assert _rows()[1]["status"] == "failed"
+
+
+def test_batch_queues_each_recipient_once_and_yields_to_transactional_mail(queue_db):
+    from db import connection
+    from email_queue import BATCH_SIZE, batch_progress, enqueue_once, process_due
+    from email_sender import send_download_email
+
+    recipients = [f"user{i}@example.com" for i in range(BATCH_SIZE + 5)]
+    with connection() as conn:
+        first = [enqueue_once(conn, "release:0.3.0", "update", to, version="0.3.0") for to in recipients[:10]]
+    with connection() as conn:
+        # A re-run gets the existing message back for addresses already queued
+        again = [enqueue_once(conn, "release:0.3.0", "update", to, version="0.3.0") for to in recipients]
+    ids = [message_id for message_id, _ in again]
+    assert ids[:10] == [message_id for message_id, _ in first]
+    assert all(created for _, created in first)
+    assert [created for _, created in again] == [False] * 10 + [True] * (len(recipients) - 10)
+    assert len(set(ids)) == len(recipients)
+    send_download_email("buyer@example.com")
+
+    session = FakeSession()
+    asyncio.run(process_due(session))
+    assert session.sent[0][:2] == ("download", "buyer@example.com")
+
+    with connection() as conn:
+        progress = batch_progress(conn, "release:0.3.0")
+    assert progress["total"] == BATCH_SIZE + 5
+    assert progress["sent"] == BATCH_SIZE - 1
+    assert progress["pending"] == 6
+
+
+def test_claimed_rows_are_not_claimed_twice(queue_db):
+    from db import connection
+    from email_queue import claim_due
+    from email_sender import send_download_email
+
+    send_download_email("buyer@example.com")
+    with connection() as conn:
+        first = claim_due(conn)
+    with connection() as conn:
+        second = claim_due(conn)
+    assert len(first) == 1
+    assert second == []
+
+
+def test_backoff_grows_and_caps():
+    from email_queue import BACKOFF_MAX_SECONDS, backoff_seconds
+    assert [backoff_seconds(n) for n in (1, 2, 3)] == [60, 120, 240]
+    assert backoff_seconds(20) == BACKOFF_MAX_SECONDS
+
+
+def test_mail_session_renders_queued_message():
+    from email_sender import MailSession
+
+    with patch("email_sender.SmtpSession.send") as send:
+        with MailSession() as session:
+            session.send("ticket", "buyer@example.com", {"subject": "Ctrl bug", "ticket_id": 7})
+    to, subject, html = send.call_args.args
+    assert to == "buyer@example.com"
+    assert subject == "Re: Ctrl bug [#7]"
+    assert "ticket #7" in html
+
+
+def test_mail_session_reuses_smtp_login_and_shared_template():
+    from email_sender import MailSession
+
+    params = {"version": "0.3.0", "changelog": "- faster"}
+    with patch("email_sender.smtplib.SMTP") as smtp, \
+            patch("email_sender._apk_url", return_value="https://r2.example/apk") as apk_url:
+        with MailSession() as session:
+            session.send("update", "a@example.com", params)
+            session.send("update", "b@example.com", params)
+
+    smtp.assert_called_once()
+    conn = smtp.return_value
+    conn.login.assert_called_once()
+    assert conn.sendmail.call_count == 2
+    apk_url.assert_called_once_with("0.3.0")
+    conn.quit.assert_called_once()
+
+
+def test_failed_login_fails_rest_of_session_without_retrying():
+    import smtplib
+    from email_sender import MailSession
+
+    params = {"version": "0.3.0", "changelog": ""}
+    with patch("email_sender.smtplib.SMTP") as smtp, \
+            patch("email_sender._apk_url", return_value="https://r2.example/apk"):
+        smtp.return_value.login.side_effect = smtplib.SMTPAuthenticationError(535, b"bad credentials")
+        with MailSession() as session:
+            for to in ("a@example.com", "b@example.com", "c@example.com"):
+                with pytest.raises(smtplib.SMTPException):
+                    session.send("update", to, params)
+
+    smtp.assert_called_once()
+    smtp.return_value.login.assert_called_once()
+
+
+def test_sender_renews_its_batch_and_yields_rows_it_lost(queue_db):
+    from db import connection
+    from email_queue import claim_due, send_claimed
+    from email_sender import send_download_email
+
+    for to in ("a@example.com", "b@example.com", "c@example.com"):
+        send_download_email(to)
+    with connection() as conn:
+        rows = claim_due(conn)
+
+    class SlowSession(FakeSession):
+        def send(self, kind, to_email, params):
+            super().send(kind, to_email, params)
+            if to_email != "a@example.com":
+                return
+            with connection() as conn:
+                # The next row's lease was pushed out before this send
+                assert conn.execute(
+                    "SELECT next_attempt_at > datetime('now', '+200 seconds') FROM email_queue WHERE id = ?",
+                    (rows[1]["id"],),
+                ).fetchone()[0] == 1
+                # Another worker takes over a@ and c@ after their leases lapse
+                conn.execute("UPDATE email_queue SET next_attempt_at = datetime('now', '-1 second') "
+                             "WHERE to_email != 'b@example.com'")
+                assert {r["to_email"] for r in claim_due(conn)} == {"a@example.com", "c@example.com"}
+
+    session = SlowSession()
+    send_claimed(rows, session)
+
+    assert [to for _, to, _ in session.sent] == ["a@example.com", "b@example.com"]
+    by_email = {r["to_email"]: r for r in _rows()}
+    # The stale sender's result did not overwrite the new owner's claim
+    assert (by_email["a@example.com"]["status"], by_email["a@example.com"]["attempts"]) == ("sending", 2)
+    assert by_email["b@example.com"]["status"] == "sent"
+    assert (by_email["c@example.com"]["status"], by_email["c@example.com"]["attempts"]) == ("sending", 2)
+
+
+def test_lapsed_claim_on_last_attempt_is_marked_failed(queue_db):
+    from db import connection
+    from email_queue import MAX_ATTEMPTS, claim_due
+    from email_sender import send_download_email
+
+    send_download_email("crashy@example.com")
+    with connection() as conn:
+        conn.execute("UPDATE email_queue SET status = 'sending', attempts = ?, "
+                     "next_attempt_at = datetime('now', '-1 second')", (MAX_ATTEMPTS,))
+        assert claim_due(conn) == []
+    (row,) = _rows()
+    assert (row["status"], row["attempts"]) == ("failed", MAX_ATTEMPTS)
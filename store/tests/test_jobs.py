@@ -0,0 +1,166 @@
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture
+def jobs_db():
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        tmp_path = f.name
+    with patch("db.DB_PATH", tmp_path):
+        from db import connection, init_db
+        init_db()
+        with connection() as conn:
+            conn.execute("INSERT INTO releases (version, r2_key, changelog) VALUES ('0.3.0', 'k', '- faster')")
+            for i in range(5):
+                conn.execute("INSERT INTO users (email, unsubscribed) VALUES (?, ?)",
+                             (f"user{i}@example.com", 1 if i == 4 else 0))
+        with patch("routes.releases.send_telegram_alert"):
+            yield tmp_path
+    os.unlink(tmp_path)
+
+
+def _submit_notify():
+    import jobs
+    import routes.releases  # noqa: F401  registers the release_notify handler
+    from db import connection
+    with connection() as conn:
+        return jobs.submit(conn, "release_notify", version="0.3.0", changelog="- faster")
+
+
+def _queued_emails():
+    from db import connection
+    with connection() as conn:
+        return [r["to_email"] for r in conn.execute("SELECT to_email FROM email_queue ORDER BY id")]
+
+
+def test_notify_job_queues_every_subscriber_once(jobs_db):
+    import jobs
+    from db import connection
+
+    job_id = _submit_notify()
+    assert jobs.run_one() is True
+    assert jobs.run_one() is False
+
+    with connection() as conn:
+        status = jobs.job_status(conn, job_id)
+    assert status["status"] == "done"
+    assert (status["done"], status["total"]) == (4, 4)
+    assert status["result"] == {"version": "0.3.0", "queued": 4, "already_queued": 0}
+    assert status["deliveries"]["pending"] == 4
+    assert len(_queued_emails()) == 4
+
+    # A second notify for the same release tracks the same messages
+    # and reports that it queued nothing new
+    second = _submit_notify()
+    jobs.run_one()
+    with connection() as conn:
+        status = jobs.job_status(conn, second)
+    assert status["deliveries"]["total"] == 4
+    assert status["result"] == {"version": "0.3.0", "queued": 0, "already_queued": 4}
+    assert len(_queued_emails()) == 4
+
+
+def test_notify_job_resumes_after_last_checkpoint(jobs_db):
+    import email_queue
+    import jobs
+    from db import connection
+
+    job_id = _submit_notify()
+    real_enqueue = email_queue.enqueue_once
+    calls = 0
+
+    def flaky_enqueue(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 3:
+            raise RuntimeError("worker killed")
+        return real_enqueue(*args, **kwargs)
+
+    with patch("routes.releases.NOTIFY_CHUNK", 2), \
+            patch("routes.releases.enqueue_once", side_effect=flaky_enqueue):
+        jobs.run_one()
+        with connection() as conn:
+            status = jobs.job_status(conn, job_id)
+        assert status["status"] == "queued"
+        assert status["done"] == 2
+        assert status["error"] == "worker killed"
+
+        jobs.run_one()
+
+    with connection() as conn:
+        status = jobs.job_status(conn, job_id)
+    assert status["status"] == "done"
+    assert status["attempts"] == 2
+    assert status["deliveries"]["total"] == 4
+    assert status["result"]["queued"] == 4
+    assert sorted(_queued_emails()) == [f"user{i}@example.com" for i in range(4)]
+
+
+def test_checkpoint_from_a_superseded_worker_is_rejected(jobs_db):
+    import jobs
+    from db import connection
+
+    _submit_notify()
+    with connection() as conn:
+        row = jobs.claim_next(conn, "worker-a")
+        conn.execute("UPDATE jobs SET owner = 'worker-b' WHERE id = ?", (row["id"],))
+    ctx = jobs.JobContext(row, "worker-a")
+    with pytest.raises(jobs.JobLost):
+        with connection() as conn:
+            ctx.checkpoint(conn, 10, 2)
+
+
+def test_job_endpoint_requires_admin_and_reports_progress(jobs_db):
+    from fastapi.testclient import TestClient
+    from app import app
+
+    os.environ["ADMIN_TOKEN"] = "testtoken"
+    client = TestClient(app)
+    auth = {"Authorization": "Bearer testtoken"}
+
+    resp = client.post("/api/releases/0.3.0/notify", headers=auth)
+    assert resp.status_code == 202
+    job_id = resp.json()["job_id"]
+
+    assert client.get(f"/api/jobs/{job_id}").status_code == 401
+    resp = client.get(f"/api/jobs/{job_id}", headers=auth)
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "queued"
+    assert client.get("/api/jobs/999999", headers=auth).status_code == 404
+
+
+def test_repeated_notify_delivers_one_update_per_subscriber(jobs_db):
+    import asyncio
+    import jobs
+    from email_queue import process_due
+
+    class Session:
+        def __init__(self):
+            self.sent = []
+
+        def __call__(self):
+            return self
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def send(self, kind, to_email, params):
+            self.sent.append(to_email)
+
+    session = Session()
+    _submit_notify()
+    jobs.run_one()
+    asyncio.run(process_due(session))
+    _submit_notify()
+    jobs.run_one()
+    asyncio.run(process_due(session))
+
+    assert sorted(session.sent) == [f"user{i}@example.com" for i in range(4)]
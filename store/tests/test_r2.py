@@ -0,0 +1,78 @@
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture
+def r2():
+    import r2
+    r2._client = None
+    r2.clear_url_cache()
+    with patch("r2.boto3.client") as make_client:
+        make_client.return_value.generate_presigned_url.side_effect = (
+            lambda op, Params, ExpiresIn: f"https://r2.example/{Params['Key']}?n={make_client.return_value.generate_presigned_url.call_count}"
+        )
+        yield r2, make_client
+    r2._client = None
+    r2.clear_url_cache()
+
+
+def test_client_is_built_once_across_threads(r2):
+    module, make_client = r2
+    clients = []
+    threads = [threading.Thread(target=lambda: clients.append(module.get_r2_client())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    make_client.assert_called_once()
+    assert len({id(c) for c in clients}) == 1
+
+
+def test_signed_url_is_reused_per_key_and_filename(r2):
+    module, make_client = r2
+    sign = make_client.return_value.generate_presigned_url
+
+    first = module.generate_signed_url("keyjawn/v0.3.0.apk", filename="keyjawn-v0.3.0.apk")
+    assert module.generate_signed_url("keyjawn/v0.3.0.apk", filename="keyjawn-v0.3.0.apk") == first
+    assert sign.call_count == 1
+
+    other = module.generate_signed_url("keyjawn/v0.3.0.apk", filename="other.apk")
+    assert other != first
+    assert sign.call_count == 2
+
+
+def test_signed_url_is_re_signed_once_too_old(r2):
+    module, make_client = r2
+    sign = make_client.return_value.generate_presigned_url
+
+    with patch("r2.time.monotonic", return_value=1000.0):
+        first = module.generate_signed_url("keyjawn/v0.3.0.apk")
+    with patch("r2.time.monotonic", return_value=1000.0 + module.URL_MAX_AGE + 1):
+        second = module.generate_signed_url("keyjawn/v0.3.0.apk")
+    assert second != first
+    assert sign.call_count == 2
+
+
+def test_failed_signing_is_not_cached(r2):
+    module, make_client = r2
+    sign = make_client.return_value.generate_presigned_url
+    sign.side_effect = RuntimeError("no credentials")
+    assert module.generate_signed_url("keyjawn/v0.3.0.apk") is None
+    sign.side_effect = None
+    sign.return_value = "https://r2.example/ok"
+    assert module.generate_signed_url("keyjawn/v0.3.0.apk") == "https://r2.example/ok"
+
+
+def test_cache_evicts_least_recently_used(r2):
+    module, _ = r2
+    with patch("r2.URL_CACHE_SIZE", 2):
+        module.generate_signed_url("a")
+        module.generate_signed_url("b")
+        module.generate_signed_url("a")
+        module.generate_signed_url("c")
+    assert [k[0] for k in module._url_cache] == ["a", "c"]
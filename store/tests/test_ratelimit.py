@@ -0,0 +1,48 @@
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import threading
+from unittest.mock import patch
+
+
+def test_sliding_window_allows_limit_then_recovers(tmp_path):
+    with patch("db.DB_PATH", str(tmp_path / "store.db")):
+        from db import connection, init_db
+        import ratelimit
+        init_db()
+
+        with patch("ratelimit.time.time", return_value=1000.0):
+            with connection() as conn:
+                assert [ratelimit.hit(conn, "download:1", 3, 60) for _ in range(4)] == [True, True, True, False]
+                assert ratelimit.hit(conn, "download:2", 3, 60)
+        with patch("ratelimit.time.time", return_value=1061.0):
+            with connection() as conn:
+                assert ratelimit.hit(conn, "download:1", 3, 60)
+                # Expired hits were pruned, so the key holds only live rows
+                rows = conn.execute("SELECT COUNT(*) FROM rate_limit_hits WHERE key = 'download:1'").fetchone()[0]
+                assert rows == 1
+
+
+def test_concurrent_hits_never_exceed_limit(tmp_path):
+    with patch("db.DB_PATH", str(tmp_path / "store.db")):
+        from db import connection, init_db
+        import ratelimit
+        init_db()
+
+        results = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(8, timeout=5)
+
+        def worker():
+            barrier.wait()
+            with connection() as conn:
+                allowed = ratelimit.hit(conn, "download:1", 5, 60)
+            with lock:
+                results.append(allowed)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results.count(True) == 5
@@ -24,3 +24,45 @@ def test_register_release_with_valid_token():
     )
     assert resp.status_code == 200
     assert resp.json()["version"] == "0.2.0"
+
+
+def test_register_release_refreshes_cached_catalog(tmp_path):
+    from unittest.mock import patch
+    os.environ["ADMIN_TOKEN"] = "testtoken"
+    with patch("db.DB_PATH", str(tmp_path / "store.db")):
+        import catalog
+        from db import connection, init_db
+        from app import app
+        init_db()
+        with connection() as conn:
+            conn.execute("INSERT INTO releases (version, r2_key, released_at) VALUES ('0.2.0', 'k', '2025-01-01')")
+            assert catalog.latest_version(conn) == "0.2.0"
+
+        client = TestClient(app)
+        resp = client.post("/api/releases", json={"version": "0.3.0", "r2_key": "k3"},
+                           headers={"Authorization": "Bearer testtoken"})
+        assert resp.status_code == 200
+        with connection() as conn:
+            assert catalog.latest_version(conn) == "0.3.0"
+
+
+def test_catalog_reloads_only_when_stamp_changes(tmp_path):
+    from unittest.mock import patch
+    with patch("db.DB_PATH", str(tmp_path / "store.db")):
+        import catalog
+        from db import connection, get_db, init_db
+        init_db()
+        with connection() as conn:
+            conn.execute("INSERT INTO releases (version, r2_key, released_at) VALUES ('0.2.0', 'k', '2025-01-01')")
+            first = catalog.releases(conn)
+            assert catalog.releases(conn) is first
+
+        # A write from another connection (another worker) bumps the stamp
+        other = get_db()
+        other.execute("UPDATE releases SET changelog = '- fixes' WHERE version = '0.2.0'")
+        other.commit()
+        other.close()
+
+        with connection() as conn:
+            assert catalog.get(conn, "0.2.0")["changelog"] == "- fixes"
+            assert catalog.get(conn, "9.9.9") is None
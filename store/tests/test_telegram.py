@@ -0,0 +1,74 @@
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+
+
+def _dispatcher(posted, delay=0.0, **kwargs):
+    from telegram import AlertDispatcher
+
+    async def handle(request):
+        if delay:
+            await asyncio.sleep(delay)
+        posted.append(json.loads(request.content)["text"])
+        return httpx.Response(200, json={"ok": True})
+
+    return AlertDispatcher(transport=httpx.MockTransport(handle), **kwargs)
+
+
+def test_burst_goes_out_as_one_digest():
+    posted = []
+
+    async def main():
+        dispatcher = _dispatcher(posted, coalesce_seconds=0.05)
+        dispatcher.start()
+        dispatcher.submit("ticket #1")
+        dispatcher.submit("ticket #2")
+        threading.Thread(target=dispatcher.submit, args=("ticket #3",)).start()
+        await asyncio.sleep(0.2)
+        dispatcher.submit("later")
+        await asyncio.sleep(0.2)
+        await dispatcher.close()
+
+    asyncio.run(main())
+    assert posted == ["3 alerts:\n- ticket #1\n- ticket #2\n- ticket #3", "later"]
+
+
+def test_overload_drops_oldest_and_says_so():
+    posted = []
+
+    async def main():
+        dispatcher = _dispatcher(posted, max_queued=3, coalesce_seconds=0.05)
+        dispatcher.start()
+        for i in range(5):
+            dispatcher.submit(f"alert {i}")
+        await asyncio.sleep(0.2)
+        await dispatcher.close()
+
+    asyncio.run(main())
+    assert posted == ["3 alerts (2 older dropped):\n- alert 2\n- alert 3\n- alert 4"]
+
+
+def test_send_alert_returns_without_waiting_on_telegram():
+    import telegram
+    posted = []
+
+    async def main():
+        dispatcher = _dispatcher(posted, delay=0.5, coalesce_seconds=0)
+        with patch("telegram.dispatcher", dispatcher), \
+                patch("telegram.BOT_TOKEN", "token"), patch("telegram.CHAT_ID", "chat"):
+            dispatcher.start()
+            started = time.monotonic()
+            telegram.send_telegram_alert("new <ticket>")
+            elapsed = time.monotonic() - started
+            await dispatcher.close()
+        return elapsed
+
+    assert asyncio.run(main()) < 0.05
+    assert posted == ["new &lt;ticket&gt;"]
@@ -14,35 +14,128 @@ def test_webhook_rejects_missing_signature():
     assert resp.status_code == 400
 
 
-def test_webhook_creates_user_on_valid_event():
-    from app import app
-    from db import get_db, init_db
-    init_db()
-    client = TestClient(app)
+def test_webhook_creates_user_on_valid_event(tmp_path):
+    with patch("db.DB_PATH", str(tmp_path / "store.db")):
+        from app import app
+        from db import get_db, init_db
+        init_db()
+        client = TestClient(app)
 
-    fake_event = {
-        "type": "checkout.session.completed",
-        "data": {
-            "object": {
-                "customer_details": {"email": "test@example.com"},
-                "customer": "cus_test123",
-                "payment_intent": "pi_test123",
-                "amount_total": 400
+        fake_event = {
+            "id": "evt_test123",
+            "type": "checkout.session.completed",
+            "data": {
+                "object": {
+                    "customer_details": {"email": "test@example.com"},
+                    "customer": "cus_test123",
+                    "payment_intent": "pi_test123",
+                    "amount_total": 400
+                }
             }
         }
-    }
 
-    with patch("routes.webhook.stripe.Webhook.construct_event", return_value=fake_event):
+        with patch("routes.webhook.stripe.Webhook.construct_event", return_value=fake_event):
+            with patch("routes.webhook.send_download_email"):
+                resp = client.post(
+                    "/webhook/stripe",
+                    content=json.dumps(fake_event),
+                    headers={"stripe-signature": "fake_sig"}
+                )
+
+        assert resp.status_code == 200
+
+        # The webhook only stores the event; the inbox processor applies it
+        import stripe_inbox
         with patch("routes.webhook.send_download_email"):
-            resp = client.post(
-                "/webhook/stripe",
-                content=json.dumps(fake_event),
-                headers={"stripe-signature": "fake_sig"}
-            )
-
-    assert resp.status_code == 200
-    conn = get_db()
-    user = conn.execute("SELECT * FROM users WHERE email = ?", ("test@example.com",)).fetchone()
-    conn.close()
-    assert user is not None
-    assert user["stripe_customer_id"] == "cus_test123"
+            while stripe_inbox.process_one():
+                pass
+
+        conn = get_db()
+        user = conn.execute("SELECT * FROM users WHERE email = ?", ("test@example.com",)).fetchone()
+        conn.close()
+        assert user is not None
+        assert user["stripe_customer_id"] == "cus_test123"
+
+
+def _checkout_event(event_id, email):
+    return {
+        "id": event_id,
+        "type": "checkout.session.completed",
+        "data": {"object": {
+            "customer_details": {"email": email},
+            "customer": "cus_1", "payment_intent": "pi_1", "amount_total": 400,
+        }},
+    }
+
+
+def _post_event(client, event):
+    with patch("routes.webhook.stripe.Webhook.construct_event", return_value=event):
+        return client.post("/webhook/stripe", content=json.dumps(event),
+                           headers={"stripe-signature": "fake_sig"})
+
+
+def test_redelivered_event_is_stored_and_applied_once(tmp_path):
+    with patch("db.DB_PATH", str(tmp_path / "store.db")):
+        import stripe_inbox
+        from app import app
+        from db import connection, init_db
+        init_db()
+        client = TestClient(app)
+        event = _checkout_event("evt_1", "first@example.com")
+        assert _post_event(client, event).status_code == 200
+        assert _post_event(client, event).status_code == 200
+
+        assert stripe_inbox.process_one() is True
+        assert stripe_inbox.process_one() is False
+        with connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM stripe_events").fetchone()[0] == 1
+            assert conn.execute("SELECT status FROM stripe_events").fetchone()[0] == "done"
+            emails = conn.execute("SELECT kind, to_email FROM email_queue").fetchall()
+        assert [tuple(e) for e in emails] == [("download", "first@example.com")]
+
+
+def test_failed_event_rolls_back_retries_and_can_be_replayed(tmp_path):
+    with patch("db.DB_PATH", str(tmp_path / "store.db")):
+        import stripe_inbox
+        from app import app
+        from db import connection, init_db
+        init_db()
+        client = TestClient(app)
+        _post_event(client, _checkout_event("evt_2", "second@example.com"))
+
+        with patch("routes.webhook.send_download_email", side_effect=RuntimeError("queue broke")), \
+                patch("stripe_inbox.MAX_ATTEMPTS", 1):
+            stripe_inbox.process_one()
+        with connection() as conn:
+            row = conn.execute("SELECT status, last_error FROM stripe_events").fetchone()
+            assert tuple(row) == ("failed", "queue broke")
+            # The user insert rolled back with the failed email
+            assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 0
+
+        with connection() as conn:
+            assert stripe_inbox.replay(conn, "evt_2")
+        stripe_inbox.process_one()
+        with connection() as conn:
+            assert conn.execute("SELECT status FROM stripe_events").fetchone()[0] == "done"
+            assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 1
+            assert not stripe_inbox.replay(conn, "evt_2")
+
+
+def test_takeover_refuses_stale_processor(tmp_path):
+    import pytest
+    with patch("db.DB_PATH", str(tmp_path / "store.db")):
+        import stripe_inbox
+        from db import connection, init_db
+        init_db()
+        with connection() as conn:
+            stripe_inbox.store_event(conn, "evt_3", "checkout.session.completed",
+                                     json.dumps(_checkout_event("evt_3", "third@example.com")))
+            stale = stripe_inbox.claim_next(conn)
+            # Lease lapses and another worker claims it
+            conn.execute("UPDATE stripe_events SET next_attempt_at = datetime('now', '-1 second')")
+            stripe_inbox.claim_next(conn)
+
+        with pytest.raises(stripe_inbox.EventTakenOver):
+            stripe_inbox._apply(stale)
+        with connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 0
@@ -17,3 +17,45 @@ def test_default_schedule_values():
 def test_max_posts_per_platform():
     config = Config.for_testing()
     assert config.max_posts_per_platform == 3
+
+
+def test_pass_lookups_run_concurrently_and_tolerate_optional_misses(monkeypatch):
+    import subprocess
+    import threading
+
+    from worker import config as config_module
+
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fake_pass_get(key):
+        barrier.wait()  # only passes if all three lookups are in flight at once
+        if key == "missing":
+            raise subprocess.CalledProcessError(1, ["pass", "show", key])
+        return f"value-of-{key}"
+
+    monkeypatch.setattr(config_module, "_pass_get", fake_pass_get)
+    values = config_module._pass_get_many(
+        {"a": "one", "b": "two", "c": "missing"},
+        optional=frozenset({"c"}),
+    )
+    assert values == {"a": "value-of-one", "b": "value-of-two", "c": ""}
+
+
+def test_missing_required_pass_entry_raises(monkeypatch):
+    import subprocess
+
+    import pytest
+
+    from worker import config as config_module
+
+    def fake_pass_get(key):
+        raise subprocess.CalledProcessError(1, ["pass", "show", key])
+
+    monkeypatch.setattr(config_module, "_pass_get", fake_pass_get)
+    with pytest.raises(subprocess.CalledProcessError):
+        config_module._pass_get_many({"twitter": "claude/social/twitter-keyjawn"})
+
+
+def test_scroller_daemon_is_opt_in():
+    config = Config.for_testing()
+    assert config.social_scroller.daemon is False
@@ -0,0 +1,226 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from worker.config import Config
+from worker.coordinator import DUE_SLACK_SECONDS, AdaptiveInterval, JobCoordinator
+from worker.executor import EscalationTier
+from worker.main import ACTION_RESOURCES, CURATION_RESOURCES, MONITOR_RESOURCES
+from worker.runner import WorkerRunner
+
+
+@pytest.mark.asyncio
+async def test_jobs_sharing_a_resource_never_overlap():
+    coordinator = JobCoordinator()
+    active = 0
+    peak = 0
+
+    async def job():
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return 1
+
+    await asyncio.gather(
+        coordinator.run("monitor_scan", job, resources=("twitter", "browser")),
+        coordinator.run("action_session", job, resources=("claude_cli", "twitter")),
+        coordinator.run("discovery_scan", job, resources=("twitter",)),
+    )
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_jobs_on_different_resources_run_together():
+    coordinator = JobCoordinator()
+    both_running = asyncio.Event()
+    started = 0
+
+    async def job():
+        nonlocal started
+        started += 1
+        if started == 2:
+            both_running.set()
+        await asyncio.wait_for(both_running.wait(), timeout=1)
+
+    await asyncio.gather(
+        coordinator.run("monitor_scan", job, resources=("twitter",)),
+        coordinator.run("curation_scan", job, resources=("claude_cli",)),
+    )
+
+
+@pytest.mark.asyncio
+async def test_covered_request_merges_into_in_flight_run():
+    coordinator = JobCoordinator()
+    calls = []
+    release = asyncio.Event()
+
+    async def scan(include_twitch=False):
+        calls.append(include_twitch)
+        await release.wait()
+        return len(calls)
+
+    first = asyncio.create_task(
+        coordinator.run("curation_scan_twitch", scan, coalesce_key="curation", include_twitch=True)
+    )
+    await asyncio.sleep(0)
+    second = asyncio.create_task(
+        coordinator.run("curation_scan", scan, coalesce_key="curation")
+    )
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(first, second) == [1, 1]
+    assert calls == [True]
+
+
+@pytest.mark.asyncio
+async def test_queued_requests_fold_into_one_follow_up_run():
+    coordinator = JobCoordinator()
+    calls = []
+    release = asyncio.Event()
+
+    async def scan(include_twitch=False, include_news=False):
+        calls.append((include_twitch, include_news))
+        if len(calls) == 1:
+            await release.wait()
+        return len(calls)
+
+    first = asyncio.create_task(coordinator.run("curation_scan", scan, coalesce_key="curation"))
+    await asyncio.sleep(0)
+    # Neither is covered by the running scan; they share one follow-up
+    queued = [
+        asyncio.create_task(
+            coordinator.run("curation_scan_twitch", scan, coalesce_key="curation", include_twitch=True)
+        ),
+        asyncio.create_task(
+            coordinator.run("curation_scan", scan, coalesce_key="curation", include_news=True)
+        ),
+        # Covered by the running scan, so it just waits for that one
+        asyncio.create_task(coordinator.run("curation_scan", scan, coalesce_key="curation")),
+    ]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first == 1
+    assert await asyncio.gather(*queued) == [2, 2, 1]
+    assert calls == [(False, False), (True, True)]
+
+
+@pytest.mark.asyncio
+async def test_failure_reaches_merged_callers():
+    coordinator = JobCoordinator()
+    release = asyncio.Event()
+
+    async def scan():
+        await release.wait()
+        raise RuntimeError("scan broke")
+
+    first = asyncio.create_task(coordinator.run("monitor_scan", scan))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(coordinator.run("monitor_scan", scan))
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(first, second, return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_adaptive_interval_stretches_when_quiet_and_shrinks_when_busy():
+    interval = AdaptiveInterval(base=3600, minimum=1800, maximum=7200, busy_threshold=5)
+
+    assert interval.record(0) == 5400
+    assert interval.record(0) == 7200
+    assert interval.record(0) == 7200  # capped
+    assert interval.record(2) == 5400  # ordinary run drifts back toward base
+    interval.current = 3600
+    assert interval.record(10) == pytest.approx(2412)
+    assert interval.record(10) == 1800  # floored
+
+
+def test_adaptive_interval_due_allows_trigger_jitter():
+    interval = AdaptiveInterval(base=3600, minimum=1800, maximum=7200)
+    assert interval.due(now=0)
+    interval.started(now=100)
+    assert not interval.due(now=100 + 1800)
+    assert interval.due(now=100 + 3600 - DUE_SLACK_SECONDS)
+
+
+@pytest.mark.asyncio
+async def test_scheduled_job_skips_ticks_until_due_and_adapts():
+    coordinator = JobCoordinator()
+    interval = AdaptiveInterval(base=3600, minimum=1800, maximum=7200)
+    runs = 0
+
+    async def scan():
+        nonlocal runs
+        runs += 1
+        return 0
+
+    fire = coordinator.scheduled("monitor_scan", scan, interval=interval)
+    await fire()
+    await fire()  # not due yet: skipped without calling scan
+    assert runs == 1
+    assert interval.current == 5400
+
+    interval.last_started -= 5400
+    await fire()
+    assert runs == 2
+
+
+@pytest.mark.asyncio
+async def test_monitor_scan_runs_while_action_session_awaits_approval():
+    coordinator = JobCoordinator()
+    runner = WorkerRunner(Config.for_testing(), coordinator=coordinator)
+    runner.picker = AsyncMock()
+    runner.picker.pick_actions.return_value = [{
+        "tier": EscalationTier.BUTTONS, "source": "finding",
+        "action_type": "post", "platform": "twitter", "content": "hello",
+    }]
+    runner.db = AsyncMock()
+    runner.db.log_action.return_value = 1
+    waiting = asyncio.Event()
+    decided = asyncio.Event()
+
+    async def request_approval(**kwargs):
+        waiting.set()
+        await decided.wait()
+        return "deny"
+
+    runner.approvals = AsyncMock()
+    runner.approvals.request_approval.side_effect = request_approval
+
+    session = asyncio.create_task(
+        coordinator.run("action_session", runner.run_action_session, resources=ACTION_RESOURCES)
+    )
+    await asyncio.wait_for(waiting.wait(), timeout=1)
+
+    async def scan():
+        return 0
+
+    # Neither the monitor nor curation waits for the pending approval
+    await asyncio.wait_for(
+        coordinator.run("monitor_scan", scan, resources=MONITOR_RESOURCES), timeout=1,
+    )
+    await asyncio.wait_for(
+        coordinator.run("curation_scan", scan, resources=CURATION_RESOURCES), timeout=1,
+    )
+
+    decided.set()
+    await asyncio.wait_for(session, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_action_posts_wait_for_the_platform_resource():
+    coordinator = JobCoordinator()
+    runner = WorkerRunner(Config.for_testing(), coordinator=coordinator)
+    runner.twitter = AsyncMock()
+    runner.twitter.post.return_value = "https://x.com/keyjawn/status/1"
+
+    async with coordinator.hold("twitter"):
+        post = asyncio.create_task(runner._post_to_platform("twitter", "hi", "post"))
+        await asyncio.sleep(0.01)
+        assert not post.done()
+    assert await asyncio.wait_for(post, timeout=1) == "https://x.com/keyjawn/status/1"
@@ -36,7 +36,7 @@ def test_curation_candidate_with_scores():
 
 import pytest
 import asyncio
-from worker.db import Database
+from worker.db import DATA_VERSION, Database
 
 
 @pytest.fixture
@@ -298,6 +298,79 @@ def test_twitch_parse_clip():
     assert candidate.metadata["view_count"] == 500
 
 
+import httpx
+
+
+def _twitch_transport(tokens: list[str], clip_pages: int = 1, reject_first: bool = False):
+    """Fake Helix: hands out tokens in order and pages of clips per category."""
+    calls = {"token": 0, "clips": 0}
+    issued = iter(tokens)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "id.twitch.tv":
+            calls["token"] += 1
+            return httpx.Response(200, json={"access_token": next(issued), "expires_in": 3600})
+        calls["clips"] += 1
+        if reject_first and request.headers["Authorization"] == f"Bearer {tokens[0]}":
+            return httpx.Response(401, json={"message": "invalid token"})
+        game = request.url.params["game_id"]
+        page = int(request.url.params.get("after", "0"))
+        data = [{
+            "id": f"{game}-{page}-{i}", "title": "clip",
+            "url": f"https://clips.twitch.tv/{game}-{page}-{i}",
+            "broadcaster_name": "dev",
+        } for i in range(int(request.url.params["first"]))]
+        cursor = str(page + 1) if page + 1 < clip_pages else None
+        return httpx.Response(200, json={"data": data, "pagination": {"cursor": cursor}})
+
+    return httpx.MockTransport(handler), calls
+
+
+def _twitch_source(transport, **kwargs):
+    source = TwitchSource("id", "secret", **kwargs)
+    source._client = lambda: httpx.AsyncClient(transport=transport)
+    return source
+
+
+def test_twitch_scan_shares_one_token_and_paginates():
+    transport, calls = _twitch_transport(["tok-1"], clip_pages=5)
+    source = _twitch_source(transport)
+    results = asyncio.get_event_loop().run_until_complete(source.scan())
+    assert calls["token"] == 1
+    # Two pages of 20 per category reach CLIPS_PER_CATEGORY (40).
+    assert len(results) == 2 * 40
+    assert calls["clips"] == 4
+
+
+def test_twitch_scan_stops_at_request_budget():
+    transport, calls = _twitch_transport(["tok-1"], clip_pages=5)
+    source = _twitch_source(transport, max_requests=3)
+    asyncio.get_event_loop().run_until_complete(source.scan())
+    assert calls["clips"] == 3
+
+
+def test_twitch_refreshes_token_once_on_401():
+    transport, calls = _twitch_transport(["old", "new"], reject_first=True)
+    source = _twitch_source(transport)
+    clips = asyncio.get_event_loop().run_until_complete(source.get_clips("509670", 5))
+    assert len(clips) == 5
+    assert calls["token"] == 2
+    assert source._access_token == "new"
+
+
+def test_twitch_token_refreshed_before_expiry():
+    transport, calls = _twitch_transport(["a", "b"])
+    source = _twitch_source(transport)
+
+    async def _test():
+        assert await source._ensure_token() == "a"
+        assert await source._ensure_token() == "a"
+        source._token_expires_at = 0.0  # inside the refresh margin
+        assert await source._ensure_token() == "b"
+    asyncio.get_event_loop().run_until_complete(_test())
+    assert calls["token"] == 2
+
+
 from worker.curation.evaluate import (
     build_evaluate_prompt, parse_evaluate_response,
     build_draft_prompt, parse_draft_response,
@@ -569,3 +642,310 @@ def test_curation_action_targets_both_platforms():
     tier_bs = ActionPicker.get_escalation_tier("curated_share", "bluesky")
     assert tier_tw == EscalationTier.BUTTONS
     assert tier_bs == EscalationTier.BUTTONS
+
+
+from worker.curation.monitor import CurationMonitor
+from worker.curation.similarity import MinHashIndex, minhash, similarity
+
+
+def test_minhash_similar_titles_score_high():
+    a = minhash("Ghostty 1.0 is out: a fast, native terminal emulator")
+    b = minhash("Ghostty 1.0 released: fast native terminal emulator")
+    c = minhash("Rust CLI tools I use every day")
+    assert similarity(a, b) >= 0.5
+    assert similarity(a, c) < 0.2
+
+
+def test_minhash_empty_text_has_no_signature():
+    assert minhash("", "") is None
+    assert minhash("the a of", "") is None
+
+
+def test_minhash_index_finds_near_duplicate():
+    index = MinHashIndex(threshold=0.5)
+    index.add(minhash("Zellij: a terminal workspace written in Rust"), "cluster-1")
+    assert index.find(minhash("Show HN: Zellij, a terminal workspace in Rust")) == "cluster-1"
+    assert index.find(minhash("Best photo filters for Instagram")) is None
+
+
+def test_pipeline_keeps_best_member_per_cluster():
+    pipeline = CurationPipeline(db=None)
+    low = CurationCandidate(
+        source="google_news", url="http://a.com", author="dev",
+        title="x", description="", keyword_score=0.4, cluster_id="c1",
+    )
+    high = CurationCandidate(
+        source="google_news", url="http://b.com", author="dev",
+        title="x", description="", keyword_score=0.8, cluster_id="c1",
+    )
+    solo = CurationCandidate(
+        source="youtube", url="http://c.com", author="dev",
+        title="y", description="", keyword_score=0.5, cluster_id="c2",
+    )
+    kept, dropped = pipeline._best_per_cluster([low, high, solo])
+    assert [c.url for c in kept] == ["http://b.com", "http://c.com"]
+    assert dropped == [low]
+
+
+def test_store_candidates_clusters_near_duplicates(db):
+    async def _test():
+        monitor = CurationMonitor(CurationConfig(), db)
+        scan_one = [
+            CurationCandidate(
+                source="google_news", url="https://news.ycombinator.com/item?id=1",
+                title="Ghostty 1.0 is out: a fast, native terminal emulator",
+                description="", author="hn",
+            ),
+            CurationCandidate(
+                source="google_news", url="https://lobste.rs/s/abc",
+                title="Ghostty 1.0 released: fast native terminal emulator",
+                description="", author="lobsters",
+            ),
+        ]
+        assert await monitor.store_candidates(scan_one) == 2
+        assert scan_one[0].cluster_id == scan_one[1].cluster_id
+
+        scan_two = [
+            CurationCandidate(
+                source="google_news", url="https://dev.to/someone/ghostty",
+                title="Ghostty 1.0 - a fast native terminal emulator",
+                description="", author="devto",
+            ),
+        ]
+        assert await monitor.store_candidates(scan_two) == 0
+        row = await db.get_curation_candidate(scan_two[0].metadata["db_id"])
+        assert row["status"] == "duplicate"
+        assert row["cluster_id"] == scan_one[0].cluster_id
+
+        new_rows = await db.get_new_curations()
+        assert len(new_rows) == 2
+    asyncio.get_event_loop().run_until_complete(_test())
+
+
+from datetime import datetime, timedelta, timezone
+from worker.curation.scheduler import EvaluationScheduler
+
+
+def test_scheduler_default_batch_matches_old_fixed_batch():
+    scheduler = EvaluationScheduler(CurationConfig())
+    assert scheduler.batch_size() == 20
+
+
+def test_scheduler_batch_adapts_to_cli_latency():
+    config = CurationConfig(
+        evaluation_time_budget_seconds=300, max_parallel_evaluations=5,
+        min_evaluations_per_cycle=5, max_evaluations_per_cycle=40,
+    )
+    fast = EvaluationScheduler(config)
+    fast.observe_latency(20.0)
+    assert fast.batch_size() == 40  # capped
+
+    slow = EvaluationScheduler(config)
+    slow.observe_latency(150.0)
+    assert slow.batch_size() == 10
+
+    stalled = EvaluationScheduler(config)
+    stalled.observe_latency(1000.0)
+    assert stalled.batch_size() == 5  # floor
+
+
+def test_scheduler_prefers_fresh_over_stale():
+    scheduler = EvaluationScheduler(CurationConfig(freshness_half_life_hours=24))
+    now = datetime.now(timezone.utc)
+    stale = CurationCandidate(
+        source="google_news", url="http://old.com", title="old", description="",
+        author="a", published=now - timedelta(days=5), keyword_score=0.8,
+    )
+    fresh = CurationCandidate(
+        source="google_news", url="http://new.com", title="new", description="",
+        author="a", published=now - timedelta(hours=1), keyword_score=0.6,
+    )
+    boosted = CurationCandidate(
+        source="youtube", url="http://boost.com", title="b", description="",
+        author="Fireship", published=now - timedelta(days=2), keyword_score=0.6,
+        metadata={"boosted": True},
+    )
+    ordered = scheduler.select([stale, fresh, boosted])
+    assert [c.url for c in ordered] == ["http://new.com", "http://boost.com", "http://old.com"]
+
+
+def test_curation_queue_orders_by_keyword_score(db):
+    async def _test():
+        await db.insert_curation_candidate(
+            source="youtube", url="https://low.com", title="Low",
+            author="a", description="d", keyword_score=0.3,
+        )
+        await db.insert_curation_candidate(
+            source="youtube", url="https://high.com", title="High",
+            author="a", description="d", keyword_score=0.9,
+        )
+        queue = await db.get_curation_queue(limit=10)
+        assert [r["title"] for r in queue] == ["High", "Low"]
+    asyncio.get_event_loop().run_until_complete(_test())
+
+
+
+def test_curation_queue_adds_newest_rows_past_the_score_pool(db):
+    async def _test():
+        for i in range(3):
+            await db.insert_curation_candidate(
+                source="youtube", url=f"https://backlog{i}.com", title=f"Backlog {i}",
+                author="a", description="d", keyword_score=0.9,
+            )
+        await db.insert_curation_candidate(
+            source="youtube", url="https://fresh.com", title="Fresh",
+            author="a", description="d", keyword_score=0.4,
+        )
+        queue = await db.get_curation_queue(limit=2)
+        assert "Fresh" not in [r["title"] for r in queue]
+        queue = await db.get_curation_queue(limit=2, recent=1)
+        assert [r["title"] for r in queue][-1] == "Fresh"
+        assert len(queue) == 3
+    asyncio.get_event_loop().run_until_complete(_test())
+
+
+def test_init_backfills_keyword_scores_once(tmp_path):
+    async def _test():
+        path = str(tmp_path / "worker.db")
+        d = Database(path)
+        await d.init()
+        cid = await d.insert_curation_candidate(
+            source="youtube", url="https://old.com",
+            title="Open source terminal keyboard for Android", author="dev", description="",
+        )
+        # A row from before scores were stored at insert
+        await d._db.execute("UPDATE curation_candidates SET keyword_score = NULL WHERE id = ?", (cid,))
+        await d._db.execute("PRAGMA user_version = 0")
+        await d._db.commit()
+        await d.close()
+
+        d = Database(path)
+        await d.init()
+        row = await d.get_curation_candidate(cid)
+        assert row["keyword_score"] > 0
+        cursor = await d._db.execute("PRAGMA user_version")
+        assert (await cursor.fetchone())[0] == DATA_VERSION
+        await d.close()
+    asyncio.get_event_loop().run_until_complete(_test())
+from unittest.mock import patch
+
+
+def test_pipeline_writes_explicit_states(db):
+    async def _test():
+        ids = {}
+        for key, title in [
+            ("approve", "Open source terminal keyboard for Android"),
+            ("reject", "Rust CLI tool for SSH and tmux users"),
+            ("fail", "Terminal emulator with SSH support, open source"),
+            ("noise", "Best photo filters for Instagram"),
+        ]:
+            ids[key] = await db.insert_curation_candidate(
+                source="youtube", url=f"https://example.com/{key}",
+                title=title, author="dev", description="",
+            )
+
+        async def fake_evaluate_all(candidates, **kwargs):
+            results = []
+            for c in candidates:
+                if c.url.endswith("approve"):
+                    results.append((c, {
+                        "relevant": True, "share": True, "quality_score": 8.0,
+                        "drafts": {"A": "draft"}, "draft": "draft", "reasoning": "good",
+                    }))
+                elif c.url.endswith("reject"):
+                    results.append((c, {"relevant": False, "reasoning": "meh"}))
+                else:
+                    results.append((c, {"relevant": False, "failed": True}))
+            return results
+
+        monitor = CurationMonitor(CurationConfig(), db)
+        with patch("worker.curation.pipeline.evaluate_all", fake_evaluate_all):
+            approved = await monitor.run_evaluation()
+        assert [c.url for c in approved] == ["https://example.com/approve"]
+
+        statuses = {k: (await db.get_curation_candidate(v))["status"] for k, v in ids.items()}
+        assert statuses == {
+            "approve": "approved",
+            "reject": "ai_rejected",
+            "fail": "eval_failed",
+            "noise": "keyword_rejected",
+        }
+        failed = await db.get_curation_candidate(ids["fail"])
+        assert failed["eval_attempts"] == 1
+        assert failed["next_attempt_at"] > failed["evaluated_at"]
+
+        # Nothing is due yet, so the next cycle has no work.
+        assert await db.get_curation_queue() == []
+    asyncio.get_event_loop().run_until_complete(_test())
+
+
+def test_eval_failed_stops_retrying_after_max_attempts():
+    pipeline = CurationPipeline(db=None, max_attempts=3, retry_backoff_minutes=10)
+    c = CurationCandidate(
+        source="youtube", url="http://a.com", title="t", description="",
+        author="a", metadata={"eval_attempts": 1},
+    )
+    assert pipeline._retry_fields(c)["eval_attempts"] == 2
+    assert pipeline._retry_fields(c)["next_attempt_at"] is not None
+    c.metadata["eval_attempts"] = 2
+    assert pipeline._retry_fields(c) == {"eval_attempts": 3, "next_attempt_at": None}
+
+
+def test_curation_queue_includes_due_retries(db):
+    async def _test():
+        cid = await db.insert_curation_candidate(
+            source="youtube", url="https://retry.com", title="Retry",
+            author="a", description="d",
+        )
+        await db.update_curation_evaluations([{
+            "id": cid, "status": "eval_failed", "eval_attempts": 1,
+            "next_attempt_at": "2000-01-01T00:00:00+00:00",
+        }])
+        queue = await db.get_curation_queue()
+        assert [r["id"] for r in queue] == [cid]
+    asyncio.get_event_loop().run_until_complete(_test())
+
+
+# -- YouTube quota ledger --
+
+from worker.curation.sources.youtube import QuotaLedger, SEARCH_COST
+
+
+def test_quota_ledger_persists_and_refuses_over_budget(db):
+    async def _test():
+        ledger = QuotaLedger(db, daily_budget=250)
+        assert await ledger.try_spend(100)
+        assert await ledger.try_spend(100)
+        assert not await ledger.try_spend(100)
+        # A fresh ledger (e.g. after a restart) sees the same usage.
+        assert await QuotaLedger(db, daily_budget=250).remaining() == 50
+    asyncio.get_event_loop().run_until_complete(_test())
+
+
+def test_youtube_scan_defers_searches_past_budget():
+    async def fake_search(query, max_results=3, short_only=False, client=None):
+        vid = query.replace(" ", "")[:11]
+        return [CurationCandidate(
+            source="youtube", url=f"https://www.youtube.com/watch?v={vid}",
+            title=query, description="", author="a", metadata={"video_id": vid},
+        )]
+
+    async def fake_details(video_ids, client):
+        return [{"id": v, "statistics": {"viewCount": "42"}} for v in video_ids]
+
+    async def _test():
+        source = YouTubeSource("k", ledger=QuotaLedger(daily_budget=3 * SEARCH_COST + 1))
+        with patch.object(source, "search", fake_search), \
+             patch.object(source, "get_video_details", fake_details):
+            results = await source.scan()
+        assert len(results) == 3
+        assert all(c.metadata["view_count"] == 42 for c in results)
+        assert source.last_scan_units == 3 * SEARCH_COST + 1
+        assert await source.ledger.remaining() == 0
+    asyncio.get_event_loop().run_until_complete(_test())
+
+
+def test_youtube_quota_day_follows_pacific_midnight():
+    # 07:30 UTC is still the previous day in Los Angeles.
+    day = QuotaLedger.quota_day(datetime(2026, 3, 2, 7, 30, tzinfo=timezone.utc))
+    assert day == "2026-03-01"
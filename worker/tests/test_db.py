@@ -17,7 +17,7 @@ async def db():
 async def test_init_creates_tables(db):
     tables = await db.list_tables()
     assert sorted(tables) == [
-        "actions", "calendar", "curation_candidates",
+        "actions", "api_quota", "calendar", "curation_candidates",
         "engagement_opportunities", "findings", "metrics",
     ]
 
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from worker import metrics
+from worker.db import QUERY_SECONDS, Database
+from worker.metrics import Registry
+
+
+def test_counter_and_gauge_render_with_labels():
+    registry = Registry()
+    scans = registry.counter("scans_total", "Scans run", ["source"])
+    active = registry.gauge("active", "Active things")
+    scans.labels("twitter").inc()
+    scans.labels("twitter").inc(2)
+    scans.labels('we"ird').inc()
+    active.set(3)
+    active.dec()
+
+    text = registry.render()
+    assert "# TYPE scans_total counter" in text
+    assert 'scans_total{source="twitter"} 3' in text
+    assert 'scans_total{source="we\\"ird"} 1' in text
+    assert "# TYPE active gauge" in text
+    assert "\nactive 2\n" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency", ["op"], buckets=(0.1, 1.0))
+    child = latency.labels("select")
+    for value in (0.05, 0.5, 0.5, 5.0):
+        child.observe(value)
+
+    text = registry.render()
+    assert 'latency_seconds_bucket{op="select",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{op="select",le="1"} 3' in text
+    assert 'latency_seconds_bucket{op="select",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{op="select"} 4' in text
+    assert 'latency_seconds_sum{op="select"} 6.05' in text
+
+
+def test_registering_twice_returns_same_metric_and_rejects_conflicts():
+    registry = Registry()
+    first = registry.counter("jobs_total", "Jobs", ["kind"])
+    assert registry.counter("jobs_total", "Jobs", ["kind"]) is first
+    with pytest.raises(ValueError):
+        registry.gauge("jobs_total", "Jobs", ["kind"])
+    with pytest.raises(ValueError):
+        first.labels("a", "b")
+
+
+def test_timer_observes_elapsed_time():
+    registry = Registry()
+    hist = registry.histogram("block_seconds", "Block time")
+    with hist.time():
+        pass
+    assert registry.get("block_seconds")._default.count == 1
+
+
+@pytest.mark.asyncio
+async def test_database_records_query_latency():
+    before = QUERY_SECONDS.labels("select").count
+    db = Database(":memory:")
+    await db.init()
+    try:
+        await db.list_tables()
+    finally:
+        await db.close()
+    assert QUERY_SECONDS.labels("select").count > before
+    assert "keyjawn_db_query_seconds_bucket" in metrics.render()
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_serves_registry():
+    registry = Registry()
+    registry.counter("hits_total", "Hits").inc(5)
+    server = await metrics.serve(port=0, registry=registry)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        async def fetch(path: str) -> bytes:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            await writer.drain()
+            data = await reader.read()
+            writer.close()
+            return data
+
+        ok = await fetch("/metrics")
+        assert ok.startswith(b"HTTP/1.1 200 OK")
+        assert b"text/plain; version=0.0.4" in ok
+        assert b"hits_total 5\n" in ok
+
+        missing = await fetch("/")
+        assert missing.startswith(b"HTTP/1.1 404")
+    finally:
+        server.close()
+        await server.wait_closed()
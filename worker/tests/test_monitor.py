@@ -153,3 +153,19 @@ async def test_low_relevance_filtered(monitor, db):
     ]
     count = await monitor.queue_new_findings(findings)
     assert count == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_finding_stream_queues_as_it_reads(monitor, db):
+    async def stream():
+        yield {"url": "https://bsky.app/a", "text": "need a keyboard for ssh on my phone",
+               "author": "a", "platform": "bluesky"}
+        # Already queued by the time the duplicate arrives
+        assert len(await db.get_queued_findings()) == 1
+        yield {"url": "https://bsky.app/a", "text": "need a keyboard for ssh on my phone",
+               "author": "a", "platform": "bluesky"}
+        yield {"url": "https://bsky.app/b", "text": "nice weather", "author": "b",
+               "platform": "bluesky"}
+
+    seen, queued = await monitor.queue_finding_stream(stream())
+    assert (seen, queued) == (3, 1)
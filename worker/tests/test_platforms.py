@@ -159,3 +159,382 @@ def test_producthunt_constants():
     assert len(RELEVANCE_KEYWORDS) > 0
     assert "keyboard" in RELEVANCE_KEYWORDS
     assert "cli" in RELEVANCE_KEYWORDS
+
+
+import asyncio
+import json
+
+import httpx
+
+from worker.platforms.producthunt import GraphQLField, build_batch_query
+
+
+def _ph_client(handler) -> ProductHuntClient:
+    client = ProductHuntClient("test-token")
+    client._client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def _ph_post(pid: str) -> dict:
+    return {
+        "id": pid, "name": f"Post {pid}", "tagline": "A CLI tool", "url": f"https://ph.co/{pid}",
+        "votesCount": 10, "commentsCount": 2, "website": "", "topics": {"edges": []},
+    }
+
+
+def test_producthunt_batch_query_aliases_variables():
+    query, variables = build_batch_query({
+        "a": GraphQLField("post", "id", args={"id": ("ID!", "1")}),
+        "b": GraphQLField("post", "id", args={"id": ("ID!", "2")}),
+    })
+    assert "$a_id: ID!" in query and "$b_id: ID!" in query
+    assert "a: post(id: $a_id)" in query
+    assert variables == {"a_id": "1", "b_id": "2"}
+
+
+def test_producthunt_details_batched_into_one_request():
+    def handler(request):
+        variables = json.loads(request.content)["variables"]
+        data = {alias.split("_")[0]: _ph_post(pid) for alias, pid in variables.items()}
+        return httpx.Response(200, json={"data": data})
+
+    client = _ph_client(handler)
+    details = asyncio.get_event_loop().run_until_complete(
+        client.get_posts_details(["1", "2", "3"])
+    )
+    assert client.requests_sent == 1
+    assert [d["id"] for d in details.values()] == ["1", "2", "3"]
+
+
+def test_producthunt_today_posts_cached_within_ttl():
+    def handler(request):
+        return httpx.Response(200, json={"data": {"posts": {"edges": [{"node": _ph_post("1")}]}}})
+
+    client = _ph_client(handler)
+
+    async def _test():
+        first = await client.get_today_posts(limit=30)
+        second = await client.get_today_posts(limit=30)
+        return first, second
+
+    first, second = asyncio.get_event_loop().run_until_complete(_test())
+    assert first == second and first[0]["id"] == "1"
+    assert client.requests_sent == 1
+
+
+def test_producthunt_pauses_when_rate_limit_low():
+    def handler(request):
+        return httpx.Response(
+            200,
+            json={"data": {"post": _ph_post("1")}},
+            headers={"X-Rate-Limit-Remaining": "5", "X-Rate-Limit-Reset": "600"},
+        )
+
+    client = _ph_client(handler)
+
+    async def _test():
+        assert await client.get_post_details("1") is not None
+        # Uncached query while paused is skipped rather than sent.
+        assert await client.get_post_details("2") is None
+
+    asyncio.get_event_loop().run_until_complete(_test())
+    assert client.requests_sent == 1
+
+
+# --- Social-scroller tests ---
+
+import os
+import sys
+import textwrap
+
+from worker.config import SocialScrollerConfig
+from worker.platforms.social_scroller import SocialScrollerClient
+from worker.subprocesses import SubprocessOwner
+
+FAKE_SCROLLER = textwrap.dedent("""
+    import json, os, sys, threading, time
+
+    out = threading.Lock()
+    tabs = {"open": 0, "peak": 0}
+
+    def posts(kind, label):
+        return [{"text": f"{kind} {label}", "username": f"pid{os.getpid()}",
+                 "platform": "bluesky", "link": f"https://bsky.app/{label}"}]
+
+    def handle(req):
+        p = req["params"]
+        if req["method"] == "ping":
+            return "pong"
+        if req["method"] == "scroll":
+            if p.get("stream"):
+                for feed in p["feeds"]:
+                    note = {"jsonrpc": "2.0", "method": "post",
+                            "params": {"id": req["id"], "post": posts("stream", feed)[0]}}
+                    with out:
+                        print(json.dumps(note), flush=True)
+                return []
+            return posts("scroll", ",".join(p["feeds"]))
+        with out:
+            tabs["open"] += 1
+            tabs["peak"] = max(tabs["peak"], tabs["open"])
+        time.sleep(float(p["query"].split()[-1]) if p["query"][-1].isdigit() else 0)
+        with out:
+            tabs["open"] -= 1
+        return posts("search", p["query"]) + [{"text": f"peak {tabs['peak']}", "username": "x"}]
+
+    def reply(req):
+        resp = {"jsonrpc": "2.0", "id": req["id"], "result": handle(req)}
+        with out:
+            print(json.dumps(resp), flush=True)
+
+    if sys.argv[-1] == "serve":
+        if os.environ.get("NO_SERVE"):
+            sys.exit(2)
+        for line in sys.stdin:
+            msg = json.loads(line)
+            if isinstance(msg, list):
+                replies = [{"jsonrpc": "2.0", "id": r["id"], "result": handle(r)} for r in msg]
+                with out:
+                    print(json.dumps(replies), flush=True)
+            elif msg.get("method") == "cancel":
+                if os.environ.get("CANCEL_LOG"):
+                    with open(os.environ["CANCEL_LOG"], "a") as f:
+                        f.write(json.dumps(msg["params"]["ids"]) + "\\n")
+            elif "id" in msg and msg["params"].get("tab") == "new":
+                threading.Thread(target=reply, args=(msg,), daemon=True).start()
+            elif "id" in msg:
+                reply(msg)
+    elif "search" in sys.argv:
+        print(json.dumps(posts("oneshot", sys.argv[-1])))
+    else:
+        print(json.dumps(posts("oneshot", "feeds")))
+""")
+
+
+def _scroller(tmp_path, **kwargs) -> SocialScrollerClient:
+    script = tmp_path / "social-scroller.py"
+    script.write_text(FAKE_SCROLLER)
+    kwargs.setdefault("daemon", True)
+    config = SocialScrollerConfig(script_path=str(script), scroll_duration=1, **kwargs)
+    return SocialScrollerClient(config, subprocesses=SubprocessOwner(grace_period=1, force_wait=1))
+
+
+@pytest.mark.asyncio
+async def test_social_scroller_reuses_one_session(tmp_path):
+    client = _scroller(tmp_path)
+    try:
+        batch = await client.run_jobs([
+            client.search_job("ssh keyboard", "bluesky"),
+            client.scroll_job(["twitter", "bluesky"]),
+        ])
+        feed = await client.scan_feeds()
+    finally:
+        await client.close()
+
+    assert [r[0]["text"] for r in batch] == ["search ssh keyboard", "scroll twitter,bluesky"]
+    assert client.daemon.launches == 1
+    # Same process served both calls
+    assert feed[0]["author"] == batch[0][0]["author"]
+
+
+@pytest.mark.asyncio
+async def test_social_scroller_falls_back_without_serve(tmp_path, monkeypatch):
+    monkeypatch.setenv("NO_SERVE", "1")
+    client = _scroller(tmp_path, daemon_start_timeout=5)
+    results = await client.search("ssh keyboard", "bluesky")
+    assert results[0]["text"] == "oneshot ssh keyboard"
+    # The session is not retried on every call once it has failed
+    await client.search("terminal", "bluesky")
+    assert client.daemon.launches == 1
+
+
+FAKE_SSH = textwrap.dedent("""\
+    #!{python}
+    import os, signal, subprocess, sys, time
+
+    args = sys.argv[1:]
+    sock = args[args.index("-S") + 1]
+    if "-M" in args:
+        open(sock, "w").close()
+        def stop(*_):
+            os.unlink(sock)
+            sys.exit(0)
+        signal.signal(signal.SIGTERM, stop)
+        while True:
+            time.sleep(0.1)
+    if "-O" in args:
+        sys.exit(0 if os.path.exists(sock) else 255)
+    with open(os.environ["FAKE_SSH_LOG"], "a") as log:
+        log.write("mux\\n" if os.path.exists(sock) else "direct\\n")
+    sys.exit(subprocess.call(["sh", "-c", args[-1]]))
+""")
+
+
+def _ssh_scroller(tmp_path, monkeypatch) -> SocialScrollerClient:
+    ssh = tmp_path / "ssh"
+    ssh.write_text(FAKE_SSH.format(python=sys.executable))
+    ssh.chmod(0o755)
+    monkeypatch.setenv("FAKE_SSH_LOG", str(tmp_path / "ssh.log"))
+    client = _scroller(tmp_path, ssh_host="officejawn", daemon=False)
+    client.ssh.ssh_binary = str(ssh)
+    client.ssh.control_path = str(tmp_path / "cm" / "ctl")
+    return client
+
+
+@pytest.mark.asyncio
+async def test_social_scroller_runs_remote_jobs_over_one_ssh_master(tmp_path, monkeypatch):
+    client = _ssh_scroller(tmp_path, monkeypatch)
+    try:
+        first = await client.search("ssh keyboard", "bluesky")
+        await client.scan_feeds()
+    finally:
+        await client.close()
+
+    assert first[0]["text"] == "oneshot ssh keyboard"
+    assert client.ssh.starts == 1
+    assert (tmp_path / "ssh.log").read_text().split() == ["mux", "mux"]
+    assert not (tmp_path / "cm" / "ctl").exists()
+    assert (tmp_path / "cm").stat().st_mode & 0o777 == 0o700
+
+
+@pytest.mark.asyncio
+async def test_social_scroller_restarts_dead_ssh_master(tmp_path, monkeypatch):
+    client = _ssh_scroller(tmp_path, monkeypatch)
+    try:
+        await client.search("ssh keyboard", "bluesky")
+        await client.ssh._master.stop(reason="simulated drop")
+        await client.search("terminal", "bluesky")
+    finally:
+        await client.close()
+
+    assert client.ssh.starts == 2
+    assert (tmp_path / "ssh.log").read_text().split() == ["mux", "mux"]
+
+
+def test_ssh_control_socket_defaults_to_a_private_dir(tmp_path, monkeypatch):
+    from worker.platforms.social_scroller import SSHConnectionManager
+
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    manager = SSHConnectionManager("officejawn", SubprocessOwner())
+    assert os.path.dirname(manager.control_path) == str(tmp_path / "keyjawn-ssh")
+
+
+@pytest.mark.asyncio
+async def test_ssh_master_refuses_control_dir_owned_by_someone_else(tmp_path, monkeypatch):
+    client = _ssh_scroller(tmp_path, monkeypatch)
+    (tmp_path / "cm").mkdir(mode=0o777)
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(tmp_path / "cm").st_uid + 1)
+    try:
+        assert await client.ssh.ensure_master() is False
+    finally:
+        await client.close()
+
+    assert client.ssh.starts == 0
+    assert "-S" not in client.ssh.command("true")
+
+
+@pytest.mark.asyncio
+async def test_social_scroller_strategy_runs_tabs_in_parallel(tmp_path):
+    client = _scroller(
+        tmp_path,
+        search_platforms=("bluesky", "reddit"),
+        platform_keywords={"bluesky": ("ssh 0.6", "cli 0.1"), "reddit": ("termux 0.3",)},
+        max_tabs=3,
+    )
+    try:
+        order = [job["query"] async for job, _ in client.iter_strategy()]
+        findings = await client.search_with_strategy()
+    finally:
+        await client.close()
+
+    # Results stream back in the order the tabs finish
+    assert order == ["cli 0.1", "termux 0.3", "ssh 0.6"]
+    assert max(int(f["text"].split()[1]) for f in findings if f["text"].startswith("peak")) == 3
+
+
+@pytest.mark.asyncio
+async def test_social_scroller_stream_respects_tab_limit_and_budget(tmp_path, monkeypatch):
+    cancel_log = tmp_path / "cancel.log"
+    monkeypatch.setenv("CANCEL_LOG", str(cancel_log))
+    client = _scroller(tmp_path)
+    jobs = [client.search_job(q, "bluesky") for q in ("a 0.1", "b 0.1", "slow 5")]
+    try:
+        done = [
+            (job["query"], findings)
+            async for job, findings in client.stream_jobs(jobs, max_tabs=1, time_budget=1.5)
+        ]
+        # The job cut off by the budget is cancelled on the session
+        for _ in range(50):
+            if cancel_log.exists():
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        await client.close()
+
+    assert [q for q, _ in done] == ["a 0.1", "b 0.1"]
+    assert all(f[-1]["text"] == "peak 1" for _, f in done)
+    assert len(cancel_log.read_text().splitlines()) == 1
+
+
+from worker.platforms.social_scroller import PostStreamParser
+
+
+def test_post_stream_parser_handles_split_array_and_ndjson():
+    posts = [{"text": f"post {i}, with ] and {{braces}}", "username": "u"} for i in range(3)]
+    raw = json.dumps(posts, indent=2).encode()
+    parser = PostStreamParser()
+    parsed = []
+    for i in range(0, len(raw), 7):
+        parsed.extend(parser.feed(raw[i:i + 7]))
+    parser.close()
+    assert parsed == posts
+
+    ndjson = "\n".join(json.dumps(p) for p in posts).encode() + b"\n"
+    assert PostStreamParser().feed(ndjson) == posts
+
+
+def test_post_stream_parser_buffers_at_most_one_post():
+    parser = PostStreamParser(max_post_bytes=100)
+    assert parser.feed(b'[{"text": "a"},') == [{"text": "a"}]
+    assert parser._buf == ""
+    with pytest.raises(ValueError):
+        parser.feed(b'{"text": "' + b"x" * 200)
+
+
+@pytest.mark.asyncio
+async def test_social_scroller_streams_feed_posts_from_session(tmp_path):
+    client = _scroller(tmp_path)
+    try:
+        findings = [f async for f in client.iter_feeds(["twitter", "bluesky"])]
+    finally:
+        await client.close()
+    assert [f["text"] for f in findings] == ["stream twitter", "stream bluesky"]
+
+
+@pytest.mark.asyncio
+async def test_slow_stream_consumer_does_not_stall_other_calls(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr("worker.platforms.social_scroller.STREAM_QUEUE_SIZE", 2)
+    client = _scroller(tmp_path)
+    feeds = [f"feed{i}" for i in range(10)]
+    try:
+        posts = client.daemon.stream("scroll", {"feeds": feeds}, timeout=10)
+        first = await posts.__anext__()
+        # With the stream left unread, the session still answers other calls
+        (reply,) = await client.daemon.call([("ping", {})], timeout=5)
+        rest = [post async for post in posts]
+    finally:
+        await client.close()
+
+    assert reply["result"] == "pong"
+    assert first["text"] == "stream feed0"
+    assert 1 <= len(rest) <= 2
+    assert f"dropped {9 - len(rest)} posts" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_social_scroller_streams_oneshot_output(tmp_path, monkeypatch):
+    monkeypatch.setenv("NO_SERVE", "1")
+    client = _scroller(tmp_path, daemon=False)
+    findings = [f async for f in client.iter_job(client.search_job("ssh keyboard", "bluesky"))]
+    assert [f["text"] for f in findings] == ["oneshot ssh keyboard"]
+    assert client.subprocesses.active_count == 0
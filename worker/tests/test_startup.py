@@ -0,0 +1,20 @@
+from worker.startup import LAZY_MODULES, format_report, probe_import
+
+
+def test_importing_the_worker_does_not_load_platform_sdks():
+    _, loaded = probe_import("worker.main")
+    assert "worker" in loaded
+    assert not loaded & set(LAZY_MODULES)
+
+
+def test_runner_import_stays_lazy_too():
+    _, loaded = probe_import("worker.runner")
+    assert not loaded & set(LAZY_MODULES)
+
+
+def test_format_report_aligns_components():
+    lines = format_report([("import", "twikit", 0.25), ("init", "db", 0.0012)])
+    assert lines == [
+        "import  twikit     250.0 ms",
+        "init    db           1.2 ms",
+    ]
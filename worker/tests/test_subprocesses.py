@@ -816,3 +816,21 @@ async def test_supervisor_restores_python_ignored_signals_before_exec(
 
     assert (signal.SIGPIPE, signal.SIG_DFL) in restored
     assert (signal.SIGXFSZ, signal.SIG_DFL) in restored
+
+
+async def test_started_shell_talks_over_pipes_until_shutdown() -> None:
+    owner = SubprocessOwner(grace_period=1, force_wait=1)
+    echo = f"{sys.executable} -u -c 'import sys\nfor line in sys.stdin: print(line.upper(), end=\"\")'"
+
+    managed = await owner.start_shell(echo)
+    managed.stdin.write(b"ping\n")
+    await managed.stdin.drain()
+    assert await asyncio.wait_for(managed.stdout.readline(), 3) == b"PING\n"
+    assert managed.running
+    assert owner.active_count == 1
+
+    report = await owner.shutdown()
+
+    assert report.terminated == 1
+    assert not managed.running
+    assert owner.active_count == 0
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import os
+import threading
+
+import httpx
+import pytest
+
+from worker import tracing
+from worker.db import Database
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracing.configure(str(path))
+    yield path
+    tracing.configure("")
+
+
+def _read(path):
+    tracing.flush()
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_spans_outside_a_trace_are_noops(trace_file):
+    with tracing.span("source", source="twitter") as span:
+        span.set(posts=3)
+    assert not trace_file.exists()
+
+
+@pytest.mark.asyncio
+async def test_trace_records_span_tree_across_tasks(trace_file):
+    async def fetch(source):
+        with tracing.span("source", source=source):
+            with tracing.leaf("request", query="ssh"):
+                await asyncio.sleep(0)
+            with tracing.span("inner"):
+                pass
+
+    with tracing.trace("monitor_scan"):
+        await asyncio.gather(fetch("twitter"), fetch("bluesky"))
+
+    spans = _read(trace_file)
+    by_id = {s["spanId"]: s for s in spans}
+    root = next(s for s in spans if not s["parentSpanId"])
+    assert root["name"] == "monitor_scan"
+    assert {s["traceId"] for s in spans} == {root["traceId"]}
+
+    sources = [s for s in spans if s["name"] == "source"]
+    assert {s["attributes"]["source"] for s in sources} == {"twitter", "bluesky"}
+    assert all(s["parentSpanId"] == root["spanId"] for s in sources)
+    # A leaf never adopts later spans: "inner" hangs off the source
+    for inner in (s for s in spans if s["name"] == "inner"):
+        assert by_id[inner["parentSpanId"]]["name"] == "source"
+    assert all(s["status"] == "ok" for s in spans)
+    assert tracing.current_span() is None
+
+
+@pytest.mark.asyncio
+async def test_failed_span_is_marked_error(trace_file):
+    with pytest.raises(RuntimeError):
+        with tracing.trace("action_session"):
+            with tracing.span("source", source="bluesky"):
+                raise RuntimeError("boom")
+
+    spans = _read(trace_file)
+    assert {s["status"] for s in spans} == {"error"}
+    assert spans[1]["attributes"]["error"] == "RuntimeError"
+
+
+@pytest.mark.asyncio
+async def test_db_statements_and_http_requests_become_spans(trace_file):
+    db = Database(":memory:")
+    await db.init()
+    transport = httpx.MockTransport(lambda request: httpx.Response(204))
+    try:
+        with tracing.trace("curation_scan"):
+            await db.record_metric("youtube", "quota_units", 1)
+            async with httpx.AsyncClient(
+                transport=transport, event_hooks=tracing.httpx_event_hooks(),
+            ) as client:
+                await client.get("https://api.example.com/v1/items")
+    finally:
+        await db.close()
+
+    spans = _read(trace_file)
+    ops = {s["attributes"]["op"] for s in spans if s["name"] == "db"}
+    assert {"insert", "commit"} <= ops
+    http = next(s for s in spans if s["name"] == "http")
+    assert http["attributes"]["host"] == "api.example.com"
+    assert http["attributes"]["status_code"] == 204
+    assert http["status"] == "ok"
+
+
+def test_slowest_spans_summarizes_recent_runs():
+    def span(trace, span_id, parent, name, start_ms, ms, **attrs):
+        return {
+            "traceId": trace, "spanId": span_id, "parentSpanId": parent,
+            "name": name, "attributes": attrs,
+            "startTimeUnixNano": start_ms * 1_000_000,
+            "endTimeUnixNano": (start_ms + ms) * 1_000_000,
+        }
+
+    spans = [
+        span("t1", "a", "", "monitor_scan", 0, 900),
+        span("t1", "b", "a", "source", 0, 800, source="twitter"),
+        span("t2", "c", "", "curation_scan", 1000, 500),
+        span("t2", "d", "c", "subprocess", 1000, 450, program="claude"),
+        span("t3", "e", "", "monitor_scan", 2000, 300),
+        span("t3", "f", "e", "source", 2000, 100, source="bluesky"),
+    ]
+
+    runs, slowest = tracing.slowest_spans(spans, runs=2, top=5)
+    assert [r["traceId"] for r in runs] == ["t2", "t3"]
+    assert [(s["name"], s["duration_ms"]) for s in slowest] == [
+        ("subprocess", 450.0), ("source", 100.0),
+    ]
+
+    runs, slowest = tracing.slowest_spans(spans, runs=5, top=1, job="monitor_scan")
+    assert [r["traceId"] for r in runs] == ["t1", "t3"]
+    assert slowest[0]["attributes"] == {"source": "twitter"}
+
+
+def test_load_spans_reads_rotated_file_first(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    (tmp_path / "traces.jsonl.1").write_text('{"spanId": "old"}\n')
+    path.write_text('{"spanId": "new"}\nnot json\n')
+    assert [s["spanId"] for s in tracing.load_spans(str(path))] == ["old", "new"]
+
+
+@pytest.mark.asyncio
+async def test_traces_are_written_off_the_event_loop(trace_file, monkeypatch):
+    writers = []
+    real_write = tracing.Tracer._write
+
+    def write(self, path, spans):
+        writers.append(threading.current_thread())
+        real_write(self, path, spans)
+
+    monkeypatch.setattr(tracing.Tracer, "_write", write)
+    with tracing.trace("monitor_scan"):
+        pass
+
+    assert [s["name"] for s in _read(trace_file)] == ["monitor_scan"]
+    assert writers and writers[0] is not threading.current_thread()
+
+
+@pytest.mark.asyncio
+async def test_trace_file_rotates_once_it_passes_the_limit(trace_file, monkeypatch):
+    monkeypatch.setattr(tracing, "MAX_FILE_BYTES", 1)
+    with tracing.trace("monitor_scan"):
+        pass
+    with tracing.trace("curation_scan"):
+        pass
+    tracing.flush()
+
+    assert not trace_file.exists()
+    rotated = trace_file.with_name("traces.jsonl.1")
+    assert [s["name"] for s in _read(rotated)] == ["curation_scan"]
+
+
+def test_default_trace_path_is_in_the_worker_data_dir():
+    from worker.config import DATA_DIR, Config
+
+    path = Config.for_testing().trace_path
+    assert os.path.isabs(path)
+    assert os.path.dirname(path) == DATA_DIR
@@ -0,0 +1,131 @@
+"""Tests for canonical URL keys."""
+
+import pytest
+import pytest_asyncio
+
+from worker.config import Config
+from worker.db import Database
+from worker.monitor import Monitor
+from worker.urls import canonicalize_url, unwrap_redirect
+
+
+@pytest_asyncio.fixture
+async def db():
+    database = Database(":memory:")
+    await database.init()
+    yield database
+    await database.close()
+
+
+# --- canonicalize_url ---
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.youtube.com/watch?v=abc123XYZ",
+    "https://youtu.be/abc123XYZ",
+    "https://youtu.be/abc123XYZ?si=share-token&t=42",
+    "http://m.youtube.com/watch?v=abc123XYZ&feature=share",
+    "https://www.youtube.com/shorts/abc123XYZ",
+    "https://www.youtube.com/embed/abc123XYZ?autoplay=1",
+    "https://www.youtube.com/watch?v=abc123XYZ&list=PL1&index=3#t=10",
+])
+def test_youtube_variants_share_one_key(url):
+    assert canonicalize_url(url) == "https://youtube.com/watch?v=abc123XYZ"
+
+
+def test_strips_tracking_params_and_keeps_real_ones():
+    url = "https://Example.com/post/?utm_source=rss&utm_medium=feed&id=7&fbclid=x"
+    assert canonicalize_url(url) == "https://example.com/post?id=7"
+
+
+def test_sorts_query_and_drops_fragment():
+    a = canonicalize_url("https://example.com/a?b=2&a=1#section")
+    b = canonicalize_url("https://example.com/a?a=1&b=2")
+    assert a == b
+
+
+def test_unwraps_google_alerts_redirect():
+    wrapped = (
+        "https://www.google.com/url?rct=j&sa=t"
+        "&url=https://blog.example.com/launch%3Futm_source%3Dalerts"
+        "&ct=ga&cd=CAIyGg&usg=AOvVaw"
+    )
+    assert unwrap_redirect(wrapped) == "https://blog.example.com/launch?utm_source=alerts"
+    assert canonicalize_url(wrapped) == "https://blog.example.com/launch"
+
+
+def test_google_search_page_is_not_a_redirect():
+    url = "https://www.google.com/search?q=terminal"
+    assert unwrap_redirect(url) == url
+
+
+def test_twitter_hosts_fold_and_drop_share_params():
+    a = canonicalize_url("https://x.com/dev/status/123?s=20&t=abc")
+    b = canonicalize_url("https://mobile.twitter.com/dev/status/123")
+    assert a == b == "https://twitter.com/dev/status/123"
+
+
+def test_non_http_values_pass_through():
+    assert canonicalize_url("  at://did:plc:abc/post/1 ") == "at://did:plc:abc/post/1"
+    assert canonicalize_url("") == ""
+
+
+# --- dedup paths ---
+
+
+@pytest.mark.asyncio
+async def test_curation_dedup_uses_canonical_url(db):
+    first = await db.insert_curation_candidate(
+        source="youtube", url="https://www.youtube.com/watch?v=abc123XYZ",
+        title="Terminal demo", author="dev", description="d",
+    )
+    dupe = await db.insert_curation_candidate(
+        source="google_news", url="https://youtu.be/abc123XYZ?si=xyz",
+        title="Terminal demo (shared)", author="dev", description="d",
+    )
+    assert first is not None
+    assert dupe is None
+    row = await db.get_curation_candidate(first)
+    assert row["canonical_url"] == "https://youtube.com/watch?v=abc123XYZ"
+
+
+@pytest.mark.asyncio
+async def test_findings_dedup_uses_canonical_url(db):
+    monitor = Monitor(Config.for_testing(), db)
+    text = "anyone know a good keyboard for SSH on my phone?"
+    first = await monitor.queue_new_findings([{
+        "url": "https://twitter.com/dev/status/555",
+        "text": text, "author": "dev", "platform": "twitter",
+    }])
+    second = await monitor.queue_new_findings([{
+        "url": "https://x.com/dev/status/555?s=46",
+        "text": text, "author": "dev", "platform": "twitter",
+    }])
+    assert first == 1
+    assert second == 0
+
+
+@pytest.mark.asyncio
+async def test_init_backfills_canonical_url_on_old_schema(tmp_path):
+    import aiosqlite
+
+    path = str(tmp_path / "old.db")
+    async with aiosqlite.connect(path) as conn:
+        await conn.executescript("""
+            CREATE TABLE findings (
+                id TEXT PRIMARY KEY, platform TEXT NOT NULL,
+                source_url TEXT NOT NULL, source_user TEXT NOT NULL,
+                content TEXT NOT NULL, relevance_score REAL NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued', found_at TEXT NOT NULL
+            );
+            INSERT INTO findings VALUES
+                ('f1', 'twitter', 'https://x.com/a/status/1', 'a', 't', 0.8, 'queued', '2026-01-01');
+        """)
+        await conn.commit()
+
+    database = Database(path)
+    await database.init()
+    try:
+        assert await database.finding_exists("https://twitter.com/a/status/1")
+    finally:
+        await database.close()
@@ -5,9 +5,11 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
 
 import httpx
 
+from worker import metrics
 from worker.config import Config
 from worker.db import Database
 from worker.telegram import format_escalation_message, build_approval_keyboard
@@ -25,6 +27,13 @@ DECISION_STATUS_MAP = {
     "draft_D": "approved",
 }
 
+WAIT_SECONDS = metrics.histogram(
+    "keyjawn_approval_wait_seconds",
+    "Time from sending an approval prompt until a decision or timeout",
+    ["outcome"],
+    buckets=(10, 30, 60, 300, 900, 1800, 3600, 7200, 14400, 28800, 86400),
+)
+
 
 class ApprovalManager:
     def __init__(self, config: Config, db: Database):
@@ -92,12 +101,17 @@ class ApprovalManager:
         future = loop.create_future()
         self._pending[action_id] = future
 
+        started = time.monotonic()
         try:
             decision = await asyncio.wait_for(
                 future, timeout=self.config.approval_timeout_seconds
             )
+            WAIT_SECONDS.labels(DECISION_STATUS_MAP.get(decision, "other")).observe(
+                time.monotonic() - started
+            )
             return decision
         except asyncio.TimeoutError:
+            WAIT_SECONDS.labels("timeout").observe(time.monotonic() - started)
             log.warning("Approval timeout for action %s, backlogging", action_id)
             self._pending.pop(action_id, None)
             await self.db._db.execute(
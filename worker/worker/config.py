@@ -5,8 +5,12 @@ from __future__ import annotations
 import json
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 
+# The worker checkout; start.sh runs from here and keyjawn-worker.db lives here
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 
 def _pass_get(key: str) -> str:
     """Read a single value from the pass password store."""
@@ -19,6 +23,26 @@ def _pass_get(key: str) -> str:
     return result.stdout.strip()
 
 
+def _pass_get_many(keys: dict[str, str], optional: frozenset = frozenset()) -> dict[str, str]:
+    """Read several pass entries at once, keyed by the names in ``keys``.
+
+    Each `pass show` is a separate GPG decrypt, so they run in parallel
+    threads instead of one after another. Missing optional entries come
+    back as ""; a missing required one raises CalledProcessError.
+    """
+    with ThreadPoolExecutor(max_workers=len(keys)) as pool:
+        futures = {name: pool.submit(_pass_get, key) for name, key in keys.items()}
+    values = {}
+    for name, future in futures.items():
+        try:
+            values[name] = future.result()
+        except subprocess.CalledProcessError:
+            if name not in optional:
+                raise
+            values[name] = ""
+    return values
+
+
 def _pass_get_json(key: str) -> dict:
     """Read a JSON value from the pass password store."""
     return json.loads(_pass_get(key))
@@ -60,6 +84,8 @@ class RedisConfig:
 @dataclass(frozen=True)
 class CurationConfig:
     youtube_api_key: str = ""
+    youtube_daily_quota: int = 10_000
+    youtube_scan_quota: int = 2_400
     twitch_client_id: str = ""
     twitch_client_secret: str = ""
     google_alert_urls: tuple = ()
@@ -67,6 +93,14 @@ class CurationConfig:
     max_parallel_evaluations: int = 5
     scan_interval_hours: int = 6
     twitch_scan_interval_hours: int = 8
+    cluster_window_days: int = 7
+    cluster_similarity_threshold: float = 0.5
+    evaluation_time_budget_seconds: int = 300
+    min_evaluations_per_cycle: int = 5
+    max_evaluations_per_cycle: int = 40
+    freshness_half_life_hours: float = 48.0
+    max_evaluation_attempts: int = 3
+    evaluation_retry_backoff_minutes: int = 30
 
 
 @dataclass(frozen=True)
@@ -76,7 +110,15 @@ class SocialScrollerConfig:
     script_path: str = "~/social-scroller.py"
     scroll_duration: int = 15
     search_platforms: tuple[str, ...] = ()
+    platform_keywords: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    max_tabs: int = 3  # strategy searches running at once on the serve session, one tab each
+    strategy_time_budget: int = 240
     feed_platforms: tuple[str, ...] = ("twitter", "bluesky")
+    # Keep one `serve` session attached to the browser. Off until the
+    # deployed social-scroller.py implements the `serve` protocol;
+    # KEYJAWN_SCROLLER_DAEMON=1 turns it on.
+    daemon: bool = False
+    daemon_start_timeout: int = 60
 
 
 @dataclass(frozen=True)
@@ -96,42 +138,42 @@ class Config:
     max_actions_per_day: int = 3
     max_posts_per_platform: int = 3
     approval_timeout_seconds: int = 7200
+    # Local Prometheus scrape endpoint (127.0.0.1 only); 0 turns it off
+    metrics_port: int = 9464
+    # Span traces of scheduled job runs, one JSONL line per span; "" turns it off
+    trace_path: str = os.path.join(DATA_DIR, "keyjawn-worker-traces.jsonl")
 
     @classmethod
     def from_pass(cls) -> Config:
         """Build config by reading credentials from the pass store."""
-        # Twitter: stored as username\nemail\npassword
-        twitter_raw = _pass_get("claude/social/twitter-keyjawn")
-        twitter_lines = twitter_raw.split("\n")
-
-        bluesky_raw = _pass_get("claude/services/bluesky-keyjawn")
-        bluesky_lines = bluesky_raw.split("\n")
-
-        telegram_token = _pass_get("claude/tokens/telegram-bot")
+        secrets = _pass_get_many(
+            {
+                # Twitter: stored as username\nemail\npassword
+                "twitter": "claude/social/twitter-keyjawn",
+                "bluesky": "claude/services/bluesky-keyjawn",
+                "telegram": "claude/tokens/telegram-bot",
+                # Product Hunt: optional, may not be set on all machines
+                "producthunt": "claude/tokens/producthunt-dev",
+                # Curation: optional API keys
+                "youtube": "claude/api/youtube",
+                "twitch": "claude/api/twitch",
+            },
+            optional=frozenset({"producthunt", "youtube", "twitch"}),
+        )
+        twitter_lines = secrets["twitter"].split("\n")
+        bluesky_lines = secrets["bluesky"].split("\n")
+        telegram_token = secrets["telegram"]
 
         from pathlib import Path
         redis_password = Path(
             "/home/jamditis/.config/brain/redis.key"
         ).read_text().strip()
 
-        # Product Hunt: optional, may not be set on all machines
-        try:
-            ph_token = _pass_get("claude/tokens/producthunt-dev")
-        except subprocess.CalledProcessError:
-            ph_token = ""
-
-        # Curation: optional API keys
-        try:
-            yt_key = _pass_get("claude/api/youtube")
-        except subprocess.CalledProcessError:
-            yt_key = ""
-        try:
-            twitch_creds = _pass_get("claude/api/twitch").split("\n")
-            twitch_id = twitch_creds[0]
-            twitch_secret = twitch_creds[1] if len(twitch_creds) > 1 else ""
-        except subprocess.CalledProcessError:
-            twitch_id = ""
-            twitch_secret = ""
+        ph_token = secrets["producthunt"]
+        yt_key = secrets["youtube"]
+        twitch_creds = secrets["twitch"].split("\n")
+        twitch_id = twitch_creds[0]
+        twitch_secret = twitch_creds[1] if len(twitch_creds) > 1 else ""
 
         return cls(
             twitter=TwitterConfig(
@@ -158,7 +200,9 @@ class Config:
                 twitch_client_id=twitch_id,
                 twitch_client_secret=twitch_secret,
             ),
-            social_scroller=SocialScrollerConfig(),
+            social_scroller=SocialScrollerConfig(
+                daemon=os.environ.get("KEYJAWN_SCROLLER_DAEMON") == "1",
+            ),
         )
 
     @classmethod
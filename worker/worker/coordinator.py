@@ -0,0 +1,265 @@
+"""Scheduled-job coordination: shared-resource locks, coalescing, adaptive intervals.
+
+APScheduler fires every job on its own trigger. JobCoordinator sits
+between the triggers and the runner:
+
+- Jobs declare the resources they use (twitter session, claude CLI,
+  browser, ...). A run waits until it holds all of them, so two jobs
+  never fight over the same session. A job that spends most of its time
+  waiting on something else (the action session waits hours on
+  approvals) declares nothing and takes hold() around each real use.
+- Runs that share a coalesce key merge. A request that an in-flight run
+  already covers waits for that run. Otherwise it becomes the one queued
+  follow-up, and later requests fold their arguments into it.
+- A job with an AdaptiveInterval has its trigger fire at the interval's
+  minimum. Fires that come before the adaptive interval is up are
+  skipped. The interval grows after runs that found nothing and shrinks
+  after busy ones.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from worker import metrics, tracing
+
+log = logging.getLogger(__name__)
+
+# A fire this close to the adaptive deadline still counts as due, so
+# trigger jitter doesn't skip a whole tick.
+DUE_SLACK_SECONDS = 60
+
+JOB_RUNS = metrics.counter(
+    "keyjawn_job_runs_total",
+    "Scheduled job fires by what the coordinator did with them",
+    ["job", "result"],
+)
+JOB_INTERVAL = metrics.gauge(
+    "keyjawn_job_interval_seconds",
+    "Current adaptive interval per job",
+    ["job"],
+)
+RESOURCE_WAIT = metrics.histogram(
+    "keyjawn_job_resource_wait_seconds",
+    "Time a job run waited for its shared resources",
+    ["job"],
+)
+
+
+class AdaptiveInterval:
+    """Run interval that stretches when runs find nothing and shrinks when busy."""
+
+    def __init__(
+        self,
+        base: float,
+        minimum: float,
+        maximum: float,
+        busy_threshold: int = 5,
+        grow: float = 1.5,
+        shrink: float = 0.67,
+    ):
+        self.base = base
+        self.minimum = minimum
+        self.maximum = maximum
+        self.busy_threshold = busy_threshold
+        self.grow = grow
+        self.shrink = shrink
+        self.current = base
+        self.last_started: Optional[float] = None
+
+    def due(self, now: Optional[float] = None) -> bool:
+        if self.last_started is None:
+            return True
+        now = time.monotonic() if now is None else now
+        return now - self.last_started >= self.current - DUE_SLACK_SECONDS
+
+    def started(self, now: Optional[float] = None) -> None:
+        self.last_started = time.monotonic() if now is None else now
+
+    def record(self, found: int) -> float:
+        """Adjust to how much new content the last run found. Returns the new interval."""
+        if found <= 0:
+            self.current = min(self.current * self.grow, self.maximum)
+        elif found >= self.busy_threshold:
+            self.current = max(self.current * self.shrink, self.minimum)
+        else:
+            # Ordinary run: drift halfway back toward the base interval
+            self.current += (self.base - self.current) / 2
+        return self.current
+
+
+def _covers(running: dict, requested: dict) -> bool:
+    """True if a run with ``running`` kwargs does everything ``requested`` asks."""
+    return all(
+        running.get(k) == v or (isinstance(v, bool) and not v)
+        for k, v in requested.items()
+    )
+
+
+def _merge(queued: dict, requested: dict) -> dict:
+    merged = dict(queued)
+    for k, v in requested.items():
+        merged[k] = (merged.get(k, False) or v) if isinstance(v, bool) else v
+    return merged
+
+
+@dataclass
+class _Run:
+    kwargs: dict
+    future: asyncio.Future
+    job: str
+
+
+@dataclass
+class _Lane:
+    running: Optional[_Run] = None
+    queued: Optional[_Run] = None
+
+
+class JobCoordinator:
+    def __init__(self):
+        self._resource_locks: dict[str, asyncio.Lock] = {}
+        self._lanes: dict[str, _Lane] = {}
+
+    def _lock(self, resource: str) -> asyncio.Lock:
+        lock = self._resource_locks.get(resource)
+        if lock is None:
+            lock = self._resource_locks[resource] = asyncio.Lock()
+        return lock
+
+    @contextlib.asynccontextmanager
+    async def hold(self, *resources: str) -> AsyncIterator[None]:
+        """Hold shared resources for the length of the block."""
+        # Fixed acquisition order, so two jobs can't each hold what the other wants
+        locks = [self._lock(r) for r in sorted(set(resources))]
+        acquired = []
+        try:
+            for lock in locks:
+                await lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+    async def _with_resources(
+        self,
+        job: str,
+        resources: Sequence[str],
+        func: Callable[..., Awaitable[Any]],
+        kwargs: dict,
+    ) -> Any:
+        started = time.monotonic()
+        async with self.hold(*resources):
+            RESOURCE_WAIT.labels(job).observe(time.monotonic() - started)
+            with tracing.trace(job, **kwargs):
+                return await func(**kwargs)
+
+    async def run(
+        self,
+        job: str,
+        func: Callable[..., Awaitable[Any]],
+        resources: Sequence[str] = (),
+        coalesce_key: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Run ``func(**kwargs)`` once its resources are free, merging with same-key runs.
+
+        Jobs sharing a coalesce key must share ``func``. Boolean kwargs
+        merge by OR: a queued curation_scan and a queued
+        curation_scan(include_twitch=True) become one run with Twitch.
+        Returns the result of whichever run served this request.
+        """
+        key = coalesce_key or job
+        lane = self._lanes.setdefault(key, _Lane())
+        loop = asyncio.get_running_loop()
+
+        if lane.running and _covers(lane.running.kwargs, kwargs):
+            JOB_RUNS.labels(job, "merged").inc()
+            log.info("%s: merged into in-flight %s", job, lane.running.job)
+            return await asyncio.shield(lane.running.future)
+        if lane.queued:
+            lane.queued.kwargs = _merge(lane.queued.kwargs, kwargs)
+            JOB_RUNS.labels(job, "merged").inc()
+            log.info("%s: merged into queued %s", job, lane.queued.job)
+            return await asyncio.shield(lane.queued.future)
+
+        this = _Run(kwargs=dict(kwargs), future=loop.create_future(), job=job)
+        if lane.running:
+            lane.queued = this
+            log.info("%s: queued behind in-flight %s", job, lane.running.job)
+            try:
+                while lane.running is not None:
+                    await _wait_done(lane.running.future)
+            except asyncio.CancelledError:
+                this.future.cancel()
+                raise
+            finally:
+                lane.queued = None
+        lane.running = this
+        JOB_RUNS.labels(job, "ran").inc()
+        try:
+            result = await self._with_resources(job, resources, func, this.kwargs)
+        except BaseException as e:
+            if not this.future.done():
+                if isinstance(e, asyncio.CancelledError):
+                    this.future.cancel()
+                else:
+                    this.future.set_exception(e)
+                    this.future.exception()  # mark retrieved; the caller re-raises
+            raise
+        else:
+            this.future.set_result(result)
+            return result
+        finally:
+            lane.running = None
+
+    def scheduled(
+        self,
+        job: str,
+        func: Callable[..., Awaitable[Any]],
+        resources: Sequence[str] = (),
+        coalesce_key: Optional[str] = None,
+        interval: Optional[AdaptiveInterval] = None,
+        **kwargs: Any,
+    ) -> Callable[[], Awaitable[None]]:
+        """Build the zero-argument coroutine function to hand to the scheduler.
+
+        With an interval, ``func`` should return the count of new items
+        it found; that count drives the next interval.
+        """
+        async def fire() -> None:
+            if interval is not None:
+                if not interval.due():
+                    JOB_RUNS.labels(job, "skipped").inc()
+                    return
+                interval.started()
+            try:
+                found = await self.run(
+                    job, func, resources=resources, coalesce_key=coalesce_key, **kwargs,
+                )
+            except Exception:
+                log.exception("%s failed", job)
+                return
+            if interval is not None and isinstance(found, int):
+                seconds = interval.record(found)
+                JOB_INTERVAL.labels(job).set(seconds)
+                log.info("%s found %d, next run in ~%.0f min", job, found, seconds / 60)
+
+        return fire
+
+
+async def _wait_done(future: asyncio.Future) -> None:
+    try:
+        await asyncio.shield(future)
+    except asyncio.CancelledError:
+        if not future.cancelled():
+            raise
+    except Exception:
+        pass
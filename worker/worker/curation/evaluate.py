@@ -11,7 +11,10 @@ import asyncio
 import logging
 import os
 import re
+import time
+from collections.abc import Callable
 
+from worker import metrics, tracing
 from worker.curation.models import CurationCandidate
 from worker.subprocesses import SubprocessOwner
 
@@ -19,6 +22,22 @@ log = logging.getLogger(__name__)
 
 CLI_TIMEOUT = 120  # seconds per CLI call
 
+STAGE_SECONDS = metrics.histogram(
+    "keyjawn_curation_stage_seconds",
+    "Wall time of one curation evaluation stage (claude -p call)",
+    ["stage"],
+)
+STAGE_FAILURES = metrics.counter(
+    "keyjawn_curation_stage_failures_total",
+    "Curation stages whose CLI call returned nothing",
+    ["stage"],
+)
+EVALUATIONS = metrics.counter(
+    "keyjawn_curation_evaluations_total",
+    "Evaluated candidates by outcome",
+    ["outcome"],
+)
+
 
 async def _run_claude(
     prompt: str,
@@ -335,13 +354,15 @@ async def evaluate_candidate(
     """
     # Step 1: Evaluate
     eval_prompt = build_evaluate_prompt(candidate)
-    eval_text = await _run_claude(
-        eval_prompt,
-        model="haiku",
-        subprocesses=subprocesses,
-    )
+    with STAGE_SECONDS.labels("evaluate").time(), tracing.span("stage", stage="evaluate"):
+        eval_text = await _run_claude(
+            eval_prompt,
+            model="haiku",
+            subprocesses=subprocesses,
+        )
     if not eval_text:
-        return {"relevant": False, "reasoning": "CLI evaluation failed"}
+        STAGE_FAILURES.labels("evaluate").inc()
+        return {"relevant": False, "reasoning": "CLI evaluation failed", "failed": True}
 
     evaluation = parse_evaluate_response(eval_text)
 
@@ -353,13 +374,16 @@ async def evaluate_candidate(
 
     # Step 2: Batch draft (4 variants via Opus)
     draft_prompt = build_batch_draft_prompt(candidate, evaluation, platform)
-    draft_text = await _run_claude(
-        draft_prompt,
-        model="opus",
-        subprocesses=subprocesses,
-    )
+    with STAGE_SECONDS.labels("draft").time(), tracing.span("stage", stage="draft"):
+        draft_text = await _run_claude(
+            draft_prompt,
+            model="opus",
+            subprocesses=subprocesses,
+        )
     if not draft_text:
+        STAGE_FAILURES.labels("draft").inc()
         evaluation["share"] = False
+        evaluation["failed"] = True
         return evaluation
 
     draft_result = parse_batch_draft_response(draft_text)
@@ -371,39 +395,71 @@ async def evaluate_candidate(
     return evaluation
 
 
-async def evaluate_batch(
+async def evaluate_all(
     candidates: list[CurationCandidate],
     platform: str = "twitter",
     max_parallel: int = 5,
     subprocesses: SubprocessOwner | None = None,
+    observe_latency: Callable[[float], None] | None = None,
 ) -> list[tuple[CurationCandidate, dict]]:
     """Evaluate multiple candidates in parallel using Claude Code CLI subagents.
 
     Spins up to max_parallel concurrent subprocess evaluations.
-    Returns list of (candidate, result) tuples for candidates that pass.
+    observe_latency, if given, is called with each candidate's wall time.
+    Returns a (candidate, result) tuple for every candidate. Results of
+    CLI failures and unexpected errors carry "failed": True so callers
+    can retry them instead of treating them as rejections.
     """
     semaphore = asyncio.Semaphore(max_parallel)
 
-    async def _eval_one(c: CurationCandidate) -> tuple[CurationCandidate, dict]:
+    async def _eval_one(c: CurationCandidate) -> dict:
         async with semaphore:
+            started = time.monotonic()
             result = await evaluate_candidate(
                 c,
                 platform,
                 subprocesses=subprocesses,
             )
-            return (c, result)
+            if observe_latency:
+                observe_latency(time.monotonic() - started)
+            return result
 
-    tasks = [_eval_one(c) for c in candidates]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    results = await asyncio.gather(
+        *(_eval_one(c) for c in candidates), return_exceptions=True,
+    )
 
-    approved = []
-    for r in results:
+    pairs = []
+    for candidate, r in zip(candidates, results):
         if isinstance(r, Exception):
             log.error("Evaluation error: %s", r)
-            continue
-        candidate, result = r
-        if result.get("share") and result.get("drafts"):
-            approved.append((candidate, result))
+            r = {"relevant": False, "reasoning": f"evaluation error: {r}", "failed": True}
+        if r.get("failed"):
+            EVALUATIONS.labels("failed").inc()
+        else:
+            EVALUATIONS.labels("approved" if is_approved(r) else "rejected").inc()
+        pairs.append((candidate, r))
+    return pairs
+
 
+def is_approved(result: dict) -> bool:
+    return bool(result.get("share") and result.get("drafts"))
+
+
+async def evaluate_batch(
+    candidates: list[CurationCandidate],
+    platform: str = "twitter",
+    max_parallel: int = 5,
+    subprocesses: SubprocessOwner | None = None,
+    observe_latency: Callable[[float], None] | None = None,
+) -> list[tuple[CurationCandidate, dict]]:
+    """Evaluate candidates and return (candidate, result) tuples for those that pass."""
+    pairs = await evaluate_all(
+        candidates,
+        platform=platform,
+        max_parallel=max_parallel,
+        subprocesses=subprocesses,
+        observe_latency=observe_latency,
+    )
+    approved = [(c, r) for c, r in pairs if is_approved(r)]
     log.info("Batch evaluation: %d/%d approved", len(approved), len(candidates))
     return approved
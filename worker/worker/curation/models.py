@@ -17,6 +17,7 @@ class CurationCandidate:
     author: str
     published: Optional[datetime] = None
     metadata: dict = field(default_factory=dict)
+    cluster_id: Optional[str] = None
 
     # Populated by evaluation pipeline stages
     keyword_score: float = 0.0
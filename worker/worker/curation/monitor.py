@@ -4,14 +4,23 @@ from __future__ import annotations
 
 import json
 import logging
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+from worker import tracing
 from worker.config import CurationConfig
 from worker.curation.models import CurationCandidate
-from worker.curation.pipeline import CurationPipeline
+from worker.curation.pipeline import CurationPipeline, score_candidate
+from worker.curation.scheduler import EvaluationScheduler
+from worker.curation.similarity import (
+    MinHashIndex,
+    candidate_signature,
+    pack_signature,
+    unpack_signature,
+)
 from worker.curation.sources.news import NewsSource
 from worker.curation.sources.twitch import TwitchSource
-from worker.curation.sources.youtube import YouTubeSource
+from worker.curation.sources.youtube import QuotaLedger, YouTubeSource
 from worker.db import Database
 from worker.subprocesses import SubprocessOwner
 
@@ -33,14 +42,23 @@ class CurationMonitor:
         self.twitch: Optional[TwitchSource] = None
 
         if config.youtube_api_key:
-            self.youtube = YouTubeSource(config.youtube_api_key)
+            self.youtube = YouTubeSource(
+                config.youtube_api_key,
+                ledger=QuotaLedger(db, daily_budget=config.youtube_daily_quota),
+                scan_budget=config.youtube_scan_quota,
+            )
         self.news = NewsSource(list(config.google_alert_urls))
         if config.twitch_client_id and config.twitch_client_secret:
             self.twitch = TwitchSource(config.twitch_client_id, config.twitch_client_secret)
+        self.last_stored = 0
+        self.scheduler = EvaluationScheduler(config)
         self.pipeline = CurationPipeline(
             db=db,
             max_parallel=config.max_parallel_evaluations,
             subprocesses=subprocesses,
+            scheduler=self.scheduler,
+            max_attempts=config.max_evaluation_attempts,
+            retry_backoff_minutes=config.evaluation_retry_backoff_minutes,
         )
 
     async def scan_sources(self, include_twitch: bool = False) -> list[CurationCandidate]:
@@ -49,21 +67,27 @@ class CurationMonitor:
 
         if self.youtube:
             try:
-                yt_results = await self.youtube.scan()
+                with tracing.span("source", source="youtube"):
+                    yt_results = await self.youtube.scan()
                 all_candidates.extend(yt_results)
+                await self.db.record_metric(
+                    "youtube", "quota_units", self.youtube.last_scan_units,
+                )
             except Exception:
                 log.exception("YouTube scan failed")
 
         if self.news:
             try:
-                news_results = await self.news.scan()
+                with tracing.span("source", source="news"):
+                    news_results = await self.news.scan()
                 all_candidates.extend(news_results)
             except Exception:
                 log.exception("News scan failed")
 
         if include_twitch and self.twitch:
             try:
-                twitch_results = await self.twitch.scan()
+                with tracing.span("source", source="twitch"):
+                    twitch_results = await self.twitch.scan()
                 all_candidates.extend(twitch_results)
             except Exception:
                 log.exception("Twitch scan failed")
@@ -71,10 +95,31 @@ class CurationMonitor:
         log.info("Source scan: %d total candidates", len(all_candidates))
         return all_candidates
 
+    async def _load_cluster_index(self) -> MinHashIndex:
+        """Index signatures of candidates stored in the last cluster window."""
+        index = MinHashIndex(threshold=self.config.cluster_similarity_threshold)
+        since = (
+            datetime.now(timezone.utc) - timedelta(days=self.config.cluster_window_days)
+        ).isoformat()
+        for row in await self.db.get_recent_curation_signatures(since):
+            index.add(unpack_signature(row["minhash"]), (row["cluster_id"], True))
+        return index
+
     async def store_candidates(self, candidates: list[CurationCandidate]) -> int:
-        """Store candidates in DB, deduplicating by URL. Returns count stored."""
+        """Store candidates in DB, deduplicating by URL and near-duplicate text.
+
+        Candidates that look like one stored by an earlier scan join its
+        cluster as 'duplicate' and are never evaluated. Near-duplicates
+        within this scan share a cluster and stay 'new'; the pipeline
+        evaluates only the best-scoring member. Returns count stored as new.
+        """
+        index = await self._load_cluster_index()
         stored = 0
+        clustered = 0
         for c in candidates:
+            signature = candidate_signature(c)
+            match = index.find(signature) if signature else None
+            cluster_id, from_earlier_scan = match or (None, False)
             cid = await self.db.insert_curation_candidate(
                 source=c.source,
                 url=c.url,
@@ -83,24 +128,51 @@ class CurationMonitor:
                 description=c.description,
                 published_at=c.published.isoformat() if c.published else None,
                 metadata=json.dumps(c.metadata) if c.metadata else None,
+                keyword_score=score_candidate(c),
+                minhash=pack_signature(signature) if signature else None,
+                cluster_id=cluster_id,
+                status="duplicate" if from_earlier_scan else "new",
             )
-            if cid:
-                c.metadata["db_id"] = cid
+            if not cid:
+                continue
+            c.metadata["db_id"] = cid
+            c.cluster_id = cluster_id or cid
+            if match:
+                clustered += 1
+            elif signature:
+                index.add(signature, (c.cluster_id, False))
+            if not from_earlier_scan:
                 stored += 1
+        if clustered:
+            log.info("Clustered %d near-duplicate candidates", clustered)
         return stored
 
     async def run_evaluation(self, platform: str = "twitter") -> list[CurationCandidate]:
-        """Evaluate all new candidates through the pipeline."""
-        new_rows = await self.db.get_new_curations(limit=50)
+        """Evaluate the highest-priority new candidates through the pipeline."""
+        new_rows = await self.db.get_curation_queue(
+            limit=self.scheduler.pool_size(), recent=self.scheduler.recent_pool_size(),
+        )
         candidates = []
         for row in new_rows:
+            published = None
+            if row.get("published_at"):
+                try:
+                    published = datetime.fromisoformat(row["published_at"])
+                except ValueError:
+                    pass
             c = CurationCandidate(
                 source=row["source"],
                 url=row["url"],
                 title=row["title"],
-                description=row.get("description", ""),
-                author=row.get("author", ""),
-                metadata={"db_id": row["id"]},
+                description=row.get("description") or "",
+                author=row.get("author") or "",
+                published=published,
+                metadata={
+                    "db_id": row["id"],
+                    "created_at": row["created_at"],
+                    "eval_attempts": row.get("eval_attempts") or 0,
+                },
+                cluster_id=row.get("cluster_id"),
             )
             candidates.append(c)
 
@@ -119,6 +191,7 @@ class CurationMonitor:
         """Full cycle: scan, store, evaluate. Returns count of approved."""
         candidates = await self.scan_sources(include_twitch)
         stored = await self.store_candidates(candidates)
+        self.last_stored = stored
         log.info("Stored %d new candidates (out of %d scanned)", stored, len(candidates))
 
         approved = await self.run_evaluation(platform)
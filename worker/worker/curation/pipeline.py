@@ -1,6 +1,7 @@
 """Two-stage evaluation pipeline for curation candidates.
 
 Stage 1: Local keyword scoring (instant, no API calls)
+         then one candidate per near-duplicate cluster
 Stage 2: Parallel CLI-based AI evaluation via Claude Code subprocess calls
 
 No direct LLM API calls. All AI runs through 'claude -p' in evaluate.py.
@@ -9,18 +10,31 @@ No direct LLM API calls. All AI runs through 'claude -p' in evaluate.py.
 from __future__ import annotations
 
 import logging
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from worker.curation.boost import BOOST_SCORE, is_boosted
-from worker.curation.evaluate import evaluate_batch
+from worker.curation.evaluate import evaluate_all, is_approved
 from worker.curation.keywords import score_keywords
 from worker.curation.models import CurationCandidate
+from worker.curation.scheduler import EvaluationScheduler
 from worker.db import Database
 from worker.subprocesses import SubprocessOwner
 
 log = logging.getLogger(__name__)
 
 KEYWORD_THRESHOLD = 0.3
+MAX_EVAL_ATTEMPTS = 3
+RETRY_BACKOFF_MINUTES = 30
+
+
+def score_candidate(candidate: CurationCandidate) -> float:
+    """Keyword score plus the boost-list bump. Flags boosted candidates in metadata."""
+    score = score_keywords(candidate)
+    if is_boosted(candidate.source, candidate.author):
+        score = min(score + BOOST_SCORE, 1.0)
+        candidate.metadata["boosted"] = True
+    return score
 
 
 class CurationPipeline:
@@ -29,18 +43,22 @@ class CurationPipeline:
         db: Optional[Database] = None,
         max_parallel: int = 5,
         subprocesses: SubprocessOwner | None = None,
+        scheduler: EvaluationScheduler | None = None,
+        max_attempts: int = MAX_EVAL_ATTEMPTS,
+        retry_backoff_minutes: int = RETRY_BACKOFF_MINUTES,
     ):
         self.db = db
         self.max_parallel = max_parallel
         self.subprocesses = subprocesses
+        self.scheduler = scheduler
+        self.max_attempts = max_attempts
+        self.retry_backoff_minutes = retry_backoff_minutes
 
     def _keyword_filter(self, candidates: list[CurationCandidate]) -> list[CurationCandidate]:
         """Stage 1: Local keyword scoring. Drop candidates below threshold."""
         passed = []
         for c in candidates:
-            score = score_keywords(c)
-            if is_boosted(c.source, c.author):
-                score = min(score + BOOST_SCORE, 1.0)
+            score = score_candidate(c)
             c.keyword_score = score
             if score >= KEYWORD_THRESHOLD:
                 passed.append(c)
@@ -49,37 +67,110 @@ class CurationPipeline:
                  len(passed), len(candidates), KEYWORD_THRESHOLD)
         return passed
 
+    def _best_per_cluster(
+        self, candidates: list[CurationCandidate],
+    ) -> tuple[list[CurationCandidate], list[CurationCandidate]]:
+        """Keep the highest keyword score in each cluster. Returns (kept, dropped)."""
+        best: dict[str, CurationCandidate] = {}
+        dropped = []
+        for c in candidates:
+            key = c.cluster_id or c.url
+            current = best.get(key)
+            if current is None:
+                best[key] = c
+            elif c.keyword_score > current.keyword_score:
+                dropped.append(current)
+                best[key] = c
+            else:
+                dropped.append(c)
+        if dropped:
+            log.info("Cluster filter: dropped %d near-duplicates", len(dropped))
+        return list(best.values()), dropped
+
+    def _retry_fields(self, candidate: CurationCandidate) -> dict:
+        """eval_failed bookkeeping: bump the attempt count and schedule a retry.
+
+        Backoff doubles per attempt. After max_attempts the candidate keeps
+        eval_failed with no retry time, so it drops out of the queue.
+        """
+        attempts = candidate.metadata.get("eval_attempts", 0) + 1
+        next_attempt_at = None
+        if attempts < self.max_attempts:
+            delay = timedelta(minutes=self.retry_backoff_minutes * 2 ** (attempts - 1))
+            next_attempt_at = (datetime.now(timezone.utc) + delay).isoformat()
+        return {"eval_attempts": attempts, "next_attempt_at": next_attempt_at}
+
+    async def _persist(self, candidates: list[CurationCandidate], status: str, fields=None):
+        """Bulk-write one stage's outcome for every candidate that has a DB row."""
+        if not self.db:
+            return
+        updates = []
+        for c in candidates:
+            db_id = c.metadata.get("db_id", "")
+            if not db_id:
+                continue
+            row = {"id": db_id, "keyword_score": c.keyword_score, "status": status}
+            if fields:
+                row.update(fields(c))
+            updates.append(row)
+        await self.db.update_curation_evaluations(updates)
+
     async def evaluate(
         self, candidates: list[CurationCandidate], platform: str = "twitter"
     ) -> list[CurationCandidate]:
-        """Run keyword filter then parallel CLI-based AI evaluation."""
+        """Run keyword filter then parallel CLI-based AI evaluation.
+
+        Every candidate that reaches a verdict leaves the 'new' state:
+        keyword_rejected, duplicate, ai_rejected, eval_failed or approved.
+        Candidates the scheduler didn't pick this cycle stay 'new'.
+        """
         log.info("Pipeline starting with %d candidates", len(candidates))
 
         # Stage 1: keyword filter (local, instant)
         filtered = self._keyword_filter(candidates)
+        passed_ids = {id(c) for c in filtered}
+        await self._persist(
+            [c for c in candidates if id(c) not in passed_ids], "keyword_rejected",
+        )
         if not filtered:
             return []
 
-        # Stage 2: parallel Claude Code CLI evaluation (top 20 by keyword score)
-        filtered.sort(key=lambda c: c.keyword_score, reverse=True)
-        to_evaluate = filtered[:20]
+        filtered, duplicates = self._best_per_cluster(filtered)
+        await self._persist(duplicates, "duplicate")
+
+        # Stage 2: parallel Claude Code CLI evaluation, as many as the
+        # scheduler's time budget allows (top 20 by keyword score without one)
+        if self.scheduler:
+            to_evaluate = self.scheduler.select(filtered)
+        else:
+            filtered.sort(key=lambda c: c.keyword_score, reverse=True)
+            to_evaluate = filtered[:20]
 
-        approved_pairs = await evaluate_batch(
+        results = await evaluate_all(
             to_evaluate,
             platform=platform,
             max_parallel=self.max_parallel,
             subprocesses=self.subprocesses,
+            observe_latency=self.scheduler.observe_latency if self.scheduler else None,
         )
 
         # Update candidate fields from evaluation results
         approved = []
-        for candidate, result in approved_pairs:
+        rejected = []
+        failed = []
+        for candidate, result in results:
             candidate.haiku_pass = result.get("relevant", False)
             candidate.haiku_reasoning = result.get("reasoning", "")
+            candidate.gemini_score = result.get("quality_score", 0.0)
+            if result.get("failed"):
+                failed.append(candidate)
+                continue
+            if not is_approved(result):
+                rejected.append(candidate)
+                continue
             candidate.sonnet_pass = result.get("share", False)
             candidate.sonnet_draft = result.get("draft", "")
             candidate.sonnet_reasoning = result.get("reasoning", "")
-            candidate.gemini_score = result.get("quality_score", 0.0)
             quality_norm = result.get("quality_score", 0.0) / 10.0
             score = (candidate.keyword_score * 0.3) + (quality_norm * 0.7)
             # Clickbait penalty (scoring factor, not hard gate)
@@ -94,24 +185,26 @@ class CurationPipeline:
             approved.append(candidate)
 
         approved.sort(key=lambda c: c.final_score, reverse=True)
-        log.info("Pipeline complete: %d candidates approved", len(approved))
+        log.info(
+            "Pipeline complete: %d approved, %d rejected, %d failed",
+            len(approved), len(rejected), len(failed),
+        )
 
         # Persist evaluation results to DB
-        if self.db:
-            for c in approved:
-                db_id = c.metadata.get("db_id", "")
-                if db_id:
-                    await self.db.update_curation_evaluation(
-                        db_id,
-                        keyword_score=c.keyword_score,
-                        haiku_pass=c.haiku_pass,
-                        haiku_reasoning=c.haiku_reasoning,
-                        gemini_score=c.gemini_score,
-                        sonnet_pass=c.sonnet_pass,
-                        sonnet_draft=c.sonnet_draft,
-                        sonnet_reasoning=c.sonnet_reasoning,
-                        final_score=c.final_score,
-                        status="approved",
-                    )
+        await self._persist(approved, "approved", lambda c: {
+            "haiku_pass": c.haiku_pass,
+            "haiku_reasoning": c.haiku_reasoning,
+            "gemini_score": c.gemini_score,
+            "sonnet_pass": c.sonnet_pass,
+            "sonnet_draft": c.sonnet_draft,
+            "sonnet_reasoning": c.sonnet_reasoning,
+            "final_score": c.final_score,
+        })
+        await self._persist(rejected, "ai_rejected", lambda c: {
+            "haiku_pass": c.haiku_pass,
+            "haiku_reasoning": c.haiku_reasoning,
+            "gemini_score": c.gemini_score,
+        })
+        await self._persist(failed, "eval_failed", self._retry_fields)
 
         return approved
@@ -0,0 +1,105 @@
+"""Priority scheduling and adaptive batch sizing for curation evaluation.
+
+CLI evaluation is the slow, expensive stage, so each cycle only sends a
+batch of candidates to it. The scheduler decides which ones (highest
+priority first) and how many (as many as the observed CLI latency says
+will finish inside the cycle's time budget).
+
+Priority blends the stored keyword score with a freshness decay, plus a
+flat bump for boost-listed sources, so a fresh high-score candidate is
+never stuck behind an old backlog of marginal ones.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+from datetime import datetime, timezone
+from typing import Optional
+
+from worker.config import CurationConfig
+from worker.curation.models import CurationCandidate
+
+log = logging.getLogger(__name__)
+
+BOOST_PRIORITY = 0.2
+
+# Starting latency guess per candidate, before any CLI call is observed.
+# With the default budget and parallelism this gives the old fixed
+# batch of 20.
+INITIAL_LATENCY_SECONDS = 75.0
+
+# Weight of the newest observation in the moving average.
+LATENCY_SMOOTHING = 0.3
+
+# How many queued rows to load per evaluation slot. Loading a pool wider
+# than the batch lets freshness reorder candidates the DB sorted by score.
+POOL_FACTOR = 4
+# Newest queued rows loaded on top of the score-ordered pool, per slot, so
+# a fresh candidate isn't kept out of the pool by an old high-score backlog.
+RECENT_POOL_FACTOR = 2
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class EvaluationScheduler:
+    def __init__(self, config: CurationConfig):
+        self.config = config
+        self.latency = INITIAL_LATENCY_SECONDS
+        self.observations = 0
+
+    def observe_latency(self, seconds: float) -> None:
+        """Fold one candidate's CLI evaluation time into the moving average."""
+        if self.observations == 0:
+            self.latency = seconds
+        else:
+            self.latency += LATENCY_SMOOTHING * (seconds - self.latency)
+        self.observations += 1
+
+    def batch_size(self) -> int:
+        """How many candidates fit in the time budget at current CLI latency."""
+        slots = self.config.evaluation_time_budget_seconds * self.config.max_parallel_evaluations
+        fit = int(slots / max(self.latency, 1.0))
+        return max(
+            self.config.min_evaluations_per_cycle,
+            min(fit, self.config.max_evaluations_per_cycle),
+        )
+
+    def pool_size(self) -> int:
+        return self.batch_size() * POOL_FACTOR
+
+    def recent_pool_size(self) -> int:
+        return self.batch_size() * RECENT_POOL_FACTOR
+
+    def priority(self, candidate: CurationCandidate, now: Optional[datetime] = None) -> float:
+        now = now or datetime.now(timezone.utc)
+        seen = candidate.published or _parse_time(candidate.metadata.get("created_at"))
+        if seen is not None and seen.tzinfo is None:
+            seen = seen.replace(tzinfo=timezone.utc)
+        age_hours = max((now - seen).total_seconds() / 3600, 0.0) if seen else 0.0
+        decay = math.pow(0.5, age_hours / self.config.freshness_half_life_hours)
+        score = candidate.keyword_score * decay
+        if candidate.metadata.get("boosted"):
+            score += BOOST_PRIORITY
+        return score
+
+    def select(self, candidates: list[CurationCandidate]) -> list[CurationCandidate]:
+        """Return this cycle's batch, highest priority first."""
+        now = datetime.now(timezone.utc)
+        size = self.batch_size()
+        batch = heapq.nlargest(size, candidates, key=lambda c: self.priority(c, now))
+        log.info(
+            "Scheduler: %d/%d candidates this cycle (%.0fs avg CLI latency, %ds budget)",
+            len(batch), len(candidates), self.latency,
+            self.config.evaluation_time_budget_seconds,
+        )
+        return batch
@@ -0,0 +1,127 @@
+"""Near-duplicate detection for curation candidates using MinHash.
+
+The same launch tends to arrive from several feeds (hn_best, lobsters,
+dev.to, Google Alerts) under different URLs and slightly different
+titles. Canonical URLs can't catch that, so each candidate also gets a
+MinHash signature over the words of its title and the start of its
+description. Candidates whose estimated Jaccard similarity clears the
+threshold share a cluster, and only one member of a cluster goes on to
+CLI evaluation.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import struct
+from typing import Any, Optional
+
+from worker.curation.models import CurationCandidate
+
+NUM_PERMUTATIONS = 64
+BANDS = 32  # 2 rows per band: near-certain recall above ~0.4 similarity
+DEFAULT_THRESHOLD = 0.5
+
+# Feed summaries vary a lot more than titles do, so only the first few
+# description words go into the signature.
+DESCRIPTION_TOKENS = 20
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how",
+    "i", "in", "is", "it", "its", "my", "new", "of", "on", "or", "our",
+    "show", "hn", "that", "the", "this", "to", "we", "with", "you", "your",
+}
+
+_URL_RE = re.compile(r"https?://\S+")
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.-]*[a-z0-9+#]|[a-z0-9]")
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_PACK = struct.Struct(f"<{NUM_PERMUTATIONS}I")
+
+# Fixed seed: stored signatures must stay comparable across restarts.
+_rng = random.Random(0x6B6A)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+def _tokens(text: str) -> list[str]:
+    text = _URL_RE.sub(" ", text.lower())
+    return [t for t in _TOKEN_RE.findall(text) if t not in STOPWORDS]
+
+
+def shingles(title: str, description: str = "") -> set[str]:
+    return set(_tokens(title)) | set(_tokens(description)[:DESCRIPTION_TOKENS])
+
+
+def _base_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "big")
+
+
+def minhash(title: str, description: str = "") -> Optional[tuple[int, ...]]:
+    """Return a MinHash signature, or None if there are no words to hash."""
+    hashes = [_base_hash(t) for t in shingles(title, description)]
+    if not hashes:
+        return None
+    return tuple(
+        min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def candidate_signature(candidate: CurationCandidate) -> Optional[tuple[int, ...]]:
+    return minhash(candidate.title, candidate.description)
+
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Estimate Jaccard similarity from two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERMUTATIONS
+
+
+def pack_signature(signature: tuple[int, ...]) -> bytes:
+    return _PACK.pack(*signature)
+
+
+def unpack_signature(blob: bytes) -> tuple[int, ...]:
+    return _PACK.unpack(blob)
+
+
+class MinHashIndex:
+    """Locality-sensitive lookup of signatures above a similarity threshold.
+
+    Signatures are split into bands. Similar signatures almost always
+    agree on at least one whole band, so a lookup only compares against
+    signatures that share a band instead of scanning everything.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self._rows = NUM_PERMUTATIONS // BANDS
+        self._tables: list[dict[tuple[int, ...], list[tuple[tuple[int, ...], Any]]]] = [
+            {} for _ in range(BANDS)
+        ]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _band_keys(self, signature: tuple[int, ...]) -> list[tuple[int, ...]]:
+        r = self._rows
+        return [signature[i * r:(i + 1) * r] for i in range(BANDS)]
+
+    def add(self, signature: tuple[int, ...], item: Any) -> None:
+        for table, key in zip(self._tables, self._band_keys(signature)):
+            table.setdefault(key, []).append((signature, item))
+        self._size += 1
+
+    def find(self, signature: tuple[int, ...]) -> Optional[Any]:
+        """Return the item of the most similar indexed signature, or None."""
+        best: Optional[tuple[float, Any]] = None
+        for table, key in zip(self._tables, self._band_keys(signature)):
+            for other, item in table.get(key, ()):
+                score = similarity(signature, other)
+                if score >= self.threshold and (best is None or score > best[0]):
+                    best = (score, item)
+        return best[1] if best else None
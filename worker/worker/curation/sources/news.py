@@ -8,9 +8,8 @@ from calendar import timegm
 from datetime import datetime, timezone
 from typing import Optional
 
-import feedparser
-
 from worker.curation.models import CurationCandidate
+from worker.urls import canonicalize_url, unwrap_redirect
 
 log = logging.getLogger(__name__)
 
@@ -59,7 +58,8 @@ class NewsSource:
 
         return CurationCandidate(
             source="google_news",
-            url=link,
+            # Google Alerts links are google.com/url redirects; keep the target
+            url=unwrap_redirect(link),
             title=title,
             description=description,
             author=author,
@@ -70,6 +70,8 @@ class NewsSource:
     async def scan_feed(self, url: str, feed_name: str) -> list[CurationCandidate]:
         """Parse a single RSS feed and return candidates."""
         try:
+            import feedparser  # deferred: slow import, only needed mid-scan
+
             feed = feedparser.parse(url)
             candidates = []
             for entry in feed.entries[:20]:
@@ -89,15 +91,17 @@ class NewsSource:
         for name, url in RSS_FEEDS.items():
             results = await self.scan_feed(url, name)
             for c in results:
-                if c.url not in seen_urls:
-                    seen_urls.add(c.url)
+                key = canonicalize_url(c.url)
+                if key not in seen_urls:
+                    seen_urls.add(key)
                     all_candidates.append(c)
 
         for i, url in enumerate(self.google_alert_urls):
             results = await self.scan_feed(url, f"google_alert_{i}")
             for c in results:
-                if c.url not in seen_urls:
-                    seen_urls.add(c.url)
+                key = canonicalize_url(c.url)
+                if key not in seen_urls:
+                    seen_urls.add(key)
                     all_candidates.append(c)
 
         log.info("News scan: %d candidates from %d feeds",
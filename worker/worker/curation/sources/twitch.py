@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import httpx
 
+from worker import tracing
 from worker.curation.models import CurationCandidate
+from worker.urls import canonicalize_url
 
 log = logging.getLogger(__name__)
 
@@ -20,33 +24,88 @@ CATEGORIES = {
     "Software and Game Development": "1469308723",
 }
 
+# Refresh the app token this long before Twitch says it expires, so a
+# scan never starts with a token that dies halfway through.
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+# After a failed token request, don't ask again for this long. Without
+# it every category fetch in a scan would retry the token endpoint.
+TOKEN_RETRY_SECONDS = 60
+
+PAGE_SIZE = 20  # Helix allows up to 100; small pages stop early when enough
+CLIPS_PER_CATEGORY = 40
+MAX_REQUESTS_PER_SCAN = 8
+
 
 class TwitchSource:
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        max_requests: int = MAX_REQUESTS_PER_SCAN,
+    ):
         self.client_id = client_id
         self.client_secret = client_secret
+        self.max_requests = max_requests
         self._access_token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_retry_at = 0.0
+        self._token_lock = asyncio.Lock()
+        self._requests_left = max_requests
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=15, event_hooks=tracing.httpx_event_hooks())
+
+    def _token_valid(self) -> bool:
+        return bool(self._access_token) and time.monotonic() < self._token_expires_at
+
+    async def _ensure_token(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        force: bool = False,
+    ) -> str:
+        """Return a live app access token, refreshing it ahead of expiry.
+
+        Concurrent callers share one refresh: whoever takes the lock first
+        fetches the token and the rest reuse it. ``force`` discards the
+        cached token, which is what a 401 calls for.
+        """
+        stale = self._access_token
+        async with self._token_lock:
+            if force and self._access_token == stale:
+                self._access_token = None
+            if self._token_valid():
+                return self._access_token
+            if time.monotonic() < self._token_retry_at:
+                return ""
 
-    async def _ensure_token(self) -> str:
-        """Get or refresh the OAuth app access token."""
-        if self._access_token:
-            return self._access_token
-
-        try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(TOKEN_URL, params={
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "grant_type": "client_credentials",
-                })
+            try:
+                if client is None:
+                    async with self._client() as own_client:
+                        resp = await self._request_token(own_client)
+                else:
+                    resp = await self._request_token(client)
                 if resp.status_code != 200:
                     log.error("Twitch token error (%d): %s", resp.status_code, resp.text[:200])
+                    self._token_retry_at = time.monotonic() + TOKEN_RETRY_SECONDS
                     return ""
-                self._access_token = resp.json()["access_token"]
+                data = resp.json()
+                self._access_token = data["access_token"]
+                lifetime = float(data.get("expires_in", 0) or 0)
+                self._token_expires_at = time.monotonic() + max(
+                    lifetime - TOKEN_REFRESH_MARGIN_SECONDS, 0.0,
+                )
                 return self._access_token
-        except Exception:
-            log.exception("Twitch token request failed")
-            return ""
+            except Exception:
+                log.exception("Twitch token request failed")
+                self._token_retry_at = time.monotonic() + TOKEN_RETRY_SECONDS
+                return ""
+
+    async def _request_token(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.post(TOKEN_URL, params={
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "grant_type": "client_credentials",
+        })
 
     def _headers(self, token: str) -> dict:
         return {
@@ -80,46 +139,94 @@ class TwitchSource:
             },
         )
 
-    async def get_clips(self, game_id: str, max_results: int = 20) -> list[CurationCandidate]:
-        """Get recent clips for a game/category."""
-        token = await self._ensure_token()
+    async def _get(
+        self, client: httpx.AsyncClient, path: str, params: dict,
+    ) -> Optional[httpx.Response]:
+        """GET a Helix endpoint, refreshing the token and retrying once on 401."""
+        token = await self._ensure_token(client)
         if not token:
-            return []
+            return None
+        resp = await client.get(f"{API_BASE}{path}", params=params, headers=self._headers(token))
+        if resp.status_code == 401:
+            log.info("Twitch token rejected, refreshing")
+            token = await self._ensure_token(client, force=True)
+            if not token:
+                return None
+            resp = await client.get(f"{API_BASE}{path}", params=params, headers=self._headers(token))
+        return resp
+
+    async def get_clips(
+        self,
+        game_id: str,
+        max_results: int = 20,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> list[CurationCandidate]:
+        """Get recent clips for a game/category, following the page cursor.
+
+        Stops at ``max_results`` clips, when Twitch runs out of pages, or
+        when the scan's request budget is spent.
+        """
+        if client is None:
+            self._requests_left = self.max_requests
+            async with self._client() as own_client:
+                return await self.get_clips(game_id, max_results, own_client)
 
         started_at = (datetime.now(timezone.utc) - timedelta(days=7)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        clips: list[CurationCandidate] = []
+        cursor = None
 
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(
-                    f"{API_BASE}/clips",
-                    params={
-                        "game_id": game_id,
-                        "first": max_results,
-                        "started_at": started_at,
-                    },
-                    headers=self._headers(token),
-                    timeout=15,
-                )
+            while len(clips) < max_results:
+                if self._requests_left <= 0:
+                    log.info("Twitch request budget spent, stopping category %s", game_id)
+                    break
+                self._requests_left -= 1
+                params = {
+                    "game_id": game_id,
+                    "first": min(PAGE_SIZE, max_results - len(clips)),
+                    "started_at": started_at,
+                }
+                if cursor:
+                    params["after"] = cursor
+                resp = await self._get(client, "/clips", params)
+                if resp is None:
+                    break
                 if resp.status_code != 200:
                     log.error("Twitch clips error (%d): %s", resp.status_code, resp.text[:200])
-                    return []
+                    break
                 data = resp.json()
-                return [self._parse_clip(c) for c in data.get("data", [])]
+                clips.extend(self._parse_clip(c) for c in data.get("data", []))
+                cursor = data.get("pagination", {}).get("cursor")
+                if not cursor or not data.get("data"):
+                    break
         except Exception:
             log.exception("Twitch clips request failed")
-            return []
+        return clips[:max_results]
 
     async def scan(self) -> list[CurationCandidate]:
-        """Scan all monitored categories for clips."""
+        """Scan all monitored categories concurrently for clips."""
+        self._requests_left = self.max_requests
+        async with self._client() as client:
+            # Fetch the token once up front so the category tasks don't
+            # all queue on the refresh lock.
+            if not await self._ensure_token(client):
+                return []
+            results = await asyncio.gather(*(
+                self.get_clips(game_id, max_results=CLIPS_PER_CATEGORY, client=client)
+                for game_id in CATEGORIES.values()
+            ))
+
         seen_urls = set()
         all_candidates = []
-
-        for name, game_id in CATEGORIES.items():
-            clips = await self.get_clips(game_id, max_results=10)
+        for clips in results:
             for c in clips:
-                if c.url and c.url not in seen_urls:
-                    seen_urls.add(c.url)
+                key = canonicalize_url(c.url)
+                if key and key not in seen_urls:
+                    seen_urls.add(key)
                     all_candidates.append(c)
 
-        log.info("Twitch scan: %d clips from %d categories", len(all_candidates), len(CATEGORIES))
+        log.info(
+            "Twitch scan: %d clips from %d categories (%d requests)",
+            len(all_candidates), len(CATEGORIES), self.max_requests - self._requests_left,
+        )
         return all_candidates
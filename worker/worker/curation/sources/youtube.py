@@ -2,26 +2,45 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from zoneinfo import ZoneInfo
 
 import httpx
 
+from worker import tracing
 from worker.curation.models import CurationCandidate
+from worker.db import Database
+from worker.urls import canonicalize_url
 
 log = logging.getLogger(__name__)
 
 API_BASE = "https://www.googleapis.com/youtube/v3"
 
-# Each search.list call costs 100 YouTube API quota units.
-# Free tier: 10,000 units/day. At 4 scans/day we budget ~2,400 units/scan.
-# 7 terms × 3 results = 7 calls × 100 = 700 units/scan = 2,800/day.
+# Each search.list call costs 100 YouTube API quota units; a videos.list
+# call costs 1 unit for up to 50 videos.
+# Free tier: 10,000 units/day, reset at midnight Pacific time.
+# At 4 scans/day we budget ~2,400 units/scan.
+# 7 terms × 3 results = 7 searches × 100 + 1 details lookup = 701 units/scan.
+#
+# QuotaLedger persists units spent per quota day in the worker DB, so a
+# restart doesn't forget what was already used. Searches that would push
+# past the scan or daily budget are skipped until the next scan.
 #
 # Most searches use videoDuration=short to target Shorts and quick demos
 # (more shareable on Twitter/Bluesky). A couple use no duration filter
 # to catch longer tutorials and reviews worth linking.
 
+DAILY_QUOTA = 10_000
+SCAN_QUOTA = 2_400
+SEARCH_COST = 100
+VIDEOS_LIST_COST = 1
+VIDEOS_PER_LOOKUP = 50
+MAX_CONCURRENT_SEARCHES = 4
+QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+
 SEARCH_TERMS = [
     # Shorts-focused (videoDuration=short)
     {"q": "terminal CLI tools", "short": True},
@@ -35,9 +54,72 @@ SEARCH_TERMS = [
 ]
 
 
+class QuotaLedger:
+    """Daily API quota accounting, persisted in the worker DB when one is given."""
+
+    def __init__(
+        self,
+        db: Optional[Database] = None,
+        daily_budget: int = DAILY_QUOTA,
+        service: str = "youtube",
+    ):
+        self.db = db
+        self.daily_budget = daily_budget
+        self.service = service
+        self._lock = asyncio.Lock()
+        self._local: dict[str, int] = {}
+
+    @staticmethod
+    def quota_day(now: Optional[datetime] = None) -> str:
+        now = now or datetime.now(timezone.utc)
+        return now.astimezone(QUOTA_TZ).strftime("%Y-%m-%d")
+
+    async def used_today(self) -> int:
+        day = self.quota_day()
+        if self.db:
+            return await self.db.get_quota_used(self.service, day)
+        return self._local.get(day, 0)
+
+    async def remaining(self) -> int:
+        return max(self.daily_budget - await self.used_today(), 0)
+
+    async def try_spend(self, units: int) -> bool:
+        """Charge units up front if they fit today's budget. Returns False if not.
+
+        YouTube bills a request whether or not it succeeds, so units are
+        recorded before the call rather than after.
+        """
+        async with self._lock:
+            day = self.quota_day()
+            if self.db:
+                used = await self.db.get_quota_used(self.service, day)
+            else:
+                used = self._local.get(day, 0)
+            if used + units > self.daily_budget:
+                return False
+            if self.db:
+                await self.db.add_quota_usage(self.service, day, units)
+            else:
+                self._local[day] = used + units
+            return True
+
+
 class YouTubeSource:
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        ledger: Optional[QuotaLedger] = None,
+        scan_budget: int = SCAN_QUOTA,
+        max_concurrent: int = MAX_CONCURRENT_SEARCHES,
+    ):
         self.api_key = api_key
+        self.ledger = ledger or QuotaLedger()
+        self.scan_budget = scan_budget
+        self.max_concurrent = max_concurrent
+        self.last_scan_units = 0
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(event_hooks=tracing.httpx_event_hooks())
 
     def _parse_search_results(self, items: list[dict]) -> list[CurationCandidate]:
         """Parse YouTube API search results into CurationCandidates."""
@@ -72,10 +154,31 @@ class YouTubeSource:
             ))
         return candidates
 
+    def _apply_video_details(
+        self, candidates: list[CurationCandidate], items: list[dict],
+    ) -> None:
+        """Fill in full descriptions and stats from a videos.list response."""
+        by_id = {item.get("id"): item for item in items}
+        for c in candidates:
+            item = by_id.get(c.metadata.get("video_id"))
+            if not item:
+                continue
+            snippet = item.get("snippet", {})
+            if snippet.get("description"):
+                c.description = snippet["description"]
+            stats = item.get("statistics", {})
+            c.metadata["duration"] = item.get("contentDetails", {}).get("duration", "")
+            c.metadata["view_count"] = int(stats.get("viewCount", 0) or 0)
+            c.metadata["like_count"] = int(stats.get("likeCount", 0) or 0)
+
     async def search(
-        self, query: str, max_results: int = 3, short_only: bool = False,
+        self,
+        query: str,
+        max_results: int = 3,
+        short_only: bool = False,
+        client: Optional[httpx.AsyncClient] = None,
     ) -> list[CurationCandidate]:
-        """Search YouTube for videos matching a query."""
+        """Search YouTube for videos matching a query (100 quota units)."""
         cutoff = (datetime.now(timezone.utc) - timedelta(days=7)).strftime("%Y-%m-%dT%H:%M:%SZ")
         params = {
             "part": "snippet",
@@ -90,30 +193,102 @@ class YouTubeSource:
             params["videoDuration"] = "short"
 
         try:
-            async with httpx.AsyncClient() as client:
+            if client is None:
+                async with self._client() as own_client:
+                    resp = await own_client.get(f"{API_BASE}/search", params=params, timeout=15)
+            else:
                 resp = await client.get(f"{API_BASE}/search", params=params, timeout=15)
-                if resp.status_code != 200:
-                    log.error("YouTube API error (%d): %s", resp.status_code, resp.text[:200])
-                    return []
-                data = resp.json()
-                return self._parse_search_results(data.get("items", []))
+            if resp.status_code != 200:
+                log.error("YouTube API error (%d): %s", resp.status_code, resp.text[:200])
+                return []
+            data = resp.json()
+            return self._parse_search_results(data.get("items", []))
         except Exception:
             log.exception("YouTube search failed")
             return []
 
+    async def get_video_details(
+        self, video_ids: list[str], client: httpx.AsyncClient,
+    ) -> list[dict]:
+        """Look up up to 50 videos in one videos.list call (1 quota unit)."""
+        try:
+            resp = await client.get(
+                f"{API_BASE}/videos",
+                params={
+                    "part": "snippet,contentDetails,statistics",
+                    "id": ",".join(video_ids),
+                    "key": self.api_key,
+                },
+                timeout=15,
+            )
+            if resp.status_code != 200:
+                log.error("YouTube videos.list error (%d): %s", resp.status_code, resp.text[:200])
+                return []
+            return resp.json().get("items", [])
+        except Exception:
+            log.exception("YouTube videos.list failed")
+            return []
+
     async def scan(self) -> list[CurationCandidate]:
-        """Run all search terms and return deduplicated candidates."""
+        """Run all search terms concurrently under the quota ledger.
+
+        Returns deduplicated candidates. Units spent are logged and kept in
+        last_scan_units.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        spent = 0
+        deferred = 0
+        budget_lock = asyncio.Lock()
+
+        async def _charge(units: int) -> bool:
+            nonlocal spent
+            async with budget_lock:
+                if spent + units > self.scan_budget:
+                    return False
+                if not await self.ledger.try_spend(units):
+                    return False
+                spent += units
+                return True
+
+        async def _run_term(term: dict, client: httpx.AsyncClient) -> list[CurationCandidate]:
+            nonlocal deferred
+            async with semaphore:
+                if not await _charge(SEARCH_COST):
+                    deferred += 1
+                    return []
+                return await self.search(
+                    term["q"], max_results=3, short_only=term.get("short", False),
+                    client=client,
+                )
+
         seen_urls = set()
         all_candidates = []
+        async with self._client() as client:
+            results = await asyncio.gather(*(_run_term(t, client) for t in SEARCH_TERMS))
+            for batch in results:
+                for c in batch:
+                    key = canonicalize_url(c.url)
+                    if key not in seen_urls:
+                        seen_urls.add(key)
+                        all_candidates.append(c)
 
-        for term in SEARCH_TERMS:
-            results = await self.search(
-                term["q"], max_results=3, short_only=term.get("short", False),
-            )
-            for c in results:
-                if c.url not in seen_urls:
-                    seen_urls.add(c.url)
-                    all_candidates.append(c)
+            for i in range(0, len(all_candidates), VIDEOS_PER_LOOKUP):
+                chunk = all_candidates[i:i + VIDEOS_PER_LOOKUP]
+                if not await _charge(VIDEOS_LIST_COST):
+                    break
+                items = await self.get_video_details(
+                    [c.metadata["video_id"] for c in chunk], client,
+                )
+                self._apply_video_details(chunk, items)
 
-        log.info("YouTube scan: %d candidates from %d search terms", len(all_candidates), len(SEARCH_TERMS))
+        self.last_scan_units = spent
+        if deferred:
+            log.warning(
+                "YouTube quota: deferred %d/%d searches (%d units left today)",
+                deferred, len(SEARCH_TERMS), await self.ledger.remaining(),
+            )
+        log.info(
+            "YouTube scan: %d candidates from %d search terms, %d quota units",
+            len(all_candidates), len(SEARCH_TERMS) - deferred, spent,
+        )
         return all_candidates
@@ -1,16 +1,27 @@
 """SQLite storage for keyjawn-worker findings, actions, calendar, and metrics."""
 
+import time
 from datetime import datetime, timezone
 from typing import Optional
 from uuid import uuid4
 
 import aiosqlite
 
+from worker import metrics, tracing
+from worker.urls import canonicalize_url
+
+QUERY_SECONDS = metrics.histogram(
+    "keyjawn_db_query_seconds",
+    "SQLite statement latency by statement kind",
+    ["op"],
+)
+
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS findings (
     id TEXT PRIMARY KEY,
     platform TEXT NOT NULL,
     source_url TEXT NOT NULL,
+    canonical_url TEXT,
     source_user TEXT NOT NULL,
     content TEXT NOT NULL,
     relevance_score REAL NOT NULL,
@@ -58,6 +69,7 @@ CREATE TABLE IF NOT EXISTS curation_candidates (
     id TEXT PRIMARY KEY,
     source TEXT NOT NULL,
     url TEXT NOT NULL UNIQUE,
+    canonical_url TEXT,
     title TEXT NOT NULL,
     author TEXT,
     description TEXT,
@@ -72,6 +84,10 @@ CREATE TABLE IF NOT EXISTS curation_candidates (
     sonnet_draft TEXT,
     sonnet_reasoning TEXT,
     final_score REAL DEFAULT 0,
+    minhash BLOB,
+    cluster_id TEXT,
+    eval_attempts INTEGER DEFAULT 0,
+    next_attempt_at TEXT,
     status TEXT DEFAULT 'new',
     created_at TEXT NOT NULL,
     evaluated_at TEXT,
@@ -95,6 +111,41 @@ CREATE TABLE IF NOT EXISTS engagement_opportunities (
 );
 
 CREATE UNIQUE INDEX IF NOT EXISTS idx_engagement_post ON engagement_opportunities(platform, post_id);
+
+CREATE TABLE IF NOT EXISTS api_quota (
+    service TEXT NOT NULL,
+    day TEXT NOT NULL,
+    units_used INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (service, day)
+);
+"""
+
+# Columns added after the first deploy. CREATE TABLE IF NOT EXISTS leaves
+# existing databases alone, so init() adds whatever is missing here before
+# creating the indexes that depend on them.
+MIGRATIONS = {
+    "findings": [("canonical_url", "TEXT")],
+    "curation_candidates": [
+        ("canonical_url", "TEXT"),
+        ("minhash", "BLOB"),
+        ("cluster_id", "TEXT"),
+        ("eval_attempts", "INTEGER DEFAULT 0"),
+        ("next_attempt_at", "TEXT"),
+    ],
+}
+
+# One-off data backfills, tracked in PRAGMA user_version:
+#   1 - keyword_score for candidates queued before scores were stored
+DATA_VERSION = 1
+
+POST_MIGRATION_SCHEMA = """
+CREATE INDEX IF NOT EXISTS idx_findings_canonical_url ON findings(canonical_url);
+CREATE INDEX IF NOT EXISTS idx_curation_canonical_url ON curation_candidates(canonical_url);
+CREATE INDEX IF NOT EXISTS idx_curation_cluster ON curation_candidates(cluster_id);
+CREATE INDEX IF NOT EXISTS idx_curation_created_at ON curation_candidates(created_at);
+CREATE INDEX IF NOT EXISTS idx_curation_queue ON curation_candidates(status, keyword_score DESC, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_curation_retry ON curation_candidates(status, next_attempt_at);
 """
 
 
@@ -106,17 +157,119 @@ def _now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _statement_kind(sql: str) -> str:
+    return sql.lstrip().split(None, 1)[0].lower() if sql.strip() else "empty"
+
+
+class _TimedConnection:
+    """aiosqlite connection wrapper that records statement latency.
+
+    Everything except execute/executemany/commit passes straight through.
+    """
+
+    def __init__(self, conn: aiosqlite.Connection):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    async def execute(self, sql: str, parameters=None) -> aiosqlite.Cursor:
+        kind = _statement_kind(sql)
+        started = time.perf_counter()
+        try:
+            with tracing.leaf("db", op=kind):
+                return await self._conn.execute(sql, parameters)
+        finally:
+            QUERY_SECONDS.labels(kind).observe(time.perf_counter() - started)
+
+    async def executemany(self, sql: str, parameters) -> aiosqlite.Cursor:
+        kind = _statement_kind(sql)
+        started = time.perf_counter()
+        try:
+            with tracing.leaf("db", op=kind, many=True):
+                return await self._conn.executemany(sql, parameters)
+        finally:
+            QUERY_SECONDS.labels(kind).observe(time.perf_counter() - started)
+
+    async def commit(self) -> None:
+        started = time.perf_counter()
+        try:
+            with tracing.leaf("db", op="commit"):
+                await self._conn.commit()
+        finally:
+            QUERY_SECONDS.labels("commit").observe(time.perf_counter() - started)
+
+
 class Database:
     def __init__(self, db_path: str):
         self.db_path = db_path
-        self._db: Optional[aiosqlite.Connection] = None
+        self._db: Optional[_TimedConnection] = None
 
     async def init(self):
-        self._db = await aiosqlite.connect(self.db_path)
-        self._db.row_factory = aiosqlite.Row
+        conn = await aiosqlite.connect(self.db_path)
+        conn.row_factory = aiosqlite.Row
+        self._db = _TimedConnection(conn)
         await self._db.executescript(SCHEMA)
+        await self._migrate()
+        await self._db.executescript(POST_MIGRATION_SCHEMA)
         await self._db.commit()
 
+    async def _migrate(self):
+        """Add missing columns and backfill canonical URLs on older databases."""
+        for table, columns in MIGRATIONS.items():
+            cursor = await self._db.execute(f"PRAGMA table_info({table})")
+            existing = {row["name"] for row in await cursor.fetchall()}
+            for name, decl in columns:
+                if name not in existing:
+                    await self._db.execute(
+                        f"ALTER TABLE {table} ADD COLUMN {name} {decl}"
+                    )
+
+        for table, url_column in (
+            ("findings", "source_url"),
+            ("curation_candidates", "url"),
+        ):
+            cursor = await self._db.execute(
+                f"SELECT id, {url_column} FROM {table} WHERE canonical_url IS NULL"
+            )
+            rows = await cursor.fetchall()
+            if rows:
+                await self._db.executemany(
+                    f"UPDATE {table} SET canonical_url = ? WHERE id = ?",
+                    [(canonicalize_url(row[url_column]), row["id"]) for row in rows],
+                )
+
+        cursor = await self._db.execute("PRAGMA user_version")
+        version = (await cursor.fetchone())[0]
+        if version < 1:
+            await self._backfill_keyword_scores()
+        if version < DATA_VERSION:
+            await self._db.execute(f"PRAGMA user_version = {DATA_VERSION}")
+
+    async def _backfill_keyword_scores(self):
+        """Score queued candidates stored before keyword_score was filled in at insert."""
+        cursor = await self._db.execute(
+            """SELECT id, source, url, title, author, description FROM curation_candidates
+               WHERE status IN ('new', 'eval_failed')
+                 AND (keyword_score IS NULL OR keyword_score = 0)"""
+        )
+        rows = await cursor.fetchall()
+        if not rows:
+            return
+        from worker.curation.models import CurationCandidate
+        from worker.curation.pipeline import score_candidate
+
+        await self._db.executemany(
+            "UPDATE curation_candidates SET keyword_score = ? WHERE id = ?",
+            [
+                (score_candidate(CurationCandidate(
+                    source=row["source"], url=row["url"], title=row["title"],
+                    description=row["description"] or "", author=row["author"] or "",
+                )), row["id"])
+                for row in rows
+            ],
+        )
+
     async def close(self):
         if self._db:
             await self._db.close()
@@ -141,13 +294,24 @@ class Database:
     ) -> str:
         finding_id = _new_id()
         await self._db.execute(
-            """INSERT INTO findings (id, platform, source_url, source_user, content, relevance_score, status, found_at)
-               VALUES (?, ?, ?, ?, ?, ?, 'queued', ?)""",
-            (finding_id, platform, source_url, source_user, content, relevance_score, _now()),
+            """INSERT INTO findings (id, platform, source_url, canonical_url, source_user, content, relevance_score, status, found_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, 'queued', ?)""",
+            (
+                finding_id, platform, source_url, canonicalize_url(source_url),
+                source_user, content, relevance_score, _now(),
+            ),
         )
         await self._db.commit()
         return finding_id
 
+    async def finding_exists(self, source_url: str) -> bool:
+        """Check whether a finding with the same canonical URL was already queued."""
+        cursor = await self._db.execute(
+            "SELECT 1 FROM findings WHERE canonical_url = ? LIMIT 1",
+            (canonicalize_url(source_url),),
+        )
+        return await cursor.fetchone() is not None
+
     async def get_finding(self, finding_id: str) -> Optional[dict]:
         cursor = await self._db.execute("SELECT * FROM findings WHERE id = ?", (finding_id,))
         row = await cursor.fetchone()
@@ -262,6 +426,27 @@ class Database:
         )
         await self._db.commit()
 
+    # -- api quota --
+
+    async def get_quota_used(self, service: str, day: str) -> int:
+        cursor = await self._db.execute(
+            "SELECT units_used FROM api_quota WHERE service = ? AND day = ?",
+            (service, day),
+        )
+        row = await cursor.fetchone()
+        return row[0] if row else 0
+
+    async def add_quota_usage(self, service: str, day: str, units: int):
+        await self._db.execute(
+            """INSERT INTO api_quota (service, day, units_used, updated_at)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT(service, day) DO UPDATE SET
+                 units_used = units_used + excluded.units_used,
+                 updated_at = excluded.updated_at""",
+            (service, day, units, _now()),
+        )
+        await self._db.commit()
+
     # -- curation --
 
     async def insert_curation_candidate(
@@ -273,10 +458,21 @@ class Database:
         description: str,
         published_at: str = None,
         metadata: str = None,
+        keyword_score: float = 0.0,
+        minhash: bytes = None,
+        cluster_id: str = None,
+        status: str = "new",
     ) -> Optional[str]:
-        """Insert a curation candidate. Returns ID or None if URL already exists."""
+        """Insert a curation candidate. Returns ID or None if URL already exists.
+
+        Dedup compares canonical URLs, so a youtu.be link, a tracking-param
+        variant, or a redirect-wrapped copy of a stored URL is a duplicate.
+        A candidate without a cluster_id starts its own cluster.
+        """
+        canonical = canonicalize_url(url)
         cursor = await self._db.execute(
-            "SELECT 1 FROM curation_candidates WHERE url = ?", (url,)
+            "SELECT 1 FROM curation_candidates WHERE canonical_url = ? OR url = ?",
+            (canonical, url),
         )
         if await cursor.fetchone():
             return None
@@ -284,9 +480,13 @@ class Database:
         cid = _new_id()
         await self._db.execute(
             """INSERT INTO curation_candidates
-               (id, source, url, title, author, description, published_at, metadata, status, created_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'new', ?)""",
-            (cid, source, url, title, author, description, published_at, metadata, _now()),
+               (id, source, url, canonical_url, title, author, description, published_at, metadata,
+                keyword_score, minhash, cluster_id, status, created_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                cid, source, url, canonical, title, author, description, published_at, metadata,
+                keyword_score, minhash, cluster_id or cid, status, _now(),
+            ),
         )
         await self._db.commit()
         return cid
@@ -298,6 +498,15 @@ class Database:
         row = await cursor.fetchone()
         return dict(row) if row else None
 
+    async def get_recent_curation_signatures(self, since: str) -> list[dict]:
+        """Get MinHash signatures and cluster IDs of candidates created since a timestamp."""
+        cursor = await self._db.execute(
+            """SELECT id, minhash, cluster_id FROM curation_candidates
+               WHERE created_at >= ? AND minhash IS NOT NULL""",
+            (since,),
+        )
+        return [dict(row) for row in await cursor.fetchall()]
+
     async def update_curation_evaluation(self, cid: str, **kwargs):
         """Update evaluation fields on a curation candidate."""
         kwargs["evaluated_at"] = _now()
@@ -316,6 +525,53 @@ class Database:
         )
         return [dict(row) for row in await cursor.fetchall()]
 
+    async def update_curation_evaluations(self, updates: list[dict]):
+        """Bulk version of update_curation_evaluation, committed once.
+
+        Each dict holds an "id" plus the columns to set. Rows that set the
+        same columns share one executemany.
+        """
+        if not updates:
+            return
+        now = _now()
+        groups: dict[tuple[str, ...], list[list]] = {}
+        for update in updates:
+            fields = {k: v for k, v in update.items() if k != "id"}
+            fields["evaluated_at"] = now
+            columns = tuple(fields)
+            groups.setdefault(columns, []).append(list(fields.values()) + [update["id"]])
+        for columns, rows in groups.items():
+            sets = ", ".join(f"{k} = ?" for k in columns)
+            await self._db.executemany(
+                f"UPDATE curation_candidates SET {sets} WHERE id = ?", rows
+            )
+        await self._db.commit()
+
+    async def get_curation_queue(self, limit: int = 50, recent: int = 0) -> list[dict]:
+        """Get candidates awaiting evaluation, best keyword score first.
+
+        That's every 'new' candidate plus eval_failed ones whose retry time
+        has come. Rejected, duplicate and exhausted rows are never loaded.
+        The newest ``recent`` queued rows are included as well, after the
+        top ``limit`` by score, so a fresh candidate with a modest score
+        still reaches the scheduler's freshness ranking.
+        """
+        queued = """SELECT * FROM curation_candidates
+               WHERE status = 'new'
+                  OR (status = 'eval_failed' AND next_attempt_at <= ?)"""
+        now = _now()
+        cursor = await self._db.execute(
+            f"{queued} ORDER BY keyword_score DESC, created_at DESC LIMIT ?", (now, limit),
+        )
+        rows = [dict(row) for row in await cursor.fetchall()]
+        if recent:
+            seen = {row["id"] for row in rows}
+            cursor = await self._db.execute(
+                f"{queued} ORDER BY created_at DESC LIMIT ?", (now, recent),
+            )
+            rows += [dict(row) for row in await cursor.fetchall() if row["id"] not in seen]
+        return rows
+
     async def get_approved_curations(self, limit: int = 5) -> list[dict]:
         """Get approved curations ready to post."""
         cursor = await self._db.execute(
@@ -3,11 +3,12 @@
 import asyncio
 import logging
 import signal
+import time
 from zoneinfo import ZoneInfo
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-
+from worker import metrics, tracing
 from worker.config import Config
+from worker.coordinator import AdaptiveInterval, JobCoordinator
 from worker.runner import WorkerRunner
 
 logging.basicConfig(
@@ -19,6 +20,33 @@ logger = logging.getLogger(__name__)
 ET = ZoneInfo("America/New_York")
 
 
+# Shared resources each job holds while it runs; jobs that share one
+# never overlap. The action session holds none for the whole run: it
+# waits hours on approvals, so the runner takes twitter, bluesky and
+# claude_cli only around each post, engagement and generation call.
+MONITOR_RESOURCES = ("twitter", "bluesky", "browser")
+CURATION_RESOURCES = ("claude_cli",)
+ACTION_RESOURCES = ()
+DISCOVERY_RESOURCES = ("twitter", "bluesky")
+
+# Adaptive intervals range from half to three times the configured one.
+# Triggers tick at the minimum; the coordinator skips ticks until due.
+ADAPTIVE_MIN_FACTOR = 0.5
+ADAPTIVE_MAX_FACTOR = 3.0
+
+MONITOR_INTERVAL_MINUTES = 45
+MONITOR_TICK_MINUTES = 15
+
+
+def _adaptive(base_seconds: float, busy_threshold: int, minimum: float | None = None):
+    return AdaptiveInterval(
+        base=base_seconds,
+        minimum=minimum if minimum is not None else base_seconds * ADAPTIVE_MIN_FACTOR,
+        maximum=base_seconds * ADAPTIVE_MAX_FACTOR,
+        busy_threshold=busy_threshold,
+    )
+
+
 def _install_shutdown_handlers(
     loop: asyncio.AbstractEventLoop,
     shutdown_requested: asyncio.Event,
@@ -35,25 +63,48 @@ def _install_shutdown_handlers(
 
 
 async def main():
+    started = time.perf_counter()
     config = Config.from_pass()
-    runner = WorkerRunner(config)
+    logger.info("config resolved in %.2fs", time.perf_counter() - started)
+    tracing.configure(config.trace_path)
+    coordinator = JobCoordinator()
+    runner = WorkerRunner(config, coordinator=coordinator)
     await runner.start()
 
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
     scheduler = AsyncIOScheduler(timezone=ET)
 
-    # Monitor scan: every 45 minutes during business hours (9am-9pm ET, weekdays)
+    curation_hours = config.curation.scan_interval_hours
+    twitch_hours = config.curation.twitch_scan_interval_hours
+
+    # Monitor scan: about every 45 minutes during business hours (9am-9pm
+    # ET, weekdays), stretched when scans come back empty
     scheduler.add_job(
-        runner.run_monitor_scan,
+        coordinator.scheduled(
+            "monitor_scan",
+            runner.run_monitor_scan,
+            resources=MONITOR_RESOURCES,
+            interval=_adaptive(
+                MONITOR_INTERVAL_MINUTES * 60,
+                busy_threshold=5,
+                minimum=MONITOR_TICK_MINUTES * 60,
+            ),
+        ),
         "cron",
         day_of_week="mon-fri",
         hour="9-20",
-        minute="*/45",
+        minute=f"*/{MONITOR_TICK_MINUTES}",
         id="monitor_scan",
     )
 
     # Action session: once per evening at 7pm ET
     scheduler.add_job(
-        runner.run_action_session,
+        coordinator.scheduled(
+            "action_session",
+            runner.run_action_session,
+            resources=ACTION_RESOURCES,
+        ),
         "cron",
         day_of_week="mon-fri",
         hour=19,
@@ -61,25 +112,41 @@ async def main():
         id="action_session",
     )
 
-    # Curation scan: YouTube + News every 6 hours
+    # Curation scans (YouTube + News, and with Twitch) share one lane: a
+    # scan requested while another is running merges into it
     scheduler.add_job(
-        runner.run_curation_scan,
+        coordinator.scheduled(
+            "curation_scan",
+            runner.run_curation_scan,
+            resources=CURATION_RESOURCES,
+            coalesce_key="curation",
+            interval=_adaptive(curation_hours * 3600, busy_threshold=10),
+        ),
         "interval",
-        hours=config.curation.scan_interval_hours,
+        hours=curation_hours * ADAPTIVE_MIN_FACTOR,
         id="curation_scan",
     )
-
-    # Curation scan with Twitch: every 8 hours
     scheduler.add_job(
-        lambda: runner.run_curation_scan(include_twitch=True),
+        coordinator.scheduled(
+            "curation_scan_twitch",
+            runner.run_curation_scan,
+            resources=CURATION_RESOURCES,
+            coalesce_key="curation",
+            interval=_adaptive(twitch_hours * 3600, busy_threshold=10),
+            include_twitch=True,
+        ),
         "interval",
-        hours=config.curation.twitch_scan_interval_hours,
+        hours=twitch_hours * ADAPTIVE_MIN_FACTOR,
         id="curation_scan_twitch",
     )
 
     # On-platform discovery: daily at 5pm ET (before action session at 7pm)
     scheduler.add_job(
-        runner.run_discovery_scan,
+        coordinator.scheduled(
+            "discovery_scan",
+            runner.run_discovery_scan,
+            resources=DISCOVERY_RESOURCES,
+        ),
         "cron",
         day_of_week="mon-fri",
         hour=17,
@@ -90,6 +157,13 @@ async def main():
 
     scheduler.start()
 
+    metrics_server = None
+    if config.metrics_port:
+        try:
+            metrics_server = await metrics.serve(port=config.metrics_port)
+        except OSError as e:
+            logger.warning("metrics endpoint unavailable: %s", e)
+
     # Start Redis listener for approval decisions
     listener_task = asyncio.create_task(runner.listen_for_decisions())
 
@@ -107,7 +181,10 @@ async def main():
         listener_task.cancel()
         scheduler.shutdown()
         await asyncio.gather(listener_task, return_exceptions=True)
+        if metrics_server:
+            metrics_server.close()
         await runner.stop()
+        await asyncio.to_thread(tracing.flush)
         for signum in installed_handlers:
             loop.remove_signal_handler(signum)
 
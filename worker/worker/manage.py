@@ -7,6 +7,7 @@ import asyncio
 import json
 import logging
 import sys
+from dataclasses import replace
 
 logging.basicConfig(
     level=logging.INFO,
@@ -378,7 +379,8 @@ async def scan_feeds_cmd(config, query=None, platform=None, subreddit=None,
         log.error("social-scroller is disabled in config")
         return
 
-    client = SocialScrollerClient(config.social_scroller)
+    # One-shot command: a serve session would outlive its only job
+    client = SocialScrollerClient(replace(config.social_scroller, daemon=False))
 
     if strategy:
         log.info("running platform-specific search strategies...")
@@ -437,6 +439,74 @@ async def scan_feeds_cmd(config, query=None, platform=None, subreddit=None,
         await db.close()
 
 
+def slow_spans(config, runs=10, top=15, job=None):
+    """Summarize the slowest spans across the last N traced job runs."""
+    from datetime import datetime, timezone
+    from worker.tracing import load_spans, slowest_spans
+
+    if not config.trace_path:
+        log.error("tracing is disabled in config (trace_path is empty)")
+        return
+
+    run_rows, spans = slowest_spans(
+        load_spans(config.trace_path), runs=runs, top=top, job=job,
+    )
+    if not run_rows:
+        log.info("no traced runs in %s", config.trace_path)
+        return
+
+    log.info("=== Last %d run(s) ===", len(run_rows))
+    for r in run_rows:
+        started = datetime.fromtimestamp(r["start"] / 1e9, tz=timezone.utc)
+        log.info(
+            "  %s | %-22s | %9.1f ms",
+            started.strftime("%Y-%m-%d %H:%M:%S"),
+            r["job"],
+            r["duration_ms"],
+        )
+
+    log.info("=== Slowest %d span(s) ===", len(spans))
+    for s in spans:
+        attrs = " ".join(f"{k}={v}" for k, v in s["attributes"].items())
+        log.info(
+            "  %9.1f ms | %-22s | %s %s",
+            s["duration_ms"],
+            s["job"],
+            s["name"],
+            attrs,
+        )
+
+
+async def startup_bench(config, config_seconds: float):
+    """Report cold import time per module and init time per worker component."""
+    import subprocess
+    from worker.runner import WorkerRunner
+    from worker.startup import BENCH_MODULES, format_report, probe_import
+
+    rows = []
+    for module in BENCH_MODULES:
+        try:
+            seconds, _ = probe_import(module)
+        except subprocess.CalledProcessError as e:
+            log.warning("import %s failed: %s", module, e.stderr.strip()[-200:])
+            continue
+        rows.append(("import", module, seconds))
+
+    rows.append(("init", "config (pass)", config_seconds))
+    runner = WorkerRunner(config)
+    try:
+        await runner.start()
+        rows.extend(("init", name, seconds) for name, seconds in runner.startup_timings.items())
+    finally:
+        await runner.stop()
+
+    log.info("=== Startup benchmark ===")
+    for line in format_report(rows):
+        log.info("  %s", line)
+    total = config_seconds + sum(runner.startup_timings.values())
+    log.info("init total: %.1f ms", total * 1000)
+
+
 def main():
     parser = argparse.ArgumentParser(description="keyjawn-worker management commands")
     sub = parser.add_subparsers(dest="command")
@@ -460,15 +530,27 @@ def main():
     p_scan.add_argument("--strategy", action="store_true",
                         help="Run full platform-specific search strategies")
 
+    sub.add_parser("startup-bench", help="Time module imports and worker startup per component")
+
+    p_spans = sub.add_parser("slow-spans", help="Show the slowest traced spans of recent job runs")
+    p_spans.add_argument("--runs", "-n", type=int, default=10,
+                         help="Number of most recent runs to look at")
+    p_spans.add_argument("--top", "-t", type=int, default=15,
+                         help="Number of spans to list")
+    p_spans.add_argument("--job", "-j", help="Only runs of this job (e.g. monitor_scan)")
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
 
+    import time
     from worker.config import Config
 
+    started = time.perf_counter()
     config = Config.from_pass()
+    config_seconds = time.perf_counter() - started
 
     if args.command == "smoke-test":
         success = asyncio.run(smoke_test(config))
@@ -499,6 +581,10 @@ def main():
             subreddit=getattr(args, "subreddit", None),
             strategy=getattr(args, "strategy", False),
         ))
+    elif args.command == "startup-bench":
+        asyncio.run(startup_bench(config, config_seconds))
+    elif args.command == "slow-spans":
+        slow_spans(config, runs=args.runs, top=args.top, job=args.job)
 
 
 if __name__ == "__main__":
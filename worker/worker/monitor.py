@@ -3,13 +3,31 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import AsyncIterable
 from typing import Optional
 
+from worker import metrics, tracing
 from worker.config import Config
 from worker.db import Database
 
 log = logging.getLogger(__name__)
 
+SOURCE_SECONDS = metrics.histogram(
+    "keyjawn_monitor_source_seconds",
+    "Time spent scanning one source during a monitor scan",
+    ["source"],
+)
+SOURCE_POSTS = metrics.counter(
+    "keyjawn_monitor_source_posts_total",
+    "Posts returned by each monitor source",
+    ["source"],
+)
+SOURCE_ERRORS = metrics.counter(
+    "keyjawn_monitor_source_errors_total",
+    "Monitor source scans that raised",
+    ["source"],
+)
+
 HIGH_SIGNAL = [
     "keyboard for ssh",
     "keyboard for cli",
@@ -78,6 +96,30 @@ class Monitor:
 
         return score
 
+    async def _queue_finding(self, f: dict) -> bool:
+        """Queue one finding if it's relevant and new. Returns whether it was queued."""
+        url = f["url"]
+        text = f["text"]
+        author = f["author"]
+        platform = f["platform"]
+
+        score = self.score_relevance(text, platform)
+        if score < 0.3:
+            return False
+
+        # Dedup: skip if the canonical source_url already exists
+        if await self.db.finding_exists(url):
+            return False
+
+        await self.db.queue_finding(
+            platform=platform,
+            source_url=url,
+            source_user=author,
+            content=text,
+            relevance_score=score,
+        )
+        return True
+
     async def queue_new_findings(self, findings: list[dict]) -> int:
         """Deduplicate and queue findings above the relevance threshold.
 
@@ -86,33 +128,22 @@ class Monitor:
         """
         queued = 0
         for f in findings:
-            url = f["url"]
-            text = f["text"]
-            author = f["author"]
-            platform = f["platform"]
-
-            # Dedup: skip if source_url already exists
-            cursor = await self.db._db.execute(
-                "SELECT 1 FROM findings WHERE source_url = ?", (url,)
-            )
-            if await cursor.fetchone():
-                continue
-
-            score = self.score_relevance(text, platform)
-            if score < 0.3:
-                continue
-
-            await self.db.queue_finding(
-                platform=platform,
-                source_url=url,
-                source_user=author,
-                content=text,
-                relevance_score=score,
-            )
-            queued += 1
-
+            if await self._queue_finding(f):
+                queued += 1
         return queued
 
+    async def queue_finding_stream(self, findings: AsyncIterable[dict]) -> tuple[int, int]:
+        """Score, dedup and queue findings as a stream produces them.
+
+        Returns (seen, queued).
+        """
+        seen = queued = 0
+        async for f in findings:
+            seen += 1
+            if await self._queue_finding(f):
+                queued += 1
+        return seen, queued
+
     async def scan_all_platforms(
         self, twitter_client, bluesky_client, producthunt_client=None,
         social_scroller_client=None,
@@ -125,41 +156,63 @@ class Monitor:
         Returns total count of newly queued findings.
         """
         all_findings = []
+        queued = 0
 
         # --- API client searches ---
 
         # Search Twitter for all high-signal keywords
+        before = len(all_findings)
         try:
-            for keyword in HIGH_SIGNAL:
-                results = await twitter_client.search(keyword)
-                for r in results:
-                    all_findings.append({
-                        "url": r.get("url", ""),
-                        "text": r.get("text", ""),
-                        "author": r.get("author", ""),
-                        "platform": "twitter",
-                    })
+            with (
+                SOURCE_SECONDS.labels("twitter").time(),
+                tracing.span("source", source="twitter"),
+            ):
+                for keyword in HIGH_SIGNAL:
+                    with tracing.leaf("request", query=keyword):
+                        results = await twitter_client.search(keyword)
+                    for r in results:
+                        all_findings.append({
+                            "url": r.get("url", ""),
+                            "text": r.get("text", ""),
+                            "author": r.get("author", ""),
+                            "platform": "twitter",
+                        })
         except Exception:
+            SOURCE_ERRORS.labels("twitter").inc()
             log.exception("twitter search failed")
+        SOURCE_POSTS.labels("twitter").inc(len(all_findings) - before)
 
         # Search Bluesky for first 3 keywords
+        before = len(all_findings)
         try:
-            for keyword in HIGH_SIGNAL[:3]:
-                results = await bluesky_client.search(keyword)
-                for r in results:
-                    all_findings.append({
-                        "url": r.get("url", ""),
-                        "text": r.get("text", ""),
-                        "author": r.get("author", ""),
-                        "platform": "bluesky",
-                    })
+            with (
+                SOURCE_SECONDS.labels("bluesky").time(),
+                tracing.span("source", source="bluesky"),
+            ):
+                for keyword in HIGH_SIGNAL[:3]:
+                    with tracing.leaf("request", query=keyword):
+                        results = await bluesky_client.search(keyword)
+                    for r in results:
+                        all_findings.append({
+                            "url": r.get("url", ""),
+                            "text": r.get("text", ""),
+                            "author": r.get("author", ""),
+                            "platform": "bluesky",
+                        })
         except Exception:
+            SOURCE_ERRORS.labels("bluesky").inc()
             log.exception("bluesky search failed")
+        SOURCE_POSTS.labels("bluesky").inc(len(all_findings) - before)
 
         # Scan Product Hunt for relevant launches
         if producthunt_client:
+            before = len(all_findings)
             try:
-                launches = await producthunt_client.find_relevant_launches()
+                with (
+                    SOURCE_SECONDS.labels("producthunt").time(),
+                    tracing.span("source", source="producthunt"),
+                ):
+                    launches = await producthunt_client.find_relevant_launches()
                 for launch in launches:
                     all_findings.append({
                         "url": launch.get("url", ""),
@@ -168,33 +221,49 @@ class Monitor:
                         "platform": "producthunt",
                     })
             except Exception:
+                SOURCE_ERRORS.labels("producthunt").inc()
                 log.exception("producthunt scan failed")
+            SOURCE_POSTS.labels("producthunt").inc(len(all_findings) - before)
 
         # --- Browser-based scanning via social-scroller ---
 
         if social_scroller_client:
             # Targeted keyword searches with platform-specific strategies
+            # Queue each search's posts as it finishes so a slow platform
+            # doesn't hold back the rest (searches share tabs on the serve
+            # session; one-shot launches take turns)
+            strategy_posts = 0
             try:
-                strategy_results = await social_scroller_client.search_with_strategy()
-                all_findings.extend(strategy_results)
-                log.info(
-                    "social-scroller strategy search: %d posts",
-                    len(strategy_results),
-                )
+                with (
+                    SOURCE_SECONDS.labels("scroller_strategy").time(),
+                    tracing.span("source", source="scroller_strategy"),
+                ):
+                    async for _, results in social_scroller_client.iter_strategy():
+                        strategy_posts += len(results)
+                        queued += await self.queue_new_findings(results)
             except Exception:
+                SOURCE_ERRORS.labels("scroller_strategy").inc()
                 log.exception("social-scroller strategy search failed")
+            SOURCE_POSTS.labels("scroller_strategy").inc(strategy_posts)
+            log.info("social-scroller strategy search: %d posts", strategy_posts)
 
-            # Passive feed scan — scroll open tabs and extract posts
+            # Passive feed scan — scroll open tabs and queue posts as
+            # they're extracted
             try:
-                feed_posts = await social_scroller_client.scan_feeds()
-                all_findings.extend(feed_posts)
-                log.info(
-                    "social-scroller feed scan: %d posts extracted",
-                    len(feed_posts),
-                )
+                with (
+                    SOURCE_SECONDS.labels("scroller_feeds").time(),
+                    tracing.span("source", source="scroller_feeds"),
+                ):
+                    seen, feed_queued = await self.queue_finding_stream(
+                        social_scroller_client.iter_feeds()
+                    )
+                queued += feed_queued
+                SOURCE_POSTS.labels("scroller_feeds").inc(seen)
+                log.info("social-scroller feed scan: %d posts extracted", seen)
             except Exception:
+                SOURCE_ERRORS.labels("scroller_feeds").inc()
                 log.exception("social-scroller feed scan failed")
 
-        count = await self.queue_new_findings(all_findings)
+        count = queued + await self.queue_new_findings(all_findings)
         log.info("scan complete: %d findings queued from %d candidates", count, len(all_findings))
         return count
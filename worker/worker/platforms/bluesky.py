@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
-
-from atproto import Client
+from typing import TYPE_CHECKING, Optional
 
 from worker.config import BlueskyConfig
 
+if TYPE_CHECKING:
+    from atproto import Client
+
 log = logging.getLogger(__name__)
 
 SEARCH_KEYWORDS = [
@@ -31,6 +32,9 @@ class BlueskyClient:
     @property
     def client(self) -> Client:
         if self._client is None:
+            # atproto pulls in its whole lexicon; import on first use
+            from atproto import Client
+
             self._client = Client()
             self._client.login(
                 self.config.handle, self.config.app_password
@@ -2,15 +2,66 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import time
+from dataclasses import dataclass, field
 from typing import Optional
 
 import httpx
 
+from worker import tracing
+
 log = logging.getLogger(__name__)
 
 API_URL = "https://api.producthunt.com/v2/api/graphql"
 
+# The daily ranking barely moves within an hour, and the monitor scans
+# every 45 minutes, so one fetch per hour is plenty.
+RANKING_TTL_SECONDS = 3600
+DEFAULT_TTL_SECONDS = 600
+
+# Product Hunt meters complexity points per 15-minute window and reports
+# what's left in these headers. Below the floor we stop sending queries
+# and serve cached data until the window resets.
+RATE_LIMIT_REMAINING_HEADER = "X-Rate-Limit-Remaining"
+RATE_LIMIT_RESET_HEADER = "X-Rate-Limit-Reset"
+RATE_LIMIT_FLOOR = 100
+RATE_LIMIT_DEFAULT_RESET_SECONDS = 900
+
+POST_LIST_FIELDS = """
+    edges {
+        node {
+            id
+            name
+            tagline
+            url
+            votesCount
+            commentsCount
+            website
+            topics {
+                edges {
+                    node {
+                        slug
+                    }
+                }
+            }
+        }
+    }
+"""
+
+POST_DETAIL_FIELDS = """
+    id
+    name
+    tagline
+    url
+    votesCount
+    commentsCount
+    reviewsCount
+    website
+    createdAt
+"""
+
 # Topics to monitor for relevant launches
 MONITOR_TOPICS = [
     "developer-tools",
@@ -35,6 +86,46 @@ RELEVANCE_KEYWORDS = [
 ]
 
 
+@dataclass(frozen=True)
+class GraphQLField:
+    """One root field of a GraphQL query, e.g. ``post(id: $id) { ... }``.
+
+    ``args`` maps argument name to (GraphQL type, value). Literal arguments
+    that aren't variables (enums like ``order: RANKING``) go in ``literals``.
+    """
+
+    name: str
+    selection: str
+    args: dict = field(default_factory=dict)
+    literals: str = ""
+
+    def cache_key(self) -> str:
+        values = {k: v for k, (_, v) in sorted(self.args.items())}
+        return json.dumps([self.name, self.literals, values, self.selection], sort_keys=True)
+
+
+def build_batch_query(fields: dict[str, GraphQLField]) -> tuple[str, dict]:
+    """Merge fields into one aliased query document.
+
+    Each field's variables are prefixed with its alias so two fields can
+    take the same argument with different values.
+    """
+    var_defs = []
+    variables = {}
+    selections = []
+    for alias, f in fields.items():
+        call_args = [f.literals] if f.literals else []
+        for arg, (gql_type, value) in f.args.items():
+            var = f"{alias}_{arg}"
+            var_defs.append(f"${var}: {gql_type}")
+            variables[var] = value
+            call_args.append(f"{arg}: ${var}")
+        call = f"({', '.join(call_args)})" if call_args else ""
+        selections.append(f"{alias}: {f.name}{call} {{{f.selection}}}")
+    header = f"query({', '.join(var_defs)})" if var_defs else "query"
+    return f"{header} {{\n" + "\n".join(selections) + "\n}", variables
+
+
 class ProductHuntClient:
     def __init__(self, developer_token: str):
         self.token = developer_token
@@ -43,63 +134,110 @@ class ProductHuntClient:
             "Content-Type": "application/json",
             "Accept": "application/json",
         }
+        self._cache: dict[str, tuple[float, dict]] = {}
+        self._blocked_until = 0.0
+        self.requests_sent = 0
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(event_hooks=tracing.httpx_event_hooks())
+
+    def _note_rate_limit(self, resp: httpx.Response) -> None:
+        """Pause queries when the complexity budget is nearly spent."""
+        remaining = resp.headers.get(RATE_LIMIT_REMAINING_HEADER)
+        reset = resp.headers.get(RATE_LIMIT_RESET_HEADER)
+        try:
+            reset_seconds = float(reset) if reset else RATE_LIMIT_DEFAULT_RESET_SECONDS
+        except ValueError:
+            reset_seconds = RATE_LIMIT_DEFAULT_RESET_SECONDS
+
+        if resp.status_code == 429:
+            self._blocked_until = time.monotonic() + reset_seconds
+        elif remaining is not None:
+            try:
+                left = int(remaining)
+            except ValueError:
+                return
+            if left < RATE_LIMIT_FLOOR:
+                self._blocked_until = time.monotonic() + reset_seconds
+        if self._blocked_until > time.monotonic():
+            log.warning("PH rate limit nearly spent, pausing queries for %.0fs", reset_seconds)
 
     async def _query(self, query: str, variables: dict = None) -> Optional[dict]:
         """Execute a GraphQL query against the Product Hunt API."""
+        if time.monotonic() < self._blocked_until:
+            log.info("PH query skipped: waiting for rate limit reset")
+            return None
+
         payload = {"query": query}
         if variables:
             payload["variables"] = variables
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
+                self.requests_sent += 1
                 resp = await client.post(
                     API_URL, json=payload, headers=self._headers, timeout=15
                 )
+                self._note_rate_limit(resp)
                 if resp.status_code != 200:
                     log.error("PH API error (%d): %s", resp.status_code, resp.text[:200])
                     return None
                 data = resp.json()
                 if "errors" in data:
                     log.error("PH GraphQL errors: %s", data["errors"])
-                    return None
+                    if not data.get("data"):
+                        return None
                 return data.get("data")
         except Exception:
             log.exception("PH API request failed")
             return None
 
-    async def get_today_posts(self, limit: int = 20) -> list[dict]:
-        """Get today's featured posts on Product Hunt."""
-        query = """
-        query {
-            posts(order: RANKING, first: %d) {
-                edges {
-                    node {
-                        id
-                        name
-                        tagline
-                        url
-                        votesCount
-                        commentsCount
-                        website
-                        topics {
-                            edges {
-                                node {
-                                    slug
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
-        """ % limit
+    async def fetch(
+        self,
+        fields: dict[str, GraphQLField],
+        ttl: float = DEFAULT_TTL_SECONDS,
+    ) -> dict[str, Optional[dict]]:
+        """Resolve several root fields, sending only uncached ones in one request.
 
-        data = await self._query(query)
-        if not data:
-            return []
+        Returns {alias: field result}. Results are cached per field for
+        ``ttl`` seconds; a field that fails comes back as None.
+        """
+        now = time.monotonic()
+        results: dict[str, Optional[dict]] = {}
+        missing: dict[str, GraphQLField] = {}
+        for alias, f in fields.items():
+            cached = self._cache.get(f.cache_key())
+            if cached and cached[0] > now:
+                results[alias] = cached[1]
+            else:
+                missing[alias] = f
+
+        if missing:
+            query, variables = build_batch_query(missing)
+            data = await self._query(query, variables) or {}
+            expires = time.monotonic() + ttl
+            for alias, f in missing.items():
+                value = data.get(alias)
+                if value is not None:
+                    self._cache[f.cache_key()] = (expires, value)
+                results[alias] = value
+        return results
+
+    @staticmethod
+    def _posts_field(limit: int, topic: Optional[str] = None) -> GraphQLField:
+        args = {"topic": ("String!", topic)} if topic else {}
+        return GraphQLField(
+            "posts", POST_LIST_FIELDS, args=args, literals=f"order: RANKING, first: {limit}",
+        )
 
+    @staticmethod
+    def _post_field(post_id: str) -> GraphQLField:
+        return GraphQLField("post", POST_DETAIL_FIELDS, args={"id": ("ID!", post_id)})
+
+    @staticmethod
+    def _parse_post_list(data: Optional[dict]) -> list[dict]:
         posts = []
-        for edge in data.get("posts", {}).get("edges", []):
+        for edge in (data or {}).get("edges", []):
             node = edge["node"]
             topics = [
                 t["node"]["slug"]
@@ -111,71 +249,16 @@ class ProductHuntClient:
                 "tagline": node["tagline"],
                 "url": node["url"],
                 "votes": node["votesCount"],
-                "comments": node["commentsCount"],
+                "comments": node.get("commentsCount", 0),
                 "website": node.get("website", ""),
                 "topics": topics,
             })
-
         return posts
 
-    async def search_posts(self, query: str, limit: int = 10) -> list[dict]:
-        """Search Product Hunt posts by keyword."""
-        gql = """
-        query($query: String!) {
-            posts(order: RANKING, first: %d, topic: $query) {
-                edges {
-                    node {
-                        id
-                        name
-                        tagline
-                        url
-                        votesCount
-                        website
-                    }
-                }
-            }
-        }
-        """ % limit
-
-        data = await self._query(gql, {"query": query})
-        if not data:
-            return []
-
-        return [
-            {
-                "id": edge["node"]["id"],
-                "name": edge["node"]["name"],
-                "tagline": edge["node"]["tagline"],
-                "url": edge["node"]["url"],
-                "votes": edge["node"]["votesCount"],
-                "website": edge["node"].get("website", ""),
-            }
-            for edge in data.get("posts", {}).get("edges", [])
-        ]
-
-    async def get_post_details(self, post_id: str) -> Optional[dict]:
-        """Get details about a specific post (useful for tracking our own launch)."""
-        query = """
-        query($id: ID!) {
-            post(id: $id) {
-                id
-                name
-                tagline
-                url
-                votesCount
-                commentsCount
-                reviewsCount
-                website
-                createdAt
-            }
-        }
-        """
-
-        data = await self._query(query, {"id": post_id})
-        if not data or not data.get("post"):
+    @staticmethod
+    def _parse_post_detail(node: Optional[dict]) -> Optional[dict]:
+        if not node:
             return None
-
-        node = data["post"]
         return {
             "id": node["id"],
             "name": node["name"],
@@ -188,6 +271,33 @@ class ProductHuntClient:
             "created_at": node.get("createdAt", ""),
         }
 
+    async def get_today_posts(self, limit: int = 20) -> list[dict]:
+        """Get today's featured posts on Product Hunt."""
+        result = await self.fetch({"posts": self._posts_field(limit)}, ttl=RANKING_TTL_SECONDS)
+        return self._parse_post_list(result["posts"])
+
+    async def search_posts(self, query: str, limit: int = 10) -> list[dict]:
+        """Search Product Hunt posts by keyword."""
+        result = await self.fetch({"posts": self._posts_field(limit, topic=query)})
+        return self._parse_post_list(result["posts"])
+
+    async def search_topics(self, topics: list[str], limit: int = 10) -> dict[str, list[dict]]:
+        """Search several topics in a single request."""
+        fields = {f"t{i}": self._posts_field(limit, topic=t) for i, t in enumerate(topics)}
+        result = await self.fetch(fields)
+        return {t: self._parse_post_list(result[f"t{i}"]) for i, t in enumerate(topics)}
+
+    async def get_post_details(self, post_id: str) -> Optional[dict]:
+        """Get details about a specific post (useful for tracking our own launch)."""
+        result = await self.fetch({"post": self._post_field(post_id)})
+        return self._parse_post_detail(result["post"])
+
+    async def get_posts_details(self, post_ids: list[str]) -> dict[str, Optional[dict]]:
+        """Get details for several posts in a single request."""
+        fields = {f"p{i}": self._post_field(pid) for i, pid in enumerate(post_ids)}
+        result = await self.fetch(fields)
+        return {pid: self._parse_post_detail(result[f"p{i}"]) for i, pid in enumerate(post_ids)}
+
     def score_relevance(self, post: dict) -> float:
         """Score a Product Hunt post for relevance to KeyJawn's audience."""
         text = f"{post.get('name', '')} {post.get('tagline', '')}".lower()
@@ -6,18 +6,564 @@ the CDP browser live) and parses JSON output into findings for the monitor.
 Two capabilities:
   1. search(query, platform) — keyword search on a specific platform
   2. scan_feeds(platforms) — scroll open feed tabs and extract visible posts
+
+Each job is one social-scroller.py launch. The deployed script has no
+`serve` command yet, so the long-lived session (ScrollerDaemon) is off by
+default; KEYJAWN_SCROLLER_DAEMON=1 turns it on once the script speaks the
+protocol. With it on, the client keeps one `social-scroller.py serve`
+session alive and sends it jobs as newline-delimited JSON-RPC 2.0 over
+stdin/stdout, so the process launch and CDP attach happen once per worker
+rather than once per query. If the session can't be started, jobs fall
+back to one launch each.
+
+When ssh_host is set, every command rides a multiplexed SSH connection
+(ControlMaster) that the worker keeps open for its lifetime, so only the
+first command pays for the SSH handshake and auth.
+
+Output is parsed as it arrives (PostStreamParser), from either the
+script's JSON array or NDJSON, so a long scroll never has to sit in
+memory as one big buffer.
 """
 
 from __future__ import annotations
 
+import asyncio
+import codecs
+import hashlib
 import json
 import logging
+import os
+import shlex
+import stat
+import time
+from collections.abc import AsyncIterator
 
 from worker.config import SocialScrollerConfig
-from worker.subprocesses import SubprocessOwner
+from worker.subprocesses import ManagedProcess, SubprocessOwner
 
 log = logging.getLogger(__name__)
 
+# Global flags (--json, --no-screenshots, -d) must come BEFORE subcommand
+GLOBAL_FLAGS = "--json --no-screenshots --no-all-captures"
+
+# Page load + extraction overhead on top of the scroll time of each job
+JOB_OVERHEAD_SECONDS = 60
+
+# After the session fails to start, use per-query launches for this long
+# before trying the session again.
+DAEMON_RETRY_SECONDS = 600
+
+# A single JSON-RPC reply can carry a few hundred posts
+DAEMON_STREAM_LIMIT = 16 * 1024 * 1024
+
+# Streamed posts buffered per call. The session reader never waits on a
+# consumer, so past this many unread posts a call's new posts are
+# dropped (and counted) rather than stalling replies to other calls.
+STREAM_QUEUE_SIZE = 1024
+
+READ_CHUNK_BYTES = 64 * 1024
+MAX_POST_BYTES = 1024 * 1024
+
+# How long to wait for a new SSH master to accept connections, and how
+# long to wait after a failed start before trying again.
+SSH_MASTER_START_TIMEOUT = 20
+SSH_MASTER_RETRY_SECONDS = 60
+
+SSH_OPTIONS = (
+    "-o", "BatchMode=yes",
+    "-o", "ServerAliveInterval=30",
+    "-o", "ServerAliveCountMax=3",
+)
+
+
+def _default_control_dir() -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "keyjawn-ssh")
+    return os.path.join(os.path.expanduser("~"), ".ssh", "keyjawn-cm")
+
+
+def _private_dir(path: str) -> bool:
+    """Create path as a 0700 directory, or check that an existing one is ours.
+
+    ssh doesn't check who owns a control socket, so whoever can create
+    the socket first sees every command sent over it. Returns False for
+    a directory owned by another user, or anything that isn't a plain
+    directory.
+    """
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        st = os.lstat(path)
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid():
+            log.error("not using ssh control dir %s: not a directory owned by this user", path)
+            return False
+        if stat.S_IMODE(st.st_mode) & 0o077:
+            os.chmod(path, 0o700)
+    except OSError as exc:
+        log.error("not using ssh control dir %s: %s", path, exc)
+        return False
+    return True
+
+
+class SSHConnectionManager:
+    """A multiplexed SSH master for one host, owned by the worker.
+
+    The master runs as `ssh -M -N` under SubprocessOwner, so worker
+    shutdown closes it. Commands go out as `ssh -S <socket>` and open a
+    channel on the master instead of a new connection. If the master is
+    down, the same command still works: ssh connects directly when the
+    control socket is missing.
+
+    The socket lives in a private 0700 directory ($XDG_RUNTIME_DIR, or
+    ~/.ssh/keyjawn-cm). If that directory isn't ours, the master is not
+    started and commands connect directly.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        subprocesses: SubprocessOwner,
+        ssh_binary: str = "ssh",
+        control_dir: str | None = None,
+    ):
+        self.host = host
+        self.subprocesses = subprocesses
+        self.ssh_binary = ssh_binary
+        digest = hashlib.sha1(host.encode()).hexdigest()[:12]
+        # Unix socket paths are capped near 100 bytes, so keep this short
+        self.control_path = os.path.join(
+            control_dir or _default_control_dir(), f"keyjawn-ssh-{digest}",
+        )
+        # Only pass -S once the socket's directory has been checked
+        self._control_ok = False
+        self._master: ManagedProcess | None = None
+        self._lock = asyncio.Lock()
+        self._retry_at = 0.0
+        self.starts = 0
+
+    @property
+    def alive(self) -> bool:
+        return self._master is not None and self._master.running
+
+    def command(self, cmd: str, session: bool = False) -> str:
+        """Shell command line that runs cmd on the host over the master."""
+        parts = [self.ssh_binary]
+        if self._control_ok:
+            parts += ["-S", self.control_path, "-o", "ControlMaster=no"]
+        if session:
+            parts.append("-T")
+        # Use double quotes for SSH wrapper so inner single quotes (from
+        # _shell_quote) pass through correctly
+        return f'{shlex.join(parts)} {shlex.quote(self.host)} "{cmd}"'
+
+    async def _check(self) -> bool:
+        result = await self.subprocesses.run_exec(
+            self.ssh_binary, "-S", self.control_path, "-O", "check", self.host,
+            timeout=10,
+        )
+        return result.returncode == 0
+
+    async def ensure_master(self) -> bool:
+        """Start the master if it isn't running. Returns whether it's up."""
+        async with self._lock:
+            if self.alive:
+                return True
+            if self._master is not None:
+                log.warning("ssh master for %s exited, reconnecting", self.host)
+                await self._stop("master exited")
+            if time.monotonic() < self._retry_at:
+                return False
+
+            self._control_ok = _private_dir(os.path.dirname(self.control_path))
+            if not self._control_ok:
+                self._retry_at = time.monotonic() + SSH_MASTER_RETRY_SECONDS
+                return False
+
+            self.starts += 1
+            try:
+                # A socket left by a crashed worker would stop ssh -M from
+                # listening on it
+                if os.path.exists(self.control_path) and not await self._check():
+                    os.unlink(self.control_path)
+                self._master = await self.subprocesses.start_shell(shlex.join([
+                    self.ssh_binary, "-M", "-N",
+                    "-S", self.control_path,
+                    "-o", "ControlPersist=no",
+                    *SSH_OPTIONS,
+                    self.host,
+                ]))
+                deadline = time.monotonic() + SSH_MASTER_START_TIMEOUT
+                while self.alive and time.monotonic() < deadline:
+                    if await self._check():
+                        log.info("ssh master for %s ready", self.host)
+                        return True
+                    await asyncio.sleep(0.2)
+            except Exception:
+                log.exception("ssh master for %s failed to start", self.host)
+            await self._stop("master failed to start")
+            self._retry_at = time.monotonic() + SSH_MASTER_RETRY_SECONDS
+            return False
+
+    async def _stop(self, reason: str) -> None:
+        master, self._master = self._master, None
+        if master is None:
+            return
+        result = await master.stop(reason=reason)
+        if result.stderr:
+            log.info(
+                "ssh master for %s stopped (%s): %s",
+                self.host, reason, result.stderr.decode(errors="replace").strip()[-200:],
+            )
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._stop("client closed")
+
+
+class PostStreamParser:
+    """Incremental parser for social-scroller --json output.
+
+    Accepts a JSON array of posts or NDJSON (one post per line), fed in
+    chunks of any size. Each post is returned as soon as its closing
+    brace arrives, so only the unfinished post is ever buffered.
+    """
+
+    def __init__(self, max_post_bytes: int = MAX_POST_BYTES):
+        self.max_post_bytes = max_post_bytes
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buf = ""
+
+    def feed(self, chunk: bytes) -> list[dict]:
+        text = self._utf8.decode(chunk)
+        if not text:
+            return []
+        self._buf += text
+        if "}" not in text and len(self._buf) <= self.max_post_bytes:
+            return []  # can't have finished a post
+
+        posts = []
+        buf = self._buf
+        pos = 0
+        while True:
+            # Skip array brackets, separators and whitespace between posts
+            while pos < len(buf) and buf[pos] in " \t\r\n,[]":
+                pos += 1
+            if pos >= len(buf):
+                buf = ""
+                break
+            if buf[pos] != "{":
+                end = buf.find("\n", pos)
+                log.warning("skipping non-post social-scroller output: %r", buf[pos:pos + 80])
+                if end < 0:
+                    buf = ""
+                    break
+                pos = end + 1
+                continue
+            try:
+                post, pos = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                buf = buf[pos:]
+                if len(buf) > self.max_post_bytes:
+                    raise ValueError(f"post larger than {self.max_post_bytes} bytes")
+                break
+            posts.append(post)
+        self._buf = buf
+        return posts
+
+    def close(self) -> None:
+        tail = (self._buf + self._utf8.decode(b"", final=True)).strip(" \t\r\n,[]")
+        self._buf = ""
+        if tail:
+            log.warning("social-scroller output ended mid-post: %r", tail[:80])
+
+
+class ScrollerDaemonError(Exception):
+    """The serve session is unavailable or broke mid-batch."""
+
+
+class _PostBuffer:
+    """Posts streamed for one call, waiting for its consumer."""
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, post: dict) -> None:
+        try:
+            self.queue.put_nowait(post)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+
+class ScrollerDaemon:
+    """One long-lived `social-scroller.py serve` session.
+
+    Requests go out as JSON-RPC 2.0, one JSON value per line: a single
+    request object or a batch array. The session may answer a batch on
+    one line or each request on its own line as it finishes, in any
+    order, so replies are matched to callers by id. Several calls can be
+    in flight at once; requests with ``"tab": "new"`` get their own tab.
+
+    Requests with ``"stream": true`` may also get ``post`` notifications,
+    ``{"method": "post", "params": {"id": <request id>, "post": {...}}}``,
+    one per post ahead of the final reply.
+
+    A call the client stops waiting for, whether it timed out or its
+    caller was cancelled, is followed by a ``cancel`` notification,
+    ``{"method": "cancel", "params": {"ids": [...]}}``, so the session can
+    stop the job and close its tab.
+    """
+
+    def __init__(
+        self,
+        command: str,
+        subprocesses: SubprocessOwner,
+        start_timeout: float = 60,
+    ):
+        self.command = command
+        self.subprocesses = subprocesses
+        self.start_timeout = start_timeout
+        self._process: ManagedProcess | None = None
+        self._reader: asyncio.Task | None = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._streams: dict[int, _PostBuffer] = {}
+        self._start_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._next_id = 0
+        self.launches = 0
+
+    @property
+    def running(self) -> bool:
+        return (
+            self._process is not None
+            and self._process.running
+            and self._reader is not None
+            and not self._reader.done()
+        )
+
+    async def _ensure_started(self) -> None:
+        attempt = self.launches
+        async with self._start_lock:
+            if self.running:
+                return
+            if self.launches != attempt:
+                # Someone else just tried while we waited on the lock
+                raise ScrollerDaemonError("session failed to start")
+            if self._process is not None:
+                await self._stop("session exited")
+
+            self.launches += 1
+            self._process = await self.subprocesses.start_shell(
+                self.command, limit=DAEMON_STREAM_LIMIT,
+            )
+            self._pending = {}
+            self._streams = {}
+            self._reader = asyncio.create_task(
+                self._read_replies(self._process.stdout, self._pending, self._streams)
+            )
+            try:
+                await self._send([("ping", {})], timeout=self.start_timeout)
+            except ScrollerDaemonError:
+                await self._stop("session failed to start")
+                raise
+            log.info("social-scroller session started (pid %d)", self._process.pid)
+
+    @staticmethod
+    async def _read_replies(
+        stdout: asyncio.StreamReader,
+        pending: dict[int, asyncio.Future],
+        streams: dict[int, _PostBuffer],
+    ) -> None:
+        """Resolve pending calls from reply lines until the session ends."""
+        error = ScrollerDaemonError("session closed its output")
+        try:
+            while line := await stdout.readline():
+                try:
+                    replies = json.loads(line)
+                except json.JSONDecodeError:
+                    log.warning("social-scroller sent invalid JSON: %r", line[:200])
+                    continue
+                for reply in replies if isinstance(replies, list) else [replies]:
+                    if not isinstance(reply, dict):
+                        continue
+                    if reply.get("method") == "post":
+                        params = reply.get("params") or {}
+                        buffer = streams.get(params.get("id"))
+                        if buffer is not None and isinstance(params.get("post"), dict):
+                            buffer.offer(params["post"])
+                        continue
+                    future = pending.pop(reply.get("id"), None)
+                    if future is not None and not future.done():
+                        future.set_result(reply)
+        except asyncio.CancelledError:
+            error = ScrollerDaemonError("session stopped")
+            raise
+        except Exception as exc:
+            error = ScrollerDaemonError(f"session output failed: {exc}")
+        finally:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            pending.clear()
+
+    async def _submit(
+        self,
+        calls: list[tuple[str, dict]],
+        stream: _PostBuffer | None = None,
+    ) -> tuple[list[int], list[asyncio.Future]]:
+        """Write calls to the session and return their ids and reply futures."""
+        loop = asyncio.get_running_loop()
+        ids = []
+        futures = []
+        batch = []
+        for method, params in calls:
+            self._next_id += 1
+            ids.append(self._next_id)
+            future = loop.create_future()
+            self._pending[self._next_id] = future
+            if stream is not None:
+                self._streams[self._next_id] = stream
+            futures.append(future)
+            batch.append({
+                "jsonrpc": "2.0", "id": self._next_id,
+                "method": method, "params": params,
+            })
+
+        payload = batch[0] if len(batch) == 1 else batch
+        try:
+            async with self._write_lock:
+                self._process.stdin.write(json.dumps(payload).encode() + b"\n")
+                await self._process.stdin.drain()
+        except (ConnectionError, OSError, ValueError) as exc:
+            self._forget(ids)
+            raise ScrollerDaemonError(f"session pipe failed: {exc}") from exc
+        return ids, futures
+
+    def _forget(self, ids: list[int]) -> None:
+        for request_id in ids:
+            self._pending.pop(request_id, None)
+            self._streams.pop(request_id, None)
+
+    async def _send(
+        self, calls: list[tuple[str, dict]], timeout: float,
+    ) -> list[dict]:
+        """Send calls and return their replies in request order."""
+        ids, futures = await self._submit(calls)
+        try:
+            return list(await asyncio.wait_for(asyncio.gather(*futures), timeout=timeout))
+        except asyncio.TimeoutError:
+            await self._notify("cancel", {"ids": ids})
+            raise ScrollerDaemonError(f"no reply within {timeout:.0f}s") from None
+        except asyncio.CancelledError:
+            # The caller gave up (e.g. a time budget ran out); free the tab
+            await self._notify("cancel", {"ids": ids})
+            raise
+        finally:
+            self._forget(ids)
+
+    async def _notify(self, method: str, params: dict) -> None:
+        """Best-effort JSON-RPC notification (no reply expected)."""
+        try:
+            async with self._write_lock:
+                self._process.stdin.write(json.dumps({
+                    "jsonrpc": "2.0", "method": method, "params": params,
+                }).encode() + b"\n")
+                await self._process.stdin.drain()
+        except Exception:
+            pass
+
+    async def call(
+        self, calls: list[tuple[str, dict]], timeout: float,
+    ) -> list[dict]:
+        """Run (method, params) calls, starting the session if needed.
+
+        Raises ScrollerDaemonError if the session can't be used. A session
+        that stopped answering with nothing else in flight is stopped, so
+        the next call starts clean.
+        """
+        await self._ensure_started()
+        try:
+            return await self._send(calls, timeout=timeout)
+        except ScrollerDaemonError:
+            async with self._start_lock:
+                if not self._pending:
+                    await self._stop("call failed")
+            raise
+
+    async def stream(
+        self, method: str, params: dict, timeout: float,
+    ) -> AsyncIterator[dict]:
+        """Run one call and yield its posts as the session sends them.
+
+        Posts come from ``post`` notifications and then from the final
+        result, so a session that doesn't stream still works. An error
+        reply is logged and ends the stream.
+        """
+        await self._ensure_started()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        buffer = _PostBuffer(STREAM_QUEUE_SIZE)
+        queue = buffer.queue
+        ids, (final,) = await self._submit([(method, {**params, "stream": True})], stream=buffer)
+        getter = None
+        try:
+            while not final.done():
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {getter, final},
+                    timeout=max(deadline - loop.time(), 0),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if getter in done:
+                    yield getter.result()
+                    continue
+                getter.cancel()
+                if not done:
+                    raise ScrollerDaemonError(f"no reply within {timeout:.0f}s")
+            while not queue.empty():
+                yield queue.get_nowait()
+            if buffer.dropped:
+                log.warning(
+                    "social-scroller %s: dropped %d posts the consumer fell behind on",
+                    method, buffer.dropped,
+                )
+            reply = final.result()
+            if "error" in reply:
+                log.warning(
+                    "social-scroller %s failed: %s",
+                    method, reply["error"].get("message", reply["error"]),
+                )
+                return
+            for post in reply.get("result") or []:
+                yield post
+        finally:
+            if getter is not None:
+                getter.cancel()
+            if not final.done():
+                # Timed out, or the consumer stopped reading
+                await self._notify("cancel", {"ids": ids})
+            self._forget(ids)
+
+    async def _stop(self, reason: str) -> None:
+        process, self._process = self._process, None
+        reader, self._reader = self._reader, None
+        if reader is not None:
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+        if process is None:
+            return
+        result = await process.stop(reason=reason)
+        if result.stderr:
+            log.info(
+                "social-scroller session stopped (%s): %s",
+                reason, result.stderr.decode(errors="replace").strip()[-200:],
+            )
+
+    async def close(self) -> None:
+        async with self._start_lock:
+            await self._stop("client closed")
+
 
 class SocialScrollerClient:
     def __init__(
@@ -27,69 +573,265 @@ class SocialScrollerClient:
     ):
         self.config = config
         self.subprocesses = subprocesses or SubprocessOwner(logger=log)
+        self.ssh: SSHConnectionManager | None = None
+        if config.ssh_host:
+            self.ssh = SSHConnectionManager(config.ssh_host, self.subprocesses)
+        self.daemon: ScrollerDaemon | None = None
+        self._daemon_retry_at = 0.0
+        self._oneshot_lock = asyncio.Lock()
+        if config.daemon:
+            self.daemon = ScrollerDaemon(
+                self._wrap_ssh(
+                    f"DISPLAY=:99 python3 {config.script_path} {GLOBAL_FLAGS} serve",
+                    session=True,
+                ),
+                self.subprocesses,
+                start_timeout=config.daemon_start_timeout,
+            )
 
-    async def _run_cmd(self, cmd: str, timeout: int = 120) -> str | None:
-        """Run a social-scroller command, locally or via SSH.
+    def _wrap_ssh(self, cmd: str, session: bool = False) -> str:
+        """Wrap a command in ssh when ssh_host is set.
 
         When ssh_host is empty, runs directly on the local machine (the
         worker and the DISPLAY=:99 virtual desktop are both on officejawn).
-        When ssh_host is set, wraps the command in ssh.
         """
-        if self.config.ssh_host:
-            # Use double quotes for SSH wrapper so inner single quotes (from
-            # _shell_quote) pass through correctly
-            full_cmd = f'ssh {self.config.ssh_host} "{cmd}"'
-        else:
-            full_cmd = cmd
-        try:
-            result = await self.subprocesses.run_shell(
-                full_cmd,
-                timeout=timeout,
-            )
-            if result.timed_out:
-                log.warning("social-scroller timed out after %ds", timeout)
-                return None
-            if result.returncode != 0:
-                log.warning(
-                    "social-scroller exited %d: %s",
-                    result.returncode,
-                    result.stderr.decode().strip()[:200],
+        if not self.ssh:
+            return cmd
+        return self.ssh.command(cmd, session=session)
+
+    async def _stream_oneshot(self, job: dict) -> AsyncIterator[dict]:
+        """Launch social-scroller for one job and yield findings as it prints them."""
+        timeout = self._job_timeout(job)
+        # One-shot launches drive the browser's current tab, so they take turns
+        async with self._oneshot_lock:
+            try:
+                process = await self.subprocesses.start_shell(
+                    self._wrap_ssh(self._job_command(job)),
+                    stdin=asyncio.subprocess.DEVNULL,
                 )
-                return None
-            return result.stdout.decode()
-        except Exception:
-            log.exception("social-scroller run failed")
+            except Exception:
+                log.exception("social-scroller run failed")
+                return
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            parser = PostStreamParser()
+            timed_out = False
+            try:
+                while chunk := await asyncio.wait_for(
+                    process.stdout.read(READ_CHUNK_BYTES),
+                    timeout=max(deadline - loop.time(), 0),
+                ):
+                    for post in parser.feed(chunk):
+                        finding = self._to_finding(post)
+                        if finding:
+                            yield finding
+                parser.close()
+                timed_out = not await process.wait(max(deadline - loop.time(), 0))
+            except asyncio.TimeoutError:
+                timed_out = True
+            except ValueError as exc:
+                log.warning("social-scroller output unreadable: %s", exc)
+            finally:
+                result = await process.stop(reason="job finished")
+                if timed_out:
+                    log.warning("social-scroller timed out after %ds", timeout)
+                elif result.returncode not in (0, None):
+                    log.warning(
+                        "social-scroller exited %d: %s",
+                        result.returncode,
+                        result.stderr.decode(errors="replace").strip()[:200],
+                    )
+
+    @staticmethod
+    def _to_finding(post: dict) -> dict | None:
+        text = post.get("text", "")
+        author = post.get("username", "")
+
+        # Skip empty posts
+        if not text and not author:
             return None
 
-    def _parse_posts(self, raw_json: str | None) -> list[dict]:
-        """Parse JSON stdout from social-scroller into findings format."""
-        if not raw_json or not raw_json.strip():
+        return {
+            "url": post.get("link", "") or post.get("id", ""),
+            "text": text,
+            "author": author,
+            "platform": post.get("platform", ""),
+        }
+
+    @classmethod
+    def _to_findings(cls, posts: list[dict]) -> list[dict]:
+        return [f for f in map(cls._to_finding, posts or []) if f]
+
+    def _job_command(self, job: dict) -> str:
+        """Build the one-shot command line for a job (fallback path)."""
+        base = (
+            f"DISPLAY=:99 python3 {self.config.script_path} "
+            f"{GLOBAL_FLAGS} -d {job['duration']} "
+        )
+        if job["method"] == "search":
+            return base + f"search -p {job['platform']} -q {_shell_quote(job['query'])}"
+        return base + f"scroll --feeds {','.join(job['feeds'])}"
+
+    @staticmethod
+    def _job_timeout(job: dict) -> int:
+        # Multiple feeds: each takes `duration` seconds
+        scrolls = len(job.get("feeds", ())) or 1
+        return job["duration"] * scrolls + JOB_OVERHEAD_SECONDS
+
+    def search_job(
+        self, query: str, platform: str, duration: int | None = None,
+    ) -> dict:
+        return {
+            "method": "search",
+            "platform": platform,
+            "query": query,
+            "duration": duration or self.config.scroll_duration,
+        }
+
+    def scroll_job(
+        self, platforms: list[str] | None = None, duration: int | None = None,
+    ) -> dict:
+        return {
+            "method": "scroll",
+            "feeds": list(platforms or self.config.feed_platforms),
+            "duration": duration or self.config.scroll_duration,
+        }
+
+    def _daemon_usable(self) -> bool:
+        return self.daemon is not None and time.monotonic() >= self._daemon_retry_at
+
+    def _daemon_failed(self, exc: Exception) -> None:
+        log.warning("social-scroller session unavailable (%s), launching per job", exc)
+        self._daemon_retry_at = time.monotonic() + DAEMON_RETRY_SECONDS
+
+    def _reply_findings(self, job: dict, reply: dict) -> list[dict]:
+        if "error" in reply:
+            log.warning(
+                "social-scroller %s failed: %s",
+                job["method"], reply["error"].get("message", reply["error"]),
+            )
             return []
-        try:
-            posts = json.loads(raw_json)
-        except json.JSONDecodeError:
-            log.warning("failed to parse social-scroller JSON output")
+        return self._to_findings(reply.get("result"))
+
+    @staticmethod
+    def _job_params(job: dict, new_tab: bool = False) -> dict:
+        params = {k: v for k, v in job.items() if k != "method"}
+        if new_tab:
+            params["tab"] = "new"
+        return params
+
+    async def _run_oneshot(self, job: dict) -> list[dict]:
+        return [finding async for finding in self._stream_oneshot(job)]
+
+    async def iter_job(self, job: dict) -> AsyncIterator[dict]:
+        """Yield one job's findings as social-scroller produces them."""
+        if self.ssh:
+            await self.ssh.ensure_master()
+        if self._daemon_usable():
+            yielded = False
+            try:
+                async for post in self.daemon.stream(
+                    job["method"], self._job_params(job), timeout=self._job_timeout(job),
+                ):
+                    finding = self._to_finding(post)
+                    if finding:
+                        yielded = True
+                        yield finding
+                return
+            except Exception as exc:
+                self._daemon_failed(exc)
+                if yielded:
+                    return  # rerunning would repeat the whole scroll for a partial tail
+        async for finding in self._stream_oneshot(job):
+            yield finding
+
+    async def run_jobs(self, jobs: list[dict]) -> list[list[dict]]:
+        """Run search/scroll jobs as one batch and return findings per job, in order.
+
+        Uses the serve session when it's available, one process launch
+        per job otherwise.
+        """
+        if not jobs:
             return []
+        if self.ssh:
+            await self.ssh.ensure_master()
+        if self._daemon_usable():
+            calls = [(job["method"], self._job_params(job)) for job in jobs]
+            timeout = sum(self._job_timeout(job) for job in jobs)
+            try:
+                replies = await self.daemon.call(calls, timeout=timeout)
+            except Exception as exc:
+                self._daemon_failed(exc)
+            else:
+                return [self._reply_findings(job, r) for job, r in zip(jobs, replies)]
 
-        findings = []
-        for post in posts:
-            text = post.get("text", "")
-            author = post.get("username", "")
-            platform = post.get("platform", "")
-            link = post.get("link", "")
+        return [await self._run_oneshot(job) for job in jobs]
 
-            # Skip empty posts
-            if not text and not author:
-                continue
+    async def _run_job(self, job: dict) -> list[dict]:
+        """Run one job in its own tab on the serve session, or as a launch."""
+        if self._daemon_usable():
+            try:
+                (reply,) = await self.daemon.call(
+                    [(job["method"], self._job_params(job, new_tab=True))],
+                    timeout=self._job_timeout(job),
+                )
+            except Exception as exc:
+                self._daemon_failed(exc)
+            else:
+                return self._reply_findings(job, reply)
+        return await self._run_oneshot(job)
 
-            findings.append({
-                "url": link or post.get("id", ""),
-                "text": text,
-                "author": author,
-                "platform": platform,
-            })
+    async def stream_jobs(
+        self,
+        jobs: list[dict],
+        max_tabs: int | None = None,
+        time_budget: float | None = None,
+    ) -> AsyncIterator[tuple[dict, list[dict]]]:
+        """Run jobs concurrently, yielding (job, findings) as each finishes.
+
+        On the serve session each job gets its own tab and at most
+        ``max_tabs`` run at once. One-shot launches all drive the browser's
+        current tab, so without the session the jobs take turns. Either way,
+        jobs still running or not yet started when ``time_budget`` seconds
+        have passed are dropped.
+        """
+        if not jobs:
+            return
+        if self.ssh:
+            await self.ssh.ensure_master()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (time_budget or self.config.strategy_time_budget)
+        tabs = asyncio.Semaphore(max_tabs or self.config.max_tabs)
+
+        async def _run(job: dict) -> tuple[dict, list[dict] | None]:
+            async with tabs:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return job, None
+                try:
+                    return job, await asyncio.wait_for(self._run_job(job), timeout=remaining)
+                except asyncio.TimeoutError:
+                    return job, None
 
-        return findings
+        tasks = [asyncio.create_task(_run(job)) for job in jobs]
+        dropped = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                job, findings = await next_done
+                if findings is None:
+                    dropped += 1
+                    continue
+                yield job, findings
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if dropped:
+                log.warning(
+                    "social-scroller: %d/%d jobs dropped at the %ss time budget",
+                    dropped, len(jobs), time_budget or self.config.strategy_time_budget,
+                )
 
     async def search(
         self, query: str, platform: str, duration: int | None = None,
@@ -103,16 +845,26 @@ class SocialScrollerClient:
 
         Returns findings in {url, text, author, platform} format.
         """
-        dur = duration or self.config.scroll_duration
-        # Global flags (--json, --no-screenshots, -d) must come BEFORE subcommand
-        cmd = (
-            f"DISPLAY=:99 python3 {self.config.script_path} "
-            f"--json --no-screenshots --no-all-captures -d {dur} "
-            f"search -p {platform} -q {_shell_quote(query)}"
-        )
-        # Search takes longer: scroll time + page load + extraction
-        raw = await self._run_cmd(cmd, timeout=dur + 60)
-        return self._parse_posts(raw)
+        (results,) = await self.run_jobs([self.search_job(query, platform, duration)])
+        return results
+
+    def strategy_jobs(self) -> list[dict]:
+        """Search jobs for every configured platform's keywords."""
+        jobs = []
+        for platform in self.config.search_platforms:
+            keywords = self.config.platform_keywords.get(platform, ())
+            for keyword in keywords[:3]:  # cap at 3 to limit time
+                jobs.append(self.search_job(keyword, platform))
+        return jobs
+
+    async def iter_strategy(self) -> AsyncIterator[tuple[dict, list[dict]]]:
+        """Run strategy searches through stream_jobs, yielding results as each finishes."""
+        async for job, results in self.stream_jobs(self.strategy_jobs()):
+            log.info(
+                "%s search '%s': %d posts",
+                job["platform"], job["query"], len(results),
+            )
+            yield job, results
 
     async def search_with_strategy(self) -> list[dict]:
         """Run platform-specific search strategies.
@@ -121,25 +873,8 @@ class SocialScrollerClient:
         Returns an empty list if no search_platforms are configured.
         """
         all_findings = []
-
-        for platform in self.config.search_platforms:
-            keywords = self.config.platform_keywords.get(platform, [])
-            if not keywords:
-                continue
-
-            for keyword in keywords[:3]:  # cap at 3 to limit time
-                try:
-                    results = await self.search(keyword, platform)
-                    all_findings.extend(results)
-                    log.info(
-                        "%s search '%s': %d posts",
-                        platform, keyword, len(results),
-                    )
-                except Exception:
-                    log.exception(
-                        "%s search failed for '%s'", platform, keyword,
-                    )
-
+        async for _, results in self.iter_strategy():
+            all_findings.extend(results)
         return all_findings
 
     async def scan_feeds(
@@ -150,19 +885,23 @@ class SocialScrollerClient:
 
         Returns findings in {url, text, author, platform} format.
         """
-        dur = duration or self.config.scroll_duration
-        feeds = platforms or list(self.config.feed_platforms)
-        feeds_arg = ",".join(feeds)
-        # Global flags must come BEFORE subcommand
-        cmd = (
-            f"DISPLAY=:99 python3 {self.config.script_path} "
-            f"--json --no-screenshots --no-all-captures -d {dur} "
-            f"scroll --feeds {feeds_arg}"
-        )
-        # Multiple feeds: each takes `dur` seconds
-        timeout = (dur * len(feeds)) + 60
-        raw = await self._run_cmd(cmd, timeout=timeout)
-        return self._parse_posts(raw)
+        (results,) = await self.run_jobs([self.scroll_job(platforms, duration)])
+        return results
+
+    async def iter_feeds(
+        self, platforms: list[str] | None = None,
+        duration: int | None = None,
+    ) -> AsyncIterator[dict]:
+        """Scroll open feed tabs, yielding findings as posts are extracted."""
+        async for finding in self.iter_job(self.scroll_job(platforms, duration)):
+            yield finding
+
+    async def close(self) -> None:
+        """Stop the serve session and SSH master, if running."""
+        if self.daemon:
+            await self.daemon.close()
+        if self.ssh:
+            await self.ssh.close()
 
 
 def _shell_quote(s: str) -> str:
@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
-
-from twikit import Client as TwikitClient
+from typing import TYPE_CHECKING, Optional
 
 from worker.config import TwitterConfig
 
+if TYPE_CHECKING:
+    from twikit import Client as TwikitClient
+
 log = logging.getLogger(__name__)
 
 SEARCH_KEYWORDS = [
@@ -37,6 +38,9 @@ class TwitterClient:
         if self._client is not None:
             return self._client
 
+        # twikit is slow to import; only pay for it once Twitter is used
+        from twikit import Client as TwikitClient
+
         client = TwikitClient(language="en-US")
 
         try:
@@ -1,8 +1,10 @@
 """Main runner -- orchestrates monitor and action loops."""
 
-import logging
+from __future__ import annotations
 
-import redis.asyncio as aioredis
+import logging
+import time
+from typing import TYPE_CHECKING
 
 from worker.approvals import ApprovalManager
 from worker.config import Config
@@ -11,6 +13,7 @@ from worker.content import (
     generate_content,
     validate_generated_content,
 )
+from worker.coordinator import JobCoordinator
 from worker.db import Database
 from worker.executor import ActionPicker, EscalationTier
 from worker.monitor import Monitor
@@ -20,12 +23,17 @@ from worker.platforms.social_scroller import SocialScrollerClient
 from worker.platforms.twitter import TwitterClient
 from worker.subprocesses import SubprocessOwner
 
+if TYPE_CHECKING:
+    import redis.asyncio as aioredis
+
 logger = logging.getLogger(__name__)
 
 
 class WorkerRunner:
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, coordinator: JobCoordinator | None = None):
         self.config = config
+        # Shared-resource locks; the action session takes them per call
+        self.coordinator = coordinator or JobCoordinator()
         self.db: Database = None
         self.twitter: TwitterClient = None
         self.bluesky: BlueskyClient = None
@@ -37,12 +45,24 @@ class WorkerRunner:
         self.curation_monitor = None
         self._redis_sub: aioredis.Redis = None
         self.subprocesses = SubprocessOwner(logger=logger)
+        # Seconds spent on each component in start(), for the startup benchmark
+        self.startup_timings: dict[str, float] = {}
+
+    def _timed(self, component: str, started: float) -> None:
+        self.startup_timings[component] = time.perf_counter() - started
 
     async def start(self):
-        """Initialize all components."""
+        """Initialize all components.
+
+        Platform SDKs (twikit, atproto, feedparser) are imported on first
+        use, not here, so a restart only pays for what it touches.
+        """
+        started = time.perf_counter()
         self.db = Database(self.config.db_path)
         await self.db.init()
+        self._timed("db", started)
 
+        started = time.perf_counter()
         self.twitter = TwitterClient(self.config.twitter)
         self.bluesky = BlueskyClient(self.config.bluesky)
         if self.config.producthunt.developer_token:
@@ -57,23 +77,33 @@ class WorkerRunner:
         self.monitor = Monitor(self.config, self.db)
         self.picker = ActionPicker(self.config, self.db)
         self.approvals = ApprovalManager(self.config, self.db)
+        self._timed("clients", started)
 
         # Start Redis subscription for approval decisions
+        started = time.perf_counter()
+        import redis.asyncio as aioredis
+
         self._redis_sub = aioredis.Redis(
             host=self.config.redis.host,
             port=self.config.redis.port,
             password=self.config.redis.password,
             decode_responses=True,
         )
+        self._timed("redis", started)
 
+        started = time.perf_counter()
         from worker.curation.monitor import CurationMonitor
         self.curation_monitor = CurationMonitor(
             self.config.curation,
             self.db,
             subprocesses=self.subprocesses,
         )
+        self._timed("curation", started)
 
-        logger.info("keyjawn-worker started")
+        logger.info(
+            "keyjawn-worker started (%s)",
+            ", ".join(f"{k} {v:.2f}s" for k, v in self.startup_timings.items()),
+        )
 
     async def stop(self):
         """Clean shutdown."""
@@ -89,24 +119,26 @@ class WorkerRunner:
             await self.db.close()
         logger.info("keyjawn-worker stopped")
 
-    async def run_monitor_scan(self):
-        """Run one monitor scan cycle."""
+    async def run_monitor_scan(self) -> int:
+        """Run one monitor scan cycle. Returns new findings queued."""
         logger.info("starting monitor scan")
         queued = await self.monitor.scan_all_platforms(
             self.twitter, self.bluesky, self.producthunt,
             self.social_scroller,
         )
         logger.info("monitor scan done: %d new findings queued", queued)
+        return queued
 
-    async def run_curation_scan(self, include_twitch: bool = False):
-        """Run one curation scan + evaluation cycle."""
+    async def run_curation_scan(self, include_twitch: bool = False) -> int:
+        """Run one curation scan + evaluation cycle. Returns new candidates stored."""
         if not self.curation_monitor:
-            return
+            return 0
         logger.info("starting curation scan")
         approved = await self.curation_monitor.scan_and_evaluate(
             include_twitch=include_twitch
         )
         logger.info("curation scan done: %d new candidates approved", approved)
+        return self.curation_monitor.last_stored
 
     async def run_action_session(self):
         """Run one action session (evening window)."""
@@ -138,13 +170,12 @@ class WorkerRunner:
 
         # Generate content if it's a calendar post
         if action["source"] == "calendar":
-            generated = await generate_content(
+            generated = await self._generate(
                 ContentRequest(
                     pillar=action.get("pillar", "demo"),
                     platform=action["platform"],
                     topic=content,
                 ),
-                subprocesses=self.subprocesses,
             )
             if generated:
                 errors = validate_generated_content(
@@ -152,13 +183,12 @@ class WorkerRunner:
                 )
                 if errors:
                     logger.warning("generated content has issues: %s", errors)
-                    generated = await generate_content(
+                    generated = await self._generate(
                         ContentRequest(
                             pillar=action.get("pillar", "demo"),
                             platform=action["platform"],
                             topic=content,
                         ),
-                        subprocesses=self.subprocesses,
                     )
                     if generated:
                         errors = validate_generated_content(
@@ -188,7 +218,7 @@ class WorkerRunner:
         content = action["content"]
 
         if action["action_type"] == "reply":
-            generated = await generate_content(
+            generated = await self._generate(
                 ContentRequest(
                     pillar="engagement",
                     platform=action["platform"],
@@ -197,7 +227,6 @@ class WorkerRunner:
                         f"@{action.get('source_user', 'user')} said: {content}"
                     ),
                 ),
-                subprocesses=self.subprocesses,
             )
             if generated:
                 errors = validate_generated_content(
@@ -292,8 +321,16 @@ class WorkerRunner:
                         post_url=other_url,
                     )
 
+    async def _generate(self, request: ContentRequest) -> str | None:
+        async with self.coordinator.hold("claude_cli"):
+            return await generate_content(request, subprocesses=self.subprocesses)
+
     async def _execute_engagement(self, action: dict) -> bool:
         """Execute an engagement action (like, repost, follow)."""
+        async with self.coordinator.hold(action["platform"]):
+            return await self._engage(action)
+
+    async def _engage(self, action: dict) -> bool:
         platform = action["platform"]
         action_type = action["action_type"]
         post_id = action.get("post_id", "")
@@ -326,6 +363,12 @@ class WorkerRunner:
         in_reply_to: str = None,
     ) -> str:
         """Post content to a platform. Returns URL or None."""
+        async with self.coordinator.hold(platform):
+            return await self._post(platform, content, action_type, in_reply_to)
+
+    async def _post(
+        self, platform: str, content: str, action_type: str, in_reply_to: str,
+    ) -> str:
         if platform == "twitter":
             if action_type == "reply" and in_reply_to:
                 tweet_id = in_reply_to.split("/")[-1]
@@ -337,12 +380,13 @@ class WorkerRunner:
             logger.warning("no posting support for %s", platform)
             return None
 
-    async def run_discovery_scan(self):
-        """Run on-platform discovery scan."""
+    async def run_discovery_scan(self) -> int:
+        """Run on-platform discovery scan. Returns opportunities found."""
         from worker.discovery import DiscoveryEngine
         engine = DiscoveryEngine(self.db)
         found = await engine.scan_all(self.twitter, self.bluesky)
         logger.info("discovery scan done: %d opportunities found", found)
+        return found
 
     async def listen_for_decisions(self):
         """Listen for approval decisions via Redis pub/sub."""
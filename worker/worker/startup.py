@@ -0,0 +1,58 @@
+"""Startup benchmark helpers: cold import times and a per-component report."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+# Third-party packages the worker defers until first use, plus the
+# worker's own entry modules. Each is timed in a fresh interpreter so
+# one import's dependencies don't make the next look cheap.
+BENCH_MODULES = (
+    "worker.main",
+    "worker.runner",
+    "apscheduler.schedulers.asyncio",
+    "redis.asyncio",
+    "twikit",
+    "atproto",
+    "feedparser",
+    "httpx",
+    "aiosqlite",
+)
+
+# Must never load just because worker.main was imported
+LAZY_MODULES = ("apscheduler", "redis", "twikit", "atproto", "feedparser")
+
+_PROBE = (
+    "import importlib, sys, time\n"
+    "t = time.perf_counter()\n"
+    "importlib.import_module(sys.argv[1])\n"
+    "print(time.perf_counter() - t)\n"
+    "print(' '.join(sorted({m.split('.')[0] for m in sys.modules})))\n"
+)
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+
+def probe_import(module: str) -> tuple[float, set[str]]:
+    """Import ``module`` in a fresh interpreter.
+
+    Returns (seconds, top-level packages loaded). Raises
+    CalledProcessError if the import fails.
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, module],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=PACKAGE_ROOT,
+    )
+    seconds, loaded = result.stdout.splitlines()[:2]
+    return float(seconds), set(loaded.split())
+
+
+def format_report(rows: list[tuple[str, str, float]]) -> list[str]:
+    """Format (phase, component, seconds) rows as aligned report lines."""
+    width = max((len(c) for _, c, _ in rows), default=0)
+    return [f"{phase:<7} {component:<{width}} {seconds * 1000:9.1f} ms" for phase, component, seconds in rows]
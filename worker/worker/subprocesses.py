@@ -11,14 +11,31 @@ import signal
 import subprocess
 import sys
 import threading
+import time
 from collections.abc import Awaitable, Callable
 from ctypes import wintypes
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from worker import metrics, tracing
+
 log = logging.getLogger(__name__)
 
+SPAWN_SECONDS = metrics.histogram(
+    "keyjawn_subprocess_spawn_seconds",
+    "Time from run request until the subprocess tree is registered",
+)
+RUN_SECONDS = metrics.histogram(
+    "keyjawn_subprocess_run_seconds",
+    "Total wall time of owned subprocess runs",
+    ["outcome"],
+)
+ACTIVE_TREES = metrics.gauge(
+    "keyjawn_subprocess_active",
+    "Subprocess trees currently owned by the worker",
+)
+
 _WINDOWS_NEW_PROCESS_GROUP = getattr(
     subprocess,
     "CREATE_NEW_PROCESS_GROUP",
@@ -313,6 +330,62 @@ class _ProcessEntry:
     termination: asyncio.Task[tuple[bytes, bytes, bool]] | None = None
 
 
+class ManagedProcess:
+    """A long-lived child the owner keeps registered until it is stopped.
+
+    stdin and stdout stay open for the caller to talk to the child.
+    stderr is drained in the background and kept for diagnostics.
+    """
+
+    def __init__(self, owner: SubprocessOwner, entry: _ProcessEntry) -> None:
+        self._owner = owner
+        self._entry = entry
+
+    @property
+    def pid(self) -> int:
+        return self._entry.process.pid
+
+    @property
+    def stdin(self) -> asyncio.StreamWriter:
+        return self._entry.process.stdin
+
+    @property
+    def stdout(self) -> asyncio.StreamReader:
+        return self._entry.process.stdout
+
+    @property
+    def running(self) -> bool:
+        return (
+            self._entry.termination is None
+            and not self._entry.communication.done()
+        )
+
+    async def wait(self, timeout: float | None = None) -> bool:
+        """Wait for the tree to exit on its own. Returns False on timeout."""
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(self._entry.communication),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def stop(self, reason: str = "stopped by caller") -> ProcessResult:
+        if self._entry.process.stdin is not None:
+            self._entry.process.stdin.close()
+        stdout, stderr, forced = await self._owner._terminate(
+            self._entry,
+            reason=reason,
+        )
+        return ProcessResult(
+            self._owner._resolved_returncode(self._entry),
+            stdout,
+            stderr,
+            forced=forced,
+        )
+
+
 class SubprocessOwner:
     """Launch CLI calls in OS ownership boundaries and reap them as one unit."""
 
@@ -389,7 +462,55 @@ class SubprocessOwner:
             **kwargs,
         )
 
+    async def start_shell(self, command: str, **kwargs: Any) -> ManagedProcess:
+        """Start a long-lived shell command with piped stdin and stdout.
+
+        The tree stays owned until ManagedProcess.stop() or shutdown().
+        """
+        kwargs.setdefault("stdin", asyncio.subprocess.PIPE)
+        kwargs.setdefault("stdout", asyncio.subprocess.PIPE)
+        kwargs.setdefault("stderr", asyncio.subprocess.PIPE)
+        self._apply_process_group(kwargs)
+        status_read_fd: int | None = None
+        status_write_fd: int | None = None
+        if self.platform.startswith("linux"):
+            status_read_fd, status_write_fd = os.pipe()
+            kwargs["pass_fds"] = (*tuple(kwargs.pop("pass_fds", ())), status_write_fd)
+            spawn = asyncio.create_subprocess_exec
+            args: tuple[str, ...] = (
+                sys.executable,
+                str(_SUPERVISOR),
+                "shell",
+                str(status_write_fd),
+                command,
+            )
+        else:
+            spawn = asyncio.create_subprocess_shell
+            args = (command,)
+        entry = await self._spawn_and_register(
+            spawn,
+            args,
+            kwargs,
+            None,
+            status_read_fd=status_read_fd,
+            status_write_fd=status_write_fd,
+            interactive=True,
+        )
+        return ManagedProcess(self, entry)
+
     async def _run(
+        self,
+        spawn: Callable[..., Awaitable[asyncio.subprocess.Process]],
+        *args: str,
+        **kwargs: Any,
+    ) -> ProcessResult:
+        program = os.path.basename(args[0].split(None, 1)[0]) if args and args[0].strip() else ""
+        with tracing.leaf("subprocess", program=program) as span:
+            result = await self._run_owned(spawn, *args, **kwargs)
+            span.set(returncode=result.returncode, timed_out=result.timed_out)
+            return result
+
+    async def _run_owned(
         self,
         spawn: Callable[..., Awaitable[asyncio.subprocess.Process]],
         *args: str,
@@ -417,6 +538,8 @@ class SubprocessOwner:
         kwargs.setdefault("stderr", asyncio.subprocess.PIPE)
         self._apply_process_group(kwargs)
 
+        started = time.perf_counter()
+        outcome = "error"
         registration = asyncio.create_task(
             self._spawn_and_register(
                 spawn,
@@ -450,6 +573,7 @@ class SubprocessOwner:
                     if cleanup.cancelled():
                         raise cancellation
             raise cancellation
+        SPAWN_SECONDS.observe(time.perf_counter() - started)
 
         process = entry.process
         communication = entry.communication
@@ -468,6 +592,7 @@ class SubprocessOwner:
                     entry,
                     reason=f"timeout after {timeout}s",
                 )
+                outcome = "timeout"
                 return ProcessResult(
                     self._resolved_returncode(entry),
                     stdout,
@@ -476,6 +601,7 @@ class SubprocessOwner:
                     forced=forced,
                 )
             except asyncio.CancelledError as cancellation:
+                outcome = "cancelled"
                 cleanup = asyncio.create_task(
                     self._terminate(entry, reason="task cancellation")
                 )
@@ -516,6 +642,7 @@ class SubprocessOwner:
                 )
             elif entry.root_status is not None:
                 stdout, stderr = await self._read_output(entry)
+            outcome = "ok"
             return ProcessResult(
                 root_returncode,
                 stdout,
@@ -523,6 +650,7 @@ class SubprocessOwner:
                 forced=forced,
             )
         finally:
+            RUN_SECONDS.labels(outcome).observe(time.perf_counter() - started)
             if communication.done() and not self._tree_is_alive(entry):
                 await self._release_entry(entry)
 
@@ -535,6 +663,7 @@ class SubprocessOwner:
         *,
         status_read_fd: int | None,
         status_write_fd: int | None,
+        interactive: bool = False,
     ) -> _ProcessEntry:
         async with self._guard:
             try:
@@ -549,7 +678,10 @@ class SubprocessOwner:
                 if status_write_fd is not None:
                     os.close(status_write_fd)
 
-            communication = asyncio.create_task(process.communicate(input))
+            if interactive:
+                communication = asyncio.create_task(self._drain_stderr(process))
+            else:
+                communication = asyncio.create_task(process.communicate(input))
             root_status = None
             root_status_stop = None
             if status_read_fd is not None:
@@ -582,8 +714,23 @@ class SubprocessOwner:
                 windows_job=windows_job,
             )
             self._entries[process.pid] = entry
+            ACTIVE_TREES.inc()
             return entry
 
+    @staticmethod
+    async def _drain_stderr(
+        process: asyncio.subprocess.Process,
+        limit: int = 65536,
+    ) -> tuple[bytes, bytes]:
+        """Keep an interactive child's stderr from filling its pipe."""
+        tail = bytearray()
+        if process.stderr is not None:
+            while chunk := await process.stderr.read(4096):
+                tail.extend(chunk)
+                del tail[:-limit]
+        await process.wait()
+        return b"", bytes(tail)
+
     @staticmethod
     def _read_root_status(
         status_fd: int,
@@ -831,6 +978,7 @@ class SubprocessOwner:
         async with self._guard:
             if self._entries.get(entry.process.pid) is entry:
                 self._entries.pop(entry.process.pid, None)
+                ACTIVE_TREES.dec()
             windows_job, entry.windows_job = entry.windows_job, None
         if windows_job is not None:
             windows_job.close()
@@ -0,0 +1,329 @@
+"""Span tracing for scheduled job runs.
+
+Each job run is one trace: a root span for the job, with child spans for
+sources, HTTP requests, subprocesses and DB statements. The current span
+lives in a context variable, so tasks started under a span (gather,
+create_task) become its children automatically.
+
+Finished traces are appended to a JSONL file, one span per line, using
+OTLP field names (traceId, spanId, parentSpanId, startTimeUnixNano, ...)
+so a collector or converter can pick them up later. On the event loop
+the append happens on a single writer thread, in order, so a job never
+waits on the disk. The file moves to <path>.1 once it passes
+MAX_FILE_BYTES.
+
+Outside a trace span() is a no-op, so instrumented code that runs from
+tests or one-shot commands pays only a context-variable lookup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import secrets
+import time
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+log = logging.getLogger(__name__)
+
+MAX_SPANS_PER_TRACE = 2000
+MAX_FILE_BYTES = 20 * 1024 * 1024  # rotated to <path>.1 past this
+
+
+class Span:
+    __slots__ = (
+        "trace", "span_id", "parent_id", "name", "attributes",
+        "start_ns", "_started", "duration_ns", "status",
+    )
+
+    def __init__(self, trace: "_Trace", name: str, parent_id: str, attributes: dict):
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self._started = time.perf_counter_ns()
+        self.duration_ns = 0
+        self.status = "unfinished"
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        self.duration_ns = time.perf_counter_ns() - self._started
+        if error is None:
+            self.status = "ok"
+        else:
+            self.status = "error"
+            self.attributes.setdefault("error", type(error).__name__)
+
+    def to_dict(self) -> dict:
+        return {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.start_ns + self.duration_ns,
+            "attributes": self.attributes,
+            "status": self.status,
+        }
+
+
+class _Trace:
+    def __init__(self):
+        self.trace_id = secrets.token_hex(16)
+        self.spans: list[Span] = []
+        self.dropped = 0
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "keyjawn_span", default=None,
+)
+
+
+class _NullSpan:
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _SpanScope:
+    __slots__ = ("_tracer", "_name", "_attributes", "_root", "_leaf", "_span", "_token")
+
+    def __init__(
+        self, tracer: "Tracer", name: str, attributes: dict,
+        root: bool = False, leaf: bool = False,
+    ):
+        self._tracer = tracer
+        self._name = name
+        self._attributes = attributes
+        self._root = root
+        self._leaf = leaf
+        self._span = None
+        self._token = None
+
+    def __enter__(self):
+        parent = _current.get()
+        if parent is None:
+            if not self._root or not self._tracer.enabled:
+                return _NULL_SPAN
+            trace, parent_id = _Trace(), ""
+        else:
+            trace, parent_id = parent.trace, parent.span_id
+            if len(trace.spans) >= MAX_SPANS_PER_TRACE:
+                trace.dropped += 1
+                return _NULL_SPAN
+        self._span = Span(trace, self._name, parent_id, self._attributes)
+        trace.spans.append(self._span)
+        if not self._leaf:
+            self._token = _current.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self._span
+        if span is None:
+            return False
+        span.end(exc)
+        if self._token is not None:
+            _current.reset(self._token)
+        if not span.parent_id:
+            self._tracer.export(span.trace)
+        return False
+
+
+class Tracer:
+    def __init__(self, path: str = ""):
+        self.path = path
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._last_write: Optional[Future] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def trace(self, name: str, **attributes: Any) -> _SpanScope:
+        """Start a trace (or a child span if one is already running)."""
+        return _SpanScope(self, name, attributes, root=True)
+
+    def span(self, name: str, **attributes: Any) -> _SpanScope:
+        """Child span of the current one; no-op outside a trace."""
+        return _SpanScope(self, name, attributes)
+
+    def leaf(self, name: str, **attributes: Any) -> _SpanScope:
+        """Like span(), but never becomes the parent of later spans.
+
+        For work that can't nest anything (a DB statement, an HTTP
+        request) or whose end might never be reported.
+        """
+        return _SpanScope(self, name, attributes, leaf=True)
+
+    def export(self, trace: _Trace) -> None:
+        if trace.dropped:
+            trace.spans[0].attributes["dropped_spans"] = trace.dropped
+        spans = [s.to_dict() for s in trace.spans]
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop to keep responsive (one-shot commands)
+            self.flush()
+            self._write(self.path, spans)
+            return
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trace-writer")
+        self._last_write = self._writer.submit(self._write, self.path, spans)
+
+    def _write(self, path: str, spans: list[dict]) -> None:
+        lines = "".join(json.dumps(s) + "\n" for s in spans)
+        try:
+            with open(path, "a") as f:
+                f.write(lines)
+                size = f.tell()
+        except OSError:
+            log.exception("could not write trace to %s", path)
+            return
+        if size > MAX_FILE_BYTES:
+            self.rotate(path)
+
+    def flush(self) -> None:
+        """Wait for traces handed to the writer thread to be written."""
+        if self._last_write is not None:
+            self._last_write.result()
+
+    def rotate(self, path: str = "") -> None:
+        path = path or self.path
+        try:
+            if os.path.getsize(path) > MAX_FILE_BYTES:
+                os.replace(path, f"{path}.1")
+        except OSError:
+            pass
+
+
+_TRACER = Tracer()
+
+
+def configure(path: str) -> Tracer:
+    """Point the process tracer at a JSONL file ("" disables tracing)."""
+    _TRACER.flush()
+    _TRACER.path = path
+    if path:
+        _TRACER.rotate()
+    return _TRACER
+
+
+def flush() -> None:
+    """Block until queued traces are on disk; call before exit."""
+    _TRACER.flush()
+
+
+def trace(name: str, **attributes: Any) -> _SpanScope:
+    return _TRACER.trace(name, **attributes)
+
+
+def span(name: str, **attributes: Any) -> _SpanScope:
+    return _TRACER.span(name, **attributes)
+
+
+def leaf(name: str, **attributes: Any) -> _SpanScope:
+    return _TRACER.leaf(name, **attributes)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+async def _on_request(request) -> None:
+    # A request that fails never reaches the response hook; as a leaf its
+    # span just stays "unfinished" instead of adopting later spans
+    scope = leaf("http", method=request.method, host=request.url.host, path=request.url.path)
+    request.extensions["keyjawn_span"] = scope
+    scope.__enter__()
+
+
+async def _on_response(response) -> None:
+    scope = response.request.extensions.pop("keyjawn_span", None)
+    if scope is not None:
+        if scope._span is not None:
+            scope._span.set(status_code=response.status_code)
+        scope.__exit__(None, None, None)
+
+
+def httpx_event_hooks() -> dict:
+    """httpx event hooks that record one span per request, up to response headers."""
+    return {"request": [_on_request], "response": [_on_response]}
+
+
+# -- reading traces back --
+
+
+def load_spans(path: str) -> list[dict]:
+    spans = []
+    for p in (Path(f"{path}.1"), Path(path)):
+        if not p.exists():
+            continue
+        with p.open() as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    spans.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return spans
+
+
+def _duration_ms(s: dict) -> float:
+    return (s["endTimeUnixNano"] - s["startTimeUnixNano"]) / 1e6
+
+
+def slowest_spans(
+    spans: list[dict],
+    runs: int = 10,
+    top: int = 15,
+    job: Optional[str] = None,
+) -> tuple[list[dict], list[dict]]:
+    """Return (last runs, slowest child spans across them).
+
+    Each run is {"job", "traceId", "start", "duration_ms"}; each span is
+    {"job", "name", "attributes", "duration_ms"}, slowest first.
+    """
+    by_trace: dict[str, list[dict]] = defaultdict(list)
+    roots = []
+    for s in spans:
+        by_trace[s["traceId"]].append(s)
+        if not s.get("parentSpanId"):
+            if job is None or s["name"] == job:
+                roots.append(s)
+    roots.sort(key=lambda s: s["startTimeUnixNano"])
+    recent = roots[-runs:] if runs > 0 else roots
+
+    run_rows = []
+    children = []
+    for root in recent:
+        run_rows.append({
+            "job": root["name"],
+            "traceId": root["traceId"],
+            "start": root["startTimeUnixNano"],
+            "duration_ms": _duration_ms(root),
+        })
+        for s in by_trace[root["traceId"]]:
+            if s is root:
+                continue
+            children.append({
+                "job": root["name"],
+                "name": s["name"],
+                "attributes": s.get("attributes", {}),
+                "duration_ms": _duration_ms(s),
+            })
+    children.sort(key=lambda s: s["duration_ms"], reverse=True)
+    return run_rows, children[:top]
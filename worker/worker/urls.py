@@ -0,0 +1,152 @@
+"""Canonical URL keys for deduplicating findings and curation candidates.
+
+The same piece of content shows up under many URLs: youtu.be short links,
+Shorts and embed paths, share links with tracking params, and Google
+Alerts redirect wrappers. ``canonicalize_url`` folds those into a single
+key so dedup compares what the URL points at, not how it was spelled.
+
+The canonical form is a dedup key only. It is never fetched or posted, so
+it's fine for it to drop params a browser would still need.
+"""
+
+from __future__ import annotations
+
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query params that only carry attribution or session state.
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "gbraid",
+    "wbraid",
+    "msclkid",
+    "yclid",
+    "twclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "mkt_tok",
+    "_hsenc",
+    "_hsmi",
+    "ref",
+    "ref_src",
+    "ref_url",
+    "referrer",
+    "source",
+    "si",
+    "feature",
+    "spm",
+    "share",
+    "cmpid",
+}
+
+TRACKING_PREFIXES = ("utm_", "oly_", "vero_", "pk_", "hsa_")
+
+# Hosts that wrap the real destination in a query param.
+# host -> (path, param names to try in order)
+REDIRECT_WRAPPERS = {
+    "google.com": ("/url", ("url", "q")),
+    "youtube.com": ("/redirect", ("q",)),
+    "l.facebook.com": ("/l.php", ("u",)),
+    "lm.facebook.com": ("/l.php", ("u",)),
+    "out.reddit.com": ("/", ("url",)),
+    "l.instagram.com": ("/", ("u",)),
+    "slack-redir.net": ("/link", ("url",)),
+}
+
+HOST_ALIASES = {
+    "youtube-nocookie.com": "youtube.com",
+    "music.youtube.com": "youtube.com",
+    "x.com": "twitter.com",
+    "mobile.twitter.com": "twitter.com",
+    "mobile.x.com": "twitter.com",
+    "old.reddit.com": "reddit.com",
+    "new.reddit.com": "reddit.com",
+}
+
+# Hosts whose query string never identifies the content (share params only).
+QUERYLESS_HOSTS = {"twitter.com", "bsky.app", "clips.twitch.tv"}
+
+_STRIP_HOST_PREFIXES = ("www.", "m.")
+_YOUTUBE_ID_PATHS = re.compile(r"^/(?:shorts|embed|live|v)/([\w-]{6,})")
+_MAX_UNWRAP = 3
+
+
+def _normalize_host(netloc: str, scheme: str) -> str:
+    host = netloc.rsplit("@", 1)[-1].lower().rstrip(".")
+    if ":" in host and not host.endswith("]"):
+        name, _, port = host.rpartition(":")
+        if (scheme, port) in (("http", "80"), ("https", "443")):
+            host = name
+    for prefix in _STRIP_HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    return HOST_ALIASES.get(host, host)
+
+
+def _is_tracking(name: str) -> bool:
+    lowered = name.lower()
+    return lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PREFIXES)
+
+
+def unwrap_redirect(url: str) -> str:
+    """Follow known redirect wrappers to the URL they point at."""
+    for _ in range(_MAX_UNWRAP):
+        parts = urlsplit(url)
+        host = _normalize_host(parts.netloc, parts.scheme.lower())
+        wrapper = REDIRECT_WRAPPERS.get(host)
+        if not wrapper or parts.path.rstrip("/") != wrapper[0].rstrip("/"):
+            return url
+        params = dict(parse_qsl(parts.query))
+        target = next((params[p] for p in wrapper[1] if params.get(p)), "")
+        if not target.startswith(("http://", "https://")):
+            return url
+        url = target
+    return url
+
+
+def canonicalize_url(url: str) -> str:
+    """Return the dedup key for a URL.
+
+    Unwraps redirect wrappers, lowercases the scheme and host, folds
+    http into https, strips ``www.``/``m.`` and host aliases, drops
+    fragments and tracking params, sorts what's left of the query, and
+    maps every YouTube video URL shape to ``youtube.com/watch?v=ID``.
+    Strings that don't parse as http(s) URLs come back stripped but
+    otherwise untouched.
+    """
+    url = (url or "").strip()
+    if not url.lower().startswith(("http://", "https://")):
+        return url
+
+    url = unwrap_redirect(url)
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = _normalize_host(parts.netloc, scheme)
+    path = re.sub(r"/{2,}", "/", parts.path) or "/"
+    query = parse_qsl(parts.query, keep_blank_values=True)
+
+    if host == "youtu.be" and path.strip("/"):
+        host = "youtube.com"
+        query = [("v", path.strip("/").split("/")[0])]
+        path = "/watch"
+    elif host == "youtube.com":
+        match = _YOUTUBE_ID_PATHS.match(path)
+        if match:
+            query = [("v", match.group(1))]
+            path = "/watch"
+        elif path.rstrip("/") == "/watch":
+            query = [(k, v) for k, v in query if k == "v"]
+
+    if host in QUERYLESS_HOSTS:
+        query = []
+    else:
+        query = sorted((k, v) for k, v in query if not _is_tracking(k))
+
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    return urlunsplit(("https", host, path, urlencode(query), ""))